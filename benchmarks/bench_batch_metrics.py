@@ -0,0 +1,65 @@
+"""``summarize_batch`` over a (bars x runs) matrix vs. ``summarize_backtest`` per run.
+
+The per-run loops (``summarize_backtest``, and the pandas groupby in ``max_drawdown``
+alone) are timed on ``--scalar-runs`` columns and extrapolated to all runs.
+
+Usage::
+
+    python benchmarks/bench_batch_metrics.py [--runs 1000] [--bars 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtest.metrics import max_drawdown, summarize_backtest, summarize_batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--scalar-runs", type=int, default=20)
+    args = parser.parse_args()
+    rng = np.random.default_rng(17)
+    index = pd.date_range("2020-01-02 09:30", periods=args.bars, freq="min", tz="US/Eastern")
+    equity = np.empty((args.bars, args.runs))
+    exposures = np.empty((args.bars, args.runs))
+    for start in range(0, args.runs, 100):
+        part = slice(start, start + 100)
+        shape = equity[:, part].shape
+        held = rng.random(shape) < 0.5
+        equity[:, part] = 1e5 * np.cumprod(1 + np.where(held, rng.normal(0, 1e-3, shape), 0), 0)
+        exposures[:, part] = held
+
+    start = time.perf_counter()
+    table = summarize_batch(equity, exposures, index)
+    batch_seconds = time.perf_counter() - start
+
+    scalar_runs = min(args.scalar_runs, args.runs)
+    start = time.perf_counter()
+    for run in range(scalar_runs):
+        summary = summarize_backtest(
+            pd.Series(equity[:, run], index=index), [], pd.Series(exposures[:, run], index=index)
+        )
+    scalar_seconds = (time.perf_counter() - start) / scalar_runs * args.runs
+    drift = abs(summary.sharpe - table["sharpe"].iloc[scalar_runs - 1])
+
+    start = time.perf_counter()
+    for run in range(scalar_runs):
+        max_drawdown(pd.Series(equity[:, run], index=index))
+    groupby_seconds = (time.perf_counter() - start) / scalar_runs * args.runs
+
+    print(f"{args.runs} runs x {args.bars:,} bars")
+    print(f"  summarize_batch          {batch_seconds:8.2f}s")
+    print(f"  summarize_backtest loop  {scalar_seconds:8.2f}s (extrapolated from {scalar_runs})")
+    print(f"  max_drawdown loop        {groupby_seconds:8.2f}s (extrapolated, pandas groupby)")
+    print(f"  speedup {scalar_seconds / batch_seconds:.1f}x, |sharpe drift| {drift:.1e}")
+
+
+if __name__ == "__main__":
+    main()
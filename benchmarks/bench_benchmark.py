@@ -0,0 +1,62 @@
+"""Per-run benchmark cost: buy-and-hold plus summary every run vs. the memoized curve.
+
+Usage::
+
+    python benchmarks/bench_benchmark.py [--runs 200] [--bars 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from trading_bot.backtest.benchmark import benchmark_curve, buy_and_hold_benchmark
+from trading_bot.backtest.metrics import summarize_backtest
+from trading_bot.data import cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=100_000)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    rng = np.random.default_rng(11)
+    index = pd.date_range(
+        "2020-01-02 09:30", periods=args.bars, freq="min", tz="US/Eastern", name="timestamp"
+    )
+    close = 300 * np.exp(np.cumsum(rng.normal(0, 5e-4, args.bars)))
+    bars = pd.DataFrame({"close": close}, index=index)
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        curve = buy_and_hold_benchmark(bars, "SPY")
+        summarize_backtest(curve, [], pd.Series(index=curve.index, data=0.0))
+    recompute_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache.CACHE_DIR = Path(tmp)
+        cache.save_dataframe_to_cache(bars, cache.cache_key("SPY", "1min", "start", "end"))
+        start = time.perf_counter()
+        benchmark_curve(index, "SPY", "1min")
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.runs - 1):
+            benchmark_curve(index, "SPY", "1min")
+        memo_seconds = first_seconds + time.perf_counter() - start
+
+    print(f"{args.runs} runs x {args.bars:,} bars")
+    print(f"  recomputed every run  {recompute_seconds:8.3f}s")
+    print(f"  memoized from cache   {memo_seconds:8.3f}s (first call {first_seconds:.3f}s)")
+    print(f"  speedup {recompute_seconds / memo_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Live checkpoint size, encode/write cost and restore time for many tickers.
+
+Usage::
+
+    python benchmarks/bench_checkpoint.py [--tickers 200] [--window 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.config import Config, LiveConfig, StrategyConfig
+from trading_bot.data.bars import BarRecord
+from trading_bot.live.signal_runtime import LiveSignalRuntime
+from trading_bot.live.sinks import NullAlertSink
+
+
+def _runtime(strategy: str, tickers: list[str], window: int, path: Path) -> LiveSignalRuntime:
+    config = Config(
+        tickers=tickers,
+        strategy=StrategyConfig(name=strategy),
+        live=LiveConfig(warm_start=False, checkpoint_path=path),
+    )
+    return LiveSignalRuntime(config, window=window, alerts=NullAlertSink())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2024-01-02 09:30", periods=args.window, freq="min", tz="US/Eastern")
+    close = 100 + np.cumsum(rng.normal(0, 0.05, args.window))
+    # ``ensemble`` exercises the history ring buffers, ``macd_trend`` the indicator state.
+    for strategy in ("macd_trend", "ensemble"):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "live.ckpt"
+            runtime = _runtime(strategy, tickers, args.window, path)
+            for ticker in tickers:
+                bars = [
+                    BarRecord(ticker, ts.value // 1_000_000, c, c, c, c, 1_000.0)
+                    for ts, c in zip(index, close, strict=True)
+                ]
+                runtime._prime(runtime.states[ticker], bars)
+            start = time.perf_counter()
+            data = runtime.checkpointer.encode(runtime.checkpoint_state())  # type: ignore[union-attr]
+            encoded = time.perf_counter()
+            asyncio.run(asyncio.to_thread(runtime.checkpointer.save, data))  # type: ignore[union-attr]
+            written = time.perf_counter()
+            restored = _runtime(strategy, tickers, args.window, path)
+            restore_start = time.perf_counter()
+            restored.restore()
+            restore_end = time.perf_counter()
+            print(
+                f"{strategy:<12} size={len(data) / 1e6:6.2f}MB "
+                f"encode={(encoded - start) * 1e3:7.1f}ms write={(written - encoded) * 1e3:7.1f}ms "
+                f"restore={(restore_end - restore_start) * 1e3:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
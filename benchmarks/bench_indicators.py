@@ -0,0 +1,137 @@
+"""Per-call latency of the indicator kernels versus the pandas API.
+
+Three columns are reported per indicator: a pure pandas reference implementation
+(rolling/ewm/cumsum on ``Series``), the public :mod:`trading_bot.indicators.ta`
+wrappers and the raw ndarray kernels writing into preallocated ``out`` buffers.
+
+Usage::
+
+    python benchmarks/bench_indicators.py [--sizes 100 10000 10000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.indicators import kernels, ta
+
+DEFAULT_SIZES = (100, 10_000, 10_000_000)
+
+
+def _time_call(func: Callable[[], object], budget: float = 0.5) -> float:
+    """Return the best-of-runs seconds per call within roughly ``budget`` seconds."""
+
+    func()
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while spent < budget or runs < 3:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+        if elapsed > budget:
+            break
+    return best
+
+
+def _reference_rsi(series: pd.Series, window: int) -> pd.Series:
+    delta = series.diff()
+    gain = delta.clip(lower=0).fillna(0.0).rolling(window, min_periods=window).mean()
+    loss = (-delta).clip(lower=0).fillna(0.0).rolling(window, min_periods=window).mean()
+    return (100 - 100 / (1 + gain / loss)).fillna(50.0)
+
+
+def _reference_macd(series: pd.Series) -> pd.DataFrame:
+    line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    return pd.DataFrame({"macd": line, "signal": signal, "histogram": line - signal})
+
+
+def _reference_bollinger(series: pd.Series, window: int) -> pd.DataFrame:
+    mid = series.rolling(window, min_periods=window).mean()
+    std = series.rolling(window, min_periods=window).std()
+    return pd.DataFrame({"mid": mid, "upper": mid + 2 * std, "lower": mid - 2 * std})
+
+
+def _reference_vwap(df: pd.DataFrame) -> pd.Series:
+    price = (df["high"] + df["low"] + df["close"]) / 3
+    return (price * df["volume"]).cumsum() / df["volume"].cumsum()
+
+
+Case = tuple[Callable[[], object], Callable[[], object], Callable[[], object]]
+
+
+def _cases(size: int) -> dict[str, Case]:
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, size))
+    high = close + 0.05
+    low = close - 0.05
+    volume = rng.integers(100, 10_000, size).astype(np.float64)
+    index = pd.date_range("2020-01-01", periods=size, freq="s")
+    series = pd.Series(close, index=index)
+    frame = pd.DataFrame({"high": high, "low": low, "close": close, "volume": volume}, index=index)
+    buf = np.empty(size)
+    bufs = (np.empty(size), np.empty(size), np.empty(size))
+    return {
+        "sma(20)": (
+            lambda: series.rolling(20, min_periods=20).mean(),
+            lambda: ta.sma(series, 20),
+            lambda: kernels.sma(close, 20, out=buf),
+        ),
+        "ema(20)": (
+            lambda: series.ewm(span=20, adjust=False).mean(),
+            lambda: ta.ema(series, 20),
+            lambda: kernels.ema(close, 20, out=buf),
+        ),
+        "rsi(14)": (
+            lambda: _reference_rsi(series, 14),
+            lambda: ta.rsi(series, 14),
+            lambda: kernels.rsi(close, 14, out=buf),
+        ),
+        "macd": (
+            lambda: _reference_macd(series),
+            lambda: ta.macd(series),
+            lambda: kernels.macd(close, out=bufs),
+        ),
+        "bollinger(20)": (
+            lambda: _reference_bollinger(series, 20),
+            lambda: ta.bollinger_bands(series, 20),
+            lambda: kernels.bollinger_bands(close, 20, out=bufs),
+        ),
+        "vwap": (
+            lambda: _reference_vwap(frame),
+            lambda: ta.vwap(frame),
+            lambda: kernels.vwap(high, low, close, volume, out=buf),
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    args = parser.parse_args()
+    print(
+        f"{'indicator':<15}{'size':>12}{'pandas ref':>14}{'ta wrapper':>14}"
+        f"{'kernel':>14}{'speedup':>10}"
+    )
+    for size in args.sizes:
+        for name, (reference, wrapped, raw) in _cases(size).items():
+            reference_s = _time_call(reference)
+            wrapped_s = _time_call(wrapped)
+            kernel_s = _time_call(raw)
+            print(
+                f"{name:<15}{size:>12,}{reference_s * 1e6:>12.1f}us{wrapped_s * 1e6:>12.1f}us"
+                f"{kernel_s * 1e6:>12.1f}us{reference_s / kernel_s:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Per-bar evaluation latency of the live runtime: incremental vs. window rebuild.
+
+Usage::
+
+    python benchmarks/bench_live_eval.py [--windows 100 1000 10000] [--bars 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.config import Config, StrategyConfig
+from trading_bot.data.bars import BarBuffer, BarRecord
+from trading_bot.live.signal_runtime import LiveSignalRuntime
+from trading_bot.live.sinks import NullAlertSink
+
+STRATEGIES = ("sma_cross", "rsi_reversion", "macd_trend", "breakout_vwap")
+
+
+def _bars(count: int) -> list[BarRecord]:
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, count))
+    index = pd.date_range("2024-01-02 09:30", periods=count, freq="min", tz="US/Eastern")
+    return [
+        BarRecord("SPY", ts.value // 1_000_000, c, c + 0.02, c - 0.02, c, 1_000.0)
+        for ts, c in zip(index, close, strict=True)
+    ]
+
+
+def _measure(strategy: str, window: int, bars: list[BarRecord], streaming: bool) -> np.ndarray:
+    runtime = LiveSignalRuntime(
+        Config(strategy=StrategyConfig(name=strategy)),
+        window=window,
+        alerts=NullAlertSink(),
+    )
+    state = runtime.states["SPY"]
+    # Fill the window first so the fallback path always sees ``window`` bars.
+    warm, timed = bars[:window], bars[window:]
+    if streaming:
+        for bar in warm:
+            runtime.process(bar)
+    else:
+        state.streaming = False
+        state.history = BarBuffer(window)
+        state.history.extend(warm)
+    latencies = np.empty(len(timed))
+    for i, bar in enumerate(timed):
+        start = time.perf_counter()
+        runtime.process(bar)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--bars", type=int, default=500, help="Timed bars per run")
+    args = parser.parse_args()
+    bars = _bars(max(args.windows) + args.bars)
+    print(f"{'strategy':<15}{'window':>8}{'rebuild p50':>14}{'incremental p50':>18}")
+    for strategy in STRATEGIES:
+        for window in args.windows:
+            sample = bars[: window + args.bars]
+            rebuild = _measure(strategy, window, sample, streaming=False)
+            incremental = _measure(strategy, window, sample, streaming=True)
+            print(
+                f"{strategy:<15}{window:>8}{np.median(rebuild) * 1e6:>12.1f}us"
+                f"{np.median(incremental) * 1e6:>16.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
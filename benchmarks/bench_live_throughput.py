@@ -0,0 +1,96 @@
+"""Messages per second through one multi-ticker ``LiveSignalRuntime``.
+
+Bars are pre-built and fed through an in-memory streamer, so the figure measures
+routing and strategy evaluation rather than the network.
+
+Usage::
+
+    python benchmarks/bench_live_throughput.py [--tickers 200] [--bars 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import time
+from collections.abc import AsyncIterator
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.config import Config, LiveConfig, StrategyConfig
+from trading_bot.data.bars import BarQueue, BarRecord, OverflowPolicy
+from trading_bot.live.signal_runtime import LiveSignalRuntime
+from trading_bot.live.sinks import NullAlertSink
+
+
+class _MemoryStreamer:
+    """Pushes pre-built records through a :class:`BarQueue` like ``AggregateStreamer``."""
+
+    def __init__(self, messages: list[BarRecord], overflow: OverflowPolicy) -> None:
+        self.messages = messages
+        self.queue = BarQueue(10_000, overflow)
+
+    async def stream(self) -> AsyncIterator[BarRecord]:
+        async def produce() -> None:
+            for message in self.messages:
+                await self.queue.put_async(message)
+
+        producer = asyncio.create_task(produce())
+        while not producer.done() or self.queue.depth:
+            bar = self.queue.get_nowait()
+            yield bar if bar is not None else await self.queue.get()
+
+
+def _messages(tickers: list[str], bars: int) -> list[BarRecord]:
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2024-01-02 09:30", periods=bars, freq="min", tz="US/Eastern")
+    close = 100 + np.cumsum(rng.normal(0, 0.05, (bars, len(tickers))), axis=0)
+    # Interleaved like the live feed: every ticker's bar for a minute, then the next minute.
+    return [
+        BarRecord(ticker, ts.value // 1_000_000, c, c + 0.02, c - 0.02, c, 1_000.0)
+        for ts, row in zip(index, close, strict=True)
+        for ticker, c in zip(tickers, row, strict=True)
+    ]
+
+
+async def _run(
+    strategy: str, messages: list[BarRecord], tickers: list[str], overflow: OverflowPolicy
+) -> float:
+    config = Config(
+        tickers=tickers,
+        strategy=StrategyConfig(name=strategy),
+        live=LiveConfig(warm_start=False),
+    )
+    runtime = LiveSignalRuntime(
+        config,
+        window=100,
+        streamer=_MemoryStreamer(messages, overflow),
+        alerts=NullAlertSink(),
+    )
+    start = time.perf_counter()
+    await runtime.run()
+    return runtime.bars_processed / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=500, help="Bars per ticker")
+    parser.add_argument(
+        "--strategies", nargs="+", default=["sma_cross", "rsi_reversion", "macd_trend"]
+    )
+    parser.add_argument("--overflow", choices=["block", "drop_oldest", "coalesce"], default="block")
+    args = parser.parse_args()
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    messages = _messages(tickers, args.bars)
+    print(f"{len(messages):,} messages across {len(tickers)} tickers")
+    for strategy in args.strategies:
+        gc.collect()
+        rate = asyncio.run(_run(strategy, messages, tickers, args.overflow))
+        print(f"{strategy:<15}{rate:>14,.0f} msgs/sec")
+
+
+if __name__ == "__main__":
+    main()
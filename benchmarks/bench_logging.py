@@ -0,0 +1,65 @@
+"""Backtest wall time with per-fill logging, level-gated logging and ``quiet`` runs.
+
+Each mode runs in a fresh process so structlog is configured once, as in the CLI;
+rendered lines go to ``/dev/null``.
+
+Usage::
+
+    python benchmarks/bench_logging.py [--bars 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtest import BacktestEngine
+from trading_bot.config import Config, LoggingConfig, StrategyConfig
+from trading_bot.logging_config import configure_logging
+
+MODES = {
+    "info (every fill)": (LoggingConfig(level="INFO"), False),
+    "warning (gated)": (LoggingConfig(level="WARNING"), False),
+    "info, quiet engine": (LoggingConfig(level="INFO"), True),
+}
+
+
+def _measure(mode: str, bars: int, queue: multiprocessing.Queue) -> None:
+    logging_config, quiet = MODES[mode]
+    rng = np.random.default_rng(21)
+    index = pd.date_range("2020-01-02 09:30", periods=bars, freq="min", tz="US/Eastern")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1e3}, index=index
+    )
+    config = Config(strategy=StrategyConfig(name="sma_cross", params={"fast": 3, "slow": 8}))
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        configure_logging(logging_config)
+        start = time.perf_counter()
+        result = BacktestEngine(quiet=quiet).run(data, config, None)
+        seconds = time.perf_counter() - start
+    queue.put((seconds, len(result.trades)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=200_000)
+    args = parser.parse_args()
+    print(f"{args.bars:,} minute bars, sma_cross 3/8")
+    for mode in MODES:
+        queue: multiprocessing.Queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_measure, args=(mode, args.bars, queue))
+        process.start()
+        seconds, trades = queue.get()
+        process.join()
+        print(f"  {mode:<20} {seconds:8.2f}s ({trades:,} trades)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Wall time of a multi-ticker ``PortfolioEngine`` backtest on synthetic minute bars.
+
+Usage::
+
+    python benchmarks/bench_portfolio.py [--tickers 100] [--bars 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtest.portfolio import PortfolioEngine
+from trading_bot.config import Config, RiskConfig, StrategyConfig
+
+
+def _frames(tickers: int, bars: int) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(11)
+    index = pd.date_range("2020-01-02 09:30", periods=bars, freq="min", tz="US/Eastern")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (bars, tickers)), axis=0))
+    return {
+        f"T{i:03d}": pd.DataFrame(
+            {
+                "open": close[:, i],
+                "high": close[:, i] * 1.001,
+                "low": close[:, i] * 0.999,
+                "close": close[:, i],
+                "volume": 1_000.0,
+            },
+            index=index,
+        )
+        for i in range(tickers)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--bars", type=int, default=100_000, help="Minute bars per ticker")
+    parser.add_argument("--strategy", default="sma_cross")
+    parser.add_argument("--max-positions", type=int, default=10)
+    args = parser.parse_args()
+    frames = _frames(args.tickers, args.bars)
+    config = Config(
+        tickers=list(frames),
+        strategy=StrategyConfig(name=args.strategy),
+        risk=RiskConfig(fraction=0.1, max_positions=args.max_positions),
+    )
+    start = time.perf_counter()
+    result = PortfolioEngine().run(frames, config, None)
+    seconds = time.perf_counter() - start
+    cells = args.tickers * args.bars
+    print(
+        f"{args.tickers} tickers x {args.bars:,} bars: {seconds:.2f}s "
+        f"({cells / seconds:,.0f} ticker-bars/sec), {len(result.trades):,} trades"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Full rerun vs. resuming a saved ``BacktestState`` when one more day of bars arrives.
+
+Usage::
+
+    python benchmarks/bench_resume.py [--days 250] [--strategy sma_cross]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtest import BacktestEngine
+from trading_bot.config import Config, StrategyConfig
+
+BARS_PER_DAY = 390
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=250, help="Trading days already backtested")
+    parser.add_argument("--strategy", default="sma_cross")
+    args = parser.parse_args()
+    bars = (args.days + 1) * BARS_PER_DAY
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2020-01-02 09:30", periods=bars, freq="min", tz="US/Eastern")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+    data = pd.DataFrame(
+        {"open": close, "high": close * 1.001, "low": close * 0.999, "close": close, "volume": 1e3},
+        index=index,
+    )
+    config = Config(strategy=StrategyConfig(name=args.strategy))
+    engine = BacktestEngine()
+
+    state = engine.run(data.iloc[:-BARS_PER_DAY], config, None, keep_state=True).state
+    assert state is not None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.bin"
+        state.save(path)
+        size = path.stat().st_size
+
+        start = time.perf_counter()
+        full = engine.run(data, config, None)
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = engine.load_state(path, config)
+        assert loaded is not None
+        resumed = engine.resume(loaded, data, config)
+        resume_seconds = time.perf_counter() - start
+
+    drift = abs(resumed.summary.sharpe - full.summary.sharpe)
+    print(f"{args.strategy}: {bars:,} bars, state file {size / 1024:.1f} KiB")
+    print(f"  full rerun       {full_seconds:8.3f}s")
+    print(f"  load + resume 1d {resume_seconds:8.3f}s  ({full_seconds / resume_seconds:,.0f}x)")
+    print(f"  |sharpe drift|   {drift:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cold-start import time of each ``tb`` command, from ``python -X importtime``.
+
+For every command two fresh interpreters are measured: ``tb <command> --help`` (CLI
+startup) and the CLI plus the modules the command imports when it runs. Times are the
+summed top-level cumulative import times, best of ``--repeat``.
+
+Usage::
+
+    python benchmarks/bench_startup.py [--repeat 5] [--commands backtest plot]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+# Modules each command imports while running (including plots written to its report).
+COMMANDS = {
+    "fetch": ["trading_bot.data.polygon_source"],
+    "backtest": [
+        "trading_bot.backtest.engine",
+        "trading_bot.backtest.portfolio",
+        "trading_bot.data.polygon_source",
+        "matplotlib.pyplot",
+    ],
+    "compare": ["trading_bot.backtest.compare", "trading_bot.data.polygon_source"],
+    "batch": ["trading_bot.backtest.batch", "trading_bot.data.polygon_source"],
+    "robustness": [
+        "trading_bot.backtest.robustness",
+        "trading_bot.data.polygon_source",
+        "matplotlib.pyplot",
+    ],
+    "optimize": [
+        "trading_bot.backtest.walkforward",
+        "trading_bot.data.polygon_source",
+        "sklearn.model_selection",
+        "matplotlib.pyplot",
+    ],
+    "live": ["trading_bot.live.signal_runtime"],
+    "replay": ["trading_bot.live.replay", "trading_bot.live.sinks"],
+    "feed-server": ["trading_bot.live.local_server", "trading_bot.data.polygon_source"],
+    "plot": ["pandas", "trading_bot.backtest.plotting", "matplotlib.pyplot"],
+}
+
+
+def _import_ms(code: str, *args: str) -> tuple[float, str]:
+    """Summed top-level import time of ``python -c code args`` and its slowest package."""
+
+    stderr = subprocess.run(  # noqa: S603 - our own interpreter and module names
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stderr
+    total, slowest, slowest_us = 0, "", 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  "):
+            continue  # nested import, already counted by its parent
+        total += int(cumulative)
+        if int(cumulative) > slowest_us:
+            slowest, slowest_us = name.strip(), int(cumulative)
+    return total / 1000, slowest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--commands", nargs="+", default=list(COMMANDS))
+    args = parser.parse_args()
+    cli = "import sys; from trading_bot.cli import app; app(sys.argv[1:])"
+    print(f"{'command':<12} {'--help ms':>10} {'run ms':>8}  slowest import when run")
+    for command in args.commands:
+        help_ms = min(_import_ms(cli, command, "--help")[0] for _ in range(args.repeat))
+        code = "; ".join(["import trading_bot.cli", *(f"import {m}" for m in COMMANDS[command])])
+        runs = [_import_ms(code) for _ in range(args.repeat)]
+        run_ms, slowest = min(runs)
+        print(f"{command:<12} {help_ms:>10.0f} {run_ms:>8.0f}  {slowest}")
+
+
+if __name__ == "__main__":
+    main()
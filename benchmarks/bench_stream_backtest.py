@@ -0,0 +1,95 @@
+"""Peak memory and throughput of ``run_stream`` over Parquet row groups vs. ``run``.
+
+Each measurement runs in a fresh process so ``ru_maxrss`` reflects that run alone.
+
+Usage::
+
+    python benchmarks/bench_stream_backtest.py [--bars 1000000 4000000] [--in-memory]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import structlog
+
+from trading_bot.backtest import BacktestEngine
+from trading_bot.config import Config, StrategyConfig
+from trading_bot.data.cache import ROW_GROUP_ROWS, iter_cached_chunks
+
+
+def _write_bars(path: Path, bars: int) -> None:
+    """Write ``bars`` 1-second bars group by group, never holding them all."""
+
+    rng = np.random.default_rng(13)
+    start = pd.Timestamp("2020-01-02 09:30", tz="US/Eastern")
+    level = 100.0
+    writer = None
+    for offset in range(0, bars, ROW_GROUP_ROWS):
+        size = min(ROW_GROUP_ROWS, bars - offset)
+        close = level * np.exp(np.cumsum(rng.normal(0, 2e-4, size)))
+        level = float(close[-1])
+        index = pd.date_range(start + pd.Timedelta(seconds=offset), periods=size, freq="s")
+        frame = pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": 1e3},
+            index=index.rename("timestamp"),
+        )
+        table = pa.Table.from_pandas(frame)
+        writer = writer or pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    assert writer is not None
+    writer.close()
+
+
+def _measure(mode: str, path: Path, out: Path, queue: multiprocessing.Queue) -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    config = Config(bar_size="1sec", strategy=StrategyConfig(name="sma_cross"))
+    engine = BacktestEngine()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "stream":
+        engine.run_stream(iter_cached_chunks(path), config, out)
+    else:
+        engine.run(pd.read_parquet(path), config, None)
+    seconds = time.perf_counter() - start
+    queue.put((seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before))
+
+
+def _run(mode: str, path: Path, out: Path) -> tuple[float, float]:
+    queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(mode, path, out, queue))
+    process.start()
+    seconds, kib = queue.get()
+    process.join()
+    return seconds, kib / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, nargs="+", default=[1_000_000, 4_000_000])
+    parser.add_argument("--in-memory", action="store_true", help="Also time BacktestEngine.run")
+    args = parser.parse_args()
+    modes = ["stream", "in-memory"] if args.in_memory else ["stream"]
+    print(f"{'bars':>10} {'mode':>10} {'seconds':>9} {'bars/sec':>10} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for bars in args.bars:
+            path = Path(tmp) / f"bars_{bars}.parquet"
+            _write_bars(path, bars)
+            for mode in modes:
+                seconds, mib = _run(mode, path, Path(tmp) / f"out_{bars}")
+                rate = bars / seconds
+                print(f"{bars:>10,} {mode:>10} {seconds:>9.2f} {rate:>10,.0f} {mib:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
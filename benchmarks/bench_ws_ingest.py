@@ -0,0 +1,85 @@
+"""End-to-end WebSocket ingest on localhost: events/sec and feed-to-consumer latency.
+
+A :class:`LocalPolygonServer` runs in a child process and stamps every event with its
+send time; ``AggregateStreamer`` connects over ``ws://127.0.0.1`` and the benchmark
+measures how quickly bars reach the consumer and how long they took to get there.
+
+Usage::
+
+    python benchmarks/bench_ws_ingest.py [--tickers 500] [--events 100000] \
+        [--rates 5000 20000 0]
+
+A rate of ``0`` sends as fast as the socket allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+import numpy as np
+
+from trading_bot.live.local_server import LocalPolygonServer, synthetic_events
+from trading_bot.live.streamer import AggregateStreamer
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(port: int, tickers: list[str], events: int, rate: float | None) -> None:
+    count = -(-events // len(tickers))
+    server = LocalPolygonServer(
+        synthetic_events(tickers, count=count), port=port, rate=rate, stamp_send_time=True
+    )
+    asyncio.run(server.serve_forever())
+
+
+async def _ingest(port: int, tickers: list[str], events: int) -> tuple[float, np.ndarray]:
+    streamer = AggregateStreamer(tickers, api_key="local", feed=f"127.0.0.1:{port}", secure=False)
+    latency = np.empty(events)
+    received = 0
+    start = 0.0
+    async for bar in streamer.stream():
+        if received == 0:
+            start = time.perf_counter()
+        latency[received] = time.time() * 1000 - bar.start_ms
+        received += 1
+        if received == events:
+            break
+    return received / (time.perf_counter() - start), latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--rates", type=float, nargs="+", default=[5_000, 20_000, 0])
+    args = parser.parse_args()
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    events = args.events - args.events % len(tickers) or len(tickers)
+    print(f"{events:,} events across {len(tickers)} tickers")
+    for rate in args.rates:
+        port = _free_port()
+        server = multiprocessing.Process(
+            target=_serve, args=(port, tickers, events, rate or None), daemon=True
+        )
+        server.start()
+        try:
+            time.sleep(0.5)  # let the child bind before connecting
+            achieved, latency = asyncio.run(_ingest(port, tickers, events))
+        finally:
+            server.terminate()
+            server.join()
+        p50, p99 = np.percentile(latency, [50, 99])
+        label = f"{rate:,.0f}/s" if rate else "unthrottled"
+        print(f"{label:<14}{achieved:>12,.0f} events/sec   latency p50={p50:.1f}ms p99={p99:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,29 @@
+import math
+from itertools import pairwise
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from structlog.testing import capture_logs
 
+from trading_bot.backtest import metrics
+from trading_bot.backtest.batch import BatchMatrix, run_batch
+from trading_bot.backtest.benchmark import clear_benchmark_cache
+from trading_bot.backtest.compare import compare_strategies
 from trading_bot.backtest.engine import BacktestEngine
+from trading_bot.backtest.metrics import (
+    MetricAccumulator,
+    max_drawdown,
+    summarize_backtest,
+    summarize_batch,
+)
+from trading_bot.backtest.portfolio import PortfolioEngine
+from trading_bot.backtest.robustness import analyze_robustness, export_robustness
 from trading_bot.config import Config, RiskConfig, StrategyConfig
+from trading_bot.data import cache
+from trading_bot.data.cache import iter_cached_chunks
 
 
 def test_backtest_engine_generates_summary(tmp_path: Path) -> None:
@@ -28,3 +48,389 @@ def test_backtest_engine_generates_summary(tmp_path: Path) -> None:
     result = engine.run(data, config, tmp_path)
     assert result.summary.total_return >= 0
     assert (tmp_path / "summary.json").exists()
+
+
+def test_compare_strategies_shares_one_pass(tmp_path: Path) -> None:
+    index = pd.date_range("2023-01-01", periods=80, freq="D")
+    prices = pd.Series([10 + (i % 17) * 0.5 for i in range(80)], index=index, dtype=float)
+    data = pd.DataFrame(
+        {"open": prices, "high": prices + 1, "low": prices - 1, "close": prices, "volume": 1_000}
+    )
+    config = Config(
+        strategy=StrategyConfig(
+            name="ensemble",
+            params={
+                "members": [
+                    {"name": "sma_cross", "params": {"fast": 2, "slow": 5}},
+                    {"name": "rsi_reversion", "params": {"window": 5}},
+                ],
+                "threshold": 0.4,
+            },
+        ),
+        risk=RiskConfig(fraction=0.1, stop_loss=0.0, take_profit=0.0),
+    )
+    table, results = compare_strategies(data, config, tmp_path)
+    assert list(table.index) == ["sma_cross", "rsi_reversion", "ensemble", "benchmark"]
+    assert (tmp_path / "comparison.csv").exists()
+    assert (tmp_path / "summary.json").exists()
+
+    single = config.model_copy(
+        update={"strategy": StrategyConfig(name="sma_cross", params={"fast": 2, "slow": 5})}
+    )
+    direct = BacktestEngine().run(data, single, None)
+    pd.testing.assert_series_equal(results["sma_cross"].equity_curve, direct.equity_curve)
+    assert table.loc["sma_cross", "trades"] == direct.summary.trades
+
+
+def test_portfolio_engine_respects_max_positions(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    frames = {}
+    for i, ticker in enumerate(["AAA", "BBB", "CCC", "DDD", "EEE"]):
+        # Staggered starts exercise alignment onto the shared index.
+        start = pd.Timestamp("2024-01-02 09:30") + pd.Timedelta(minutes=20 * i)
+        index = pd.date_range(start, periods=300 - 20 * i, freq="min")
+        close = 50 + np.cumsum(rng.normal(0, 0.3, len(index)))
+        frames[ticker] = pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": 1_000.0},
+            index=index,
+        )
+    config = Config(
+        tickers=list(frames),
+        strategy=StrategyConfig(name="sma_cross", params={"fast": 3, "slow": 8}),
+        risk=RiskConfig(fraction=0.3, max_positions=2, stop_loss=0.01, take_profit=0.02),
+    )
+    result = PortfolioEngine(starting_equity=10_000).run(frames, config, tmp_path)
+
+    assert len(result.equity_curve) == 300
+    assert (result.positions > 0).sum(axis=1).max() == 2
+    assert (result.exposures <= 1 + 1e-9).all()
+    assert {trade.ticker for trade in result.trades} <= set(frames)
+    # Without costs, the final equity is the starting equity plus every trade's P&L.
+    assert result.equity_curve.iloc[-1] == pytest.approx(
+        10_000 + sum(trade.pnl for trade in result.trades)
+    )
+    assert "ticker" in pd.read_csv(tmp_path / "trades.csv").columns
+
+
+def test_trade_pnl_includes_entry_costs() -> None:
+    rng = np.random.default_rng(8)
+    index = pd.date_range("2024-01-02 09:30", periods=600, freq="min")
+    # A closing slide so both engines end flat and every fill is in a trade.
+    moves = rng.normal(0, 0.002, len(index)) - np.r_[np.zeros(500), np.full(100, 0.002)]
+    close = 50 * np.exp(np.cumsum(moves))
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1e3}, index=index
+    )
+    config = Config(
+        transaction_cost_bps=10,
+        slippage_bps=5,
+        strategy=StrategyConfig(name="sma_cross", params={"fast": 3, "slow": 8}),
+        risk=RiskConfig(fraction=0.5, stop_loss=0.0, take_profit=0.0),
+    )
+    single = BacktestEngine(starting_equity=10_000).run(data, config, None)
+    portfolio = PortfolioEngine(starting_equity=10_000).run(
+        {"AAA": data, "BBB": data * 1.01}, config, None
+    )
+
+    for result in (single, portfolio):
+        assert not np.any(result.positions.iloc[-1])
+        assert sum(trade.pnl for trade in result.trades) == pytest.approx(
+            result.equity_curve.iloc[-1] - 10_000
+        )
+
+
+def test_batch_loads_bars_once_and_resumes(tmp_path: Path) -> None:
+    index = pd.date_range("2023-01-01", periods=120, freq="D")
+    prices = pd.Series([20 + (i % 13) * 0.7 for i in range(120)], index=index, dtype=float)
+    data = pd.DataFrame(
+        {"open": prices, "high": prices + 1, "low": prices - 1, "close": prices, "volume": 1_000}
+    )
+    loads: list[str] = []
+
+    def loader(ticker: str, config: Config) -> pd.DataFrame:
+        loads.append(ticker)
+        return data
+
+    matrix = BatchMatrix(
+        tickers=["spy", "qqq"],
+        strategies=["sma_cross", {"name": "rsi_reversion", "params": {"window": 5}}],
+        settings=[{}, {"transaction_cost_bps": 5, "risk": {"stop_loss": 0.01}}],
+    )
+    partial = matrix.model_copy(update={"tickers": ["SPY"]})
+    first = run_batch(partial, Config(), tmp_path, loader=loader)
+    assert (first.ran, first.skipped, loads) == (4, 0, ["SPY"])
+
+    result = run_batch(matrix, Config(), tmp_path, loader=loader)
+    assert (result.ran, result.skipped, loads) == (4, 4, ["SPY", "QQQ"])
+    assert len(result.table) == 8
+    assert not result.table.duplicated(["ticker", "strategy", "params", "settings"]).any()
+    costly = result.table[result.table["settings"] != "{}"]
+    assert set(costly["ticker"]) == {"SPY", "QQQ"}
+    assert run_batch(matrix, Config(), tmp_path, loader=loader).ran == 0
+
+
+def test_batch_failed_cell_keeps_the_other_rows(tmp_path: Path) -> None:
+    index = pd.date_range("2023-01-01", periods=120, freq="D")
+    prices = pd.Series([20 + (i % 13) * 0.7 for i in range(120)], index=index, dtype=float)
+    data = pd.DataFrame(
+        {"open": prices, "high": prices + 1, "low": prices - 1, "close": prices, "volume": 1_000}
+    )
+    matrix = BatchMatrix(tickers=["SPY"], strategies=["sma_cross", "missing"])
+
+    result = run_batch(matrix, Config(), tmp_path, loader=lambda ticker, config: data)
+    assert (result.ran, list(result.failed)) == (1, ["SPY missing"])
+    assert result.table["strategy"].tolist() == ["sma_cross"]
+
+    rerun = run_batch(matrix, Config(), tmp_path, loader=lambda ticker, config: data)
+    assert (rerun.ran, rerun.skipped, list(rerun.failed)) == (0, 1, ["SPY missing"])
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        StrategyConfig(name="macd_trend"),
+        StrategyConfig(name="sma_cross", params={"trend_timeframe": "10min", "trend_window": 4}),
+        StrategyConfig(
+            name="ensemble",
+            params={"members": ["sma_cross", {"name": "rsi_reversion", "params": {"window": 5}}]},
+        ),
+    ],
+)
+def test_resume_matches_full_rerun(tmp_path: Path, strategy: StrategyConfig) -> None:
+    rng = np.random.default_rng(5)
+    index = pd.date_range("2024-01-02 09:30", periods=900, freq="min")
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    data = pd.DataFrame(
+        {"open": close, "high": close * 1.001, "low": close * 0.999, "close": close, "volume": 1e3},
+        index=index,
+    )
+    config = Config(
+        strategy=strategy,
+        transaction_cost_bps=2,
+        slippage_bps=1,
+        risk=RiskConfig(fraction=0.5, stop_loss=0.005, take_profit=0.01),
+    )
+    engine = BacktestEngine(starting_equity=10_000)
+    full = engine.run(data, config, tmp_path / "full")
+
+    first = engine.run(data.iloc[:400], config, tmp_path / "resumed", keep_state=True)
+    assert first.state is not None and first.state.book.position > 0
+    first.state.save(tmp_path / "state.bin")
+    state = engine.load_state(tmp_path / "state.bin", config)
+    assert state is not None
+    middle = engine.resume(state, data.iloc[:700], config, tmp_path / "resumed")
+    resumed = engine.resume(middle.state, data, config, tmp_path / "resumed")
+
+    pd.testing.assert_series_equal(
+        pd.concat([first.equity_curve, middle.equity_curve, resumed.equity_curve]),
+        full.equity_curve,
+    )
+    for name, value in full.summary.to_dict().items():
+        assert getattr(resumed.summary, name) == pytest.approx(value, rel=1e-9, abs=1e-12), name
+    assert resumed.benchmark.total_return == pytest.approx(full.benchmark.total_return)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "resumed" / "trades.csv"),
+        pd.read_csv(tmp_path / "full" / "trades.csv"),
+    )
+    other = config.model_copy(update={"slippage_bps": 5})
+    assert engine.load_state(tmp_path / "state.bin", other) is None
+
+
+def test_run_stream_over_row_groups_matches_in_memory_run(tmp_path: Path) -> None:
+    rng = np.random.default_rng(9)
+    index = pd.date_range("2024-01-02 09:30", periods=1_000, freq="s", name="timestamp")
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1e3}, index=index
+    )
+    data.to_parquet(tmp_path / "bars.parquet", row_group_size=150)
+    config = Config(
+        bar_size="1sec",
+        strategy=StrategyConfig(name="rsi_reversion", params={"window": 7}),
+        risk=RiskConfig(fraction=0.5, stop_loss=0.002, take_profit=0.004),
+    )
+    engine = BacktestEngine(starting_equity=10_000)
+    full = engine.run(data, config, None)
+
+    chunks = iter_cached_chunks(tmp_path / "bars.parquet")
+    streamed = engine.run_stream(chunks, config, tmp_path / "out")
+
+    assert pq.ParquetFile(tmp_path / "out" / "bars.parquet").num_row_groups == 7
+    bars = pd.read_parquet(tmp_path / "out" / "bars.parquet")
+    pd.testing.assert_series_equal(bars["equity"], full.equity_curve, check_freq=False)
+    assert streamed.bars == len(data) and streamed.trades == len(full.trades) > 0
+    assert len(pd.read_parquet(tmp_path / "out" / "trades.parquet")) == len(full.trades)
+    for name, value in full.summary.to_dict().items():
+        assert getattr(streamed.summary, name) == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_cached_chunks_split_oversized_row_groups(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(cache, "ROW_GROUP_ROWS", 100)
+    index = pd.date_range("2024-01-02 09:30", periods=450, freq="s", tz="US/Eastern")
+    data = pd.DataFrame({"close": np.arange(450.0)}, index=index)
+    data.to_parquet(tmp_path / "bars.parquet", row_group_size=1_000)
+
+    chunks = list(iter_cached_chunks(tmp_path / "bars.parquet"))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100, 100, 50]
+    pd.testing.assert_frame_equal(pd.concat(chunks), data, check_freq=False)
+
+
+def test_benchmark_ticker_comes_from_cache_aligned_and_memoized(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    clear_benchmark_cache()
+    rng = np.random.default_rng(5)
+    index = pd.date_range(
+        "2024-01-02 09:30", periods=600, freq="min", tz="US/Eastern", name="timestamp"
+    )
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1e3}, index=index
+    )
+    data.to_parquet(tmp_path / "bars.parquet", row_group_size=100)
+    # The benchmark has a bar every other minute, starting one bar after the strategy.
+    qqq = pd.DataFrame({"close": np.linspace(300.0, 330.0, 300)}, index=index[1::2])
+    cache.save_dataframe_to_cache(qqq, cache.cache_key("QQQ", "1min", "2024-01-01", "2024-01-03"))
+    config = Config(
+        benchmark_ticker="QQQ",
+        strategy=StrategyConfig(name="sma_cross", params={"fast": 3, "slow": 8}),
+    )
+    engine = BacktestEngine()
+    full = engine.run(data, config, None)
+
+    expected = qqq["close"].reindex(index, method="ffill").bfill()
+    assert full.benchmark.total_return == pytest.approx(expected.iloc[-1] / expected.iloc[0] - 1)
+    other = config.model_copy(update={"strategy": StrategyConfig(name="rsi_reversion")})
+    assert engine.run(data, other, None).benchmark is full.benchmark
+    streamed = engine.run_stream(iter_cached_chunks(tmp_path / "bars.parquet"), config, None)
+    for name, value in full.benchmark.to_dict().items():
+        assert getattr(streamed.benchmark, name) == pytest.approx(value), name
+
+
+def test_quiet_engine_logs_one_line_per_run() -> None:
+    index = pd.date_range("2023-01-01", periods=120, freq="D")
+    close = pd.Series(10 + np.sin(np.arange(120) / 4), index=index)
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1_000}
+    )
+    config = Config(strategy=StrategyConfig(name="sma_cross", params={"fast": 2, "slow": 5}))
+    with capture_logs() as chatty:
+        result = BacktestEngine().run(data, config, None)
+    with capture_logs() as quiet:
+        BacktestEngine(quiet=True).run(data, config, None)
+
+    assert len(result.trades) > 1
+    assert {"backtest.buy", "backtest.sell"} <= {entry["event"] for entry in chatty}
+    assert [entry["event"] for entry in quiet] == ["backtest.completed"]
+    assert quiet[0]["trades"] == len(result.trades)
+
+
+def test_metric_accumulators_merge_split_segments() -> None:
+    rng = np.random.default_rng(5)
+    moves = np.where(rng.random(600) < 0.3, 0.0, rng.normal(0, 0.01, 600))
+    index = pd.date_range("2021-01-04", periods=600, freq="h")
+    equity = pd.Series(100_000 * np.cumprod(1 + moves), index=index)
+    exposures = pd.Series(rng.random(600).round(1), index=index)
+    expected = summarize_backtest(equity, [0.01, -0.02], exposures)
+
+    returns = equity.pct_change().dropna()
+    assert expected.sharpe == pytest.approx(returns.mean() / returns.std() * np.sqrt(252))
+    assert expected.turnover == pytest.approx(exposures.diff().abs().sum())
+    assert (expected.max_drawdown, expected.max_drawdown_duration) == pytest.approx(
+        max_drawdown(equity)
+    )
+
+    # Segments computed independently and merged in order, as parallel workers would.
+    bounds = [0, 1, 150, 151, 420, 600]
+    segments = [
+        MetricAccumulator.from_chunk(equity.iloc[a:b], exposures.iloc[a:b])
+        for a, b in pairwise(bounds)
+    ]
+    merged = MetricAccumulator()
+    for segment in segments:
+        merged.merge(segment)
+    merged.add_trades([0.01, -0.02])
+    per_bar = MetricAccumulator()
+    for timestamp, value, exposure in zip(index, equity, exposures, strict=True):
+        per_bar.add_bar(timestamp, value, exposure)
+    per_bar.add_trades([0.01, -0.02])
+
+    for accumulator in (merged, per_bar):
+        assert accumulator.summary().to_dict() == pytest.approx(expected.to_dict())
+    assert per_bar.drawdown == pytest.approx(equity.iloc[-1] / equity.max() - 1)
+
+
+@pytest.mark.parametrize(
+    ("values", "total_return"), [([0.0, 1.0, 2.0, 3.0], math.inf), ([1.0, 2.0, 5.0, 10.0], 9.0)]
+)
+def test_metric_accumulator_degenerate_curves(values: list[float], total_return: float) -> None:
+    # A zero first equity and an hourly 10x (whose CAGR overflows) give inf, not errors.
+    index = pd.date_range("2024-01-02", periods=len(values), freq="h")
+    per_bar = MetricAccumulator()
+    for timestamp, value in zip(index, values, strict=True):
+        per_bar.add_bar(timestamp, value)
+    summaries = [summarize_backtest(pd.Series(values, index=index), [], pd.Series(0.0, index))]
+    summaries.append(per_bar.summary())
+
+    for summary in summaries:
+        assert summary.total_return == total_return
+        assert summary.cagr == math.inf
+
+
+def test_summarize_batch_matches_scalar_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Small chunks so running totals are carried across several of them.
+    monkeypatch.setattr(metrics, "BATCH_CHUNK_CELLS", 96)
+    rng = np.random.default_rng(9)
+    moves = np.where(rng.random((400, 6)) < 0.4, 0.0, rng.normal(0, 0.01, (400, 6)))
+    equity = 100_000 * np.cumprod(1 + moves, axis=0)
+    exposures = (moves != 0).astype(float)
+    index = pd.date_range("2022-01-03", periods=400, freq="D")
+    trades = [rng.normal(0, 0.02, run).tolist() for run in range(6)]
+
+    table = summarize_batch(equity, exposures, index, trades)
+
+    assert len(table) == 6
+    for run, row in table.iterrows():
+        expected = summarize_backtest(
+            pd.Series(equity[:, run], index=index), trades[run], pd.Series(exposures[:, run])
+        )
+        assert row.to_dict() == pytest.approx(expected.to_dict())
+
+
+def test_robustness_resamples_are_seeded(tmp_path: Path) -> None:
+    rng = np.random.default_rng(21)
+    index = pd.date_range("2023-01-02 09:30", periods=2_000, freq="min", tz="US/Eastern")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    data = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1_000},
+        index=index,
+    )
+    result = BacktestEngine().run(data, Config(strategy=StrategyConfig(name="sma_cross")), None)
+
+    bars = analyze_robustness(result, "bars", samples=150, seed=4)
+    assert len(bars.samples) == 150
+    assert bars.observed["sharpe"] == pytest.approx(result.summary.sharpe)
+    assert bars.samples.equals(analyze_robustness(result, "bars", samples=150, seed=4).samples)
+    assert not bars.samples.equals(analyze_robustness(result, "bars", samples=150, seed=5).samples)
+
+    # Shuffling trade order changes drawdowns but never the final equity.
+    permuted = analyze_robustness(result, "permute", samples=50, seed=4)
+    assert permuted.samples["total_return"].to_numpy() == pytest.approx(
+        permuted.observed["total_return"]
+    )
+    assert permuted.observed["total_return"] == pytest.approx(result.summary.total_return)
+    trades = analyze_robustness(result, "trades", samples=10, seed=4)
+    assert trades.observed["total_return"] == pytest.approx(result.summary.total_return)
+    assert permuted.samples["max_drawdown"].nunique() > 1
+    assert permuted.percentiles.loc["max_drawdown", "p5"] <= permuted.percentiles.loc[
+        "max_drawdown", "p95"
+    ]
+
+    export_robustness(tmp_path, bars)
+    table = pd.read_csv(tmp_path / "robustness.csv", index_col="metric")
+    assert {"observed", "p5", "p50", "p95"} <= set(table.columns)
+    assert (tmp_path / "robustness.png").exists()
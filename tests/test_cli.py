@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from typer.testing import CliRunner
 
 from trading_bot import cli
@@ -8,3 +11,14 @@ def test_cli_help() -> None:
     result = runner.invoke(cli.app, ["--help"])
     assert result.exit_code == 0
     assert "Trading bot CLI" in result.output
+
+
+def test_cli_startup_skips_heavy_imports() -> None:
+    code = (
+        "import sys, trading_bot.cli; "
+        "print(sorted({'sklearn', 'matplotlib', 'polygon'} & sys.modules.keys()))"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
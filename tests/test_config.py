@@ -1,8 +1,12 @@
+import json
 from pathlib import Path
 
+import pytest
+import structlog
 import yaml
 
-from trading_bot.config import load_config
+from trading_bot.config import LoggingConfig, load_config
+from trading_bot.logging_config import configure_logging
 
 
 def test_load_config(tmp_path: Path) -> None:
@@ -18,3 +22,26 @@ def test_load_config(tmp_path: Path) -> None:
     cfg = load_config(config_path)
     assert cfg.tickers == ["SPY"]
     assert cfg.strategy.name == "sma_cross"
+
+
+def test_queued_logging_filters_and_samples(capsys: pytest.CaptureFixture[str]) -> None:
+    config = LoggingConfig(level="INFO", json_format=True, sample={"tick": 3})
+    listener = configure_logging(config, queued=True)
+    try:
+        log = structlog.get_logger("test")
+        for i in range(7):
+            log.info("tick", i=i)
+        log.debug("hidden")
+        log.warning("done")
+    finally:
+        assert listener is not None
+        listener.stop()
+        structlog.reset_defaults()
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line["event"], line.get("i")) for line in lines] == [
+        ("tick", 0),
+        ("tick", 3),
+        ("tick", 6),
+        ("done", None),
+    ]
+    assert lines[0]["sample_every"] == 3
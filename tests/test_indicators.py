@@ -1,7 +1,19 @@
 import numpy as np
 import pandas as pd
+import pytest
 
-from trading_bot.indicators.ta import bollinger_bands, macd, rsi, sma, vwap
+from trading_bot.indicators import kernels, streaming
+from trading_bot.indicators.ta import (
+    bollinger_bands,
+    ema,
+    macd,
+    opening_range,
+    rsi,
+    session_high_low,
+    session_vwap,
+    sma,
+    vwap,
+)
 
 
 def test_sma() -> None:
@@ -40,3 +52,136 @@ def test_vwap_monotonic() -> None:
     )
     values = vwap(df)
     assert values.is_monotonic_increasing
+
+
+def test_kernels_match_pandas_reference() -> None:
+    rng = np.random.default_rng(1)
+    prices = pd.Series(100 + np.cumsum(rng.normal(0, 1, 500)))
+    prices.iloc[[40, 41, 300]] = np.nan
+    pd.testing.assert_series_equal(sma(prices, 10), prices.rolling(10, min_periods=10).mean())
+    pd.testing.assert_series_equal(ema(prices, 3), prices.ewm(span=3, adjust=False).mean())
+    pd.testing.assert_series_equal(ema(prices, 12), prices.ewm(span=12, adjust=False).mean())
+    std = prices.rolling(20, min_periods=20).std()
+    bands = bollinger_bands(prices, 20)
+    pd.testing.assert_series_equal(bands["upper"] - bands["mid"], 2 * std, check_names=False)
+
+
+def test_flat_run_longer_than_block_is_exact() -> None:
+    rng = np.random.default_rng(18)
+    walk = 100 + np.cumsum(rng.normal(0, 1, 3000))
+    flat = np.full(4 * kernels._MIN_BLOCK, walk[-1])
+    close = pd.Series(np.concatenate([walk, flat, walk[-1] + np.cumsum(rng.normal(0, 1, 500))]))
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14).mean()
+    expected = (100 - 100 / (1 + gain / loss)).fillna(50.0)
+    values = rsi(close, 14)
+    np.testing.assert_allclose(values.iloc[14:], expected.iloc[14:], rtol=1e-9, atol=1e-9)
+    assert (values.iloc[3014 : 3000 + len(flat)] == 50.0).all()
+    bands = bollinger_bands(close, 20)
+    assert (bands["upper"] - bands["lower"]).iloc[3020 : 3000 + len(flat)].eq(0.0).all()
+
+
+def test_kernels_write_into_out_buffers() -> None:
+    values = np.linspace(1, 10, 50)
+    buf = np.empty(50)
+    result = kernels.rsi(values, 14, out=buf)
+    assert result is buf
+    np.testing.assert_allclose(buf, rsi(pd.Series(values), 14).to_numpy())
+    bufs = (np.empty(50), np.empty(50), np.empty(50))
+    macd_line, signal_line, histogram = kernels.macd(values, out=bufs)
+    assert macd_line is bufs[0] and signal_line is bufs[1] and histogram is bufs[2]
+    np.testing.assert_allclose(histogram, macd(pd.Series(values))["histogram"].to_numpy())
+
+
+def test_session_vwap_resets_each_day() -> None:
+    index = pd.date_range("2023-01-03 09:30", periods=3, freq="min", tz="US/Eastern").append(
+        pd.date_range("2023-01-04 09:30", periods=3, freq="min", tz="US/Eastern")
+    )
+    df = pd.DataFrame(
+        {
+            "high": [2, 3, 4, 20, 30, 40],
+            "low": [1, 2, 3, 10, 20, 30],
+            "close": [1.5, 2.5, 3.5, 15, 25, 35],
+            "volume": [100, 200, 300, 100, 200, 300],
+        },
+        index=index,
+    )
+    values = session_vwap(df)
+    day = df.index.date
+    price = (df["high"] + df["low"] + df["close"]) / 3
+    expected = (price * df["volume"]).groupby(day).cumsum() / df["volume"].groupby(day).cumsum()
+    np.testing.assert_allclose(values, expected)
+    assert values.iloc[3] == price.iloc[3]
+    extremes = session_high_low(df)
+    assert extremes["session_high"].tolist() == [2, 3, 4, 20, 30, 40]
+    assert extremes["session_low"].tolist() == [1, 1, 1, 10, 10, 10]
+
+
+def test_opening_range_published_after_window() -> None:
+    index = pd.date_range("2023-01-03 09:30", periods=6, freq="min", tz="US/Eastern")
+    df = pd.DataFrame(
+        {"high": [5, 7, 6, 9, 8, 8], "low": [4, 3, 5, 6, 7, 7], "close": 0.0, "volume": 1},
+        index=index,
+    )
+    ranges = opening_range(df, minutes=3)
+    assert ranges["or_high"].iloc[:3].isna().all()
+    assert ranges["or_high"].iloc[3:].tolist() == [7, 7, 7]
+    assert ranges["or_low"].iloc[3:].tolist() == [3, 3, 3]
+
+
+def test_streaming_indicators_match_vectorized() -> None:
+    rng = np.random.default_rng(3)
+    close = pd.Series(100 + np.cumsum(rng.normal(0, 1, 300)))
+    close.iloc[40] = np.nan
+    fast, rsi_stream, macd_stream = streaming.SMA(5), streaming.RSI(14), streaming.MACD()
+    bands = streaming.BollingerBands(20, 2.0)
+    rows = []
+    for value in close:
+        fast.update(value)
+        rsi_stream.update(value)
+        macd_stream.update(value)
+        bands.update(value)
+        rows.append(
+            [fast.value, rsi_stream.value, macd_stream.macd, macd_stream.signal, bands.upper]
+        )
+    expected = pd.concat(
+        [
+            sma(close, 5),
+            rsi(close, 14),
+            macd(close)[["macd", "signal"]],
+            bollinger_bands(close)["upper"],
+        ],
+        axis=1,
+    ).to_numpy()
+    np.testing.assert_allclose(np.array(rows), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_streaming_prime_matches_updates() -> None:
+    rng = np.random.default_rng(8)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    close[[50, 370, 398, 399]] = np.nan
+    volume = rng.uniform(100, 1_000, close.size)
+    factories = [
+        lambda: streaming.SMA(10),
+        lambda: streaming.RSI(14),
+        lambda: streaming.MACD(3, 10, 4),
+        lambda: streaming.BollingerBands(20, 2.0),
+    ]
+    for factory in factories:
+        replayed, primed = factory(), factory()
+        for value in close:
+            replayed.update(value)
+        primed.prime(close)
+        # Both continue identically from there, trailing NaN included.
+        for value in [*close[:20], np.nan, *close[20:40]]:
+            np.testing.assert_allclose(replayed.update(value), primed.update(value), rtol=1e-9)
+
+    replayed, primed = streaming.VWAP(), streaming.VWAP()
+    for i, value in enumerate(close):
+        replayed.update(value, value, value, volume[i], session=i // 100)
+    primed.prime(close[300:], close[300:], close[300:], volume[300:], session=3)
+    assert primed.value == pytest.approx(replayed.value, nan_ok=True)
+    assert primed.update(1.0, 1.0, 1.0, 10.0, 3) == pytest.approx(
+        replayed.update(1.0, 1.0, 1.0, 10.0, 3)
+    )
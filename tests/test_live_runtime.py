@@ -0,0 +1,375 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_bot.config import Config, LiveConfig, StrategyConfig
+from trading_bot.data.bars import BarQueue, BarRecord, bars_to_frame
+from trading_bot.live.discord import AlertDispatcher
+from trading_bot.live.local_server import LocalPolygonServer, synthetic_events
+from trading_bot.live.metrics import MetricsServer
+from trading_bot.live.replay import parse_speed, run_replay
+from trading_bot.live.signal_runtime import LiveSignalRuntime
+from trading_bot.live.sinks import FileAlertSink
+from trading_bot.live.streamer import AggregateStreamer
+
+
+class MemoryStreamer:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def stream(self):
+        for message in self.messages:
+            yield message
+
+
+class RecordingAlerts:
+    def __init__(self):
+        self.alerts = []
+        self.times = []
+
+    def submit(self, signal, ticker, payload):
+        self.alerts.append((ticker, signal))
+        self.times.append(payload["Time"])
+        return True
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def _bars(ticker, prices):
+    index = pd.date_range("2024-01-02 09:30", periods=len(prices), freq="min", tz="US/Eastern")
+    return [
+        BarRecord(ticker, ts.value // 1_000_000, p, p, p, p, 100.0)
+        for ts, p in zip(index, prices, strict=True)
+    ]
+
+
+def test_runtime_routes_tickers_on_one_stream():
+    up = _bars("AAA", np.linspace(10, 20, 10))
+    down = _bars("BBB", np.linspace(20, 10, 10))
+    other = _bars("ZZZ", np.linspace(10, 20, 10))
+    messages = [bar for bars in zip(up, down, other, strict=True) for bar in bars]
+    config = Config(
+        tickers=["AAA", "BBB"],
+        strategy=StrategyConfig(name="sma_cross", params={"fast": 2, "slow": 3}),
+        live=LiveConfig(warm_start=False),
+    )
+    alerts = RecordingAlerts()
+    runtime = LiveSignalRuntime(config, streamer=MemoryStreamer(messages), alerts=alerts)
+    asyncio.run(runtime.run())
+
+    assert sorted(alerts.alerts) == [("AAA", "buy"), ("BBB", "sell")]
+    assert runtime.bars_processed == 20
+    assert runtime.states["AAA"].strategy is not runtime.states["BBB"].strategy
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def recent_bars(self, ticker, bar_size, count):
+        self.calls.append((ticker, count))
+        return self.frames[ticker].tail(count)
+
+
+@pytest.mark.parametrize("name", ["sma_cross", "ensemble"])
+def test_warm_start_primes_state_without_alerting(name):
+    bars = _bars("AAA", np.linspace(10, 20, 60))
+    source = FrameSource({"AAA": bars_to_frame(bars[:50])})
+    config = Config(
+        tickers=["AAA"],
+        strategy=StrategyConfig(
+            name=name, params={"members": ["sma_cross", "macd_trend"]} if name == "ensemble" else {}
+        ),
+    )
+    alerts = RecordingAlerts()
+    runtime = LiveSignalRuntime(
+        config, window=30, streamer=MemoryStreamer(bars[45:]), alerts=alerts, source=source
+    )
+    asyncio.run(runtime.run())
+
+    assert source.calls == [("AAA", 30)]
+    assert runtime.states["AAA"].last_signal.value == "buy"
+    # Already long from the cached history: overlapping and new bars trigger no alert.
+    assert alerts.alerts == []
+    assert runtime.bars_processed == 10
+
+
+@pytest.mark.parametrize("name", ["rsi_reversion", "ensemble"])
+def test_checkpoint_restore_resumes_like_uninterrupted_run(tmp_path, name):
+    rng = np.random.default_rng(1)
+    bars = _bars("AAA", 100 + np.cumsum(rng.normal(0, 1, 80)))
+    params = {"window": 5} if name == "rsi_reversion" else {"members": ["sma_cross", "macd_trend"]}
+    config = Config(
+        tickers=["AAA"],
+        strategy=StrategyConfig(name=name, params=params),
+        live=LiveConfig(warm_start=False, checkpoint_path=tmp_path / "live.ckpt"),
+    )
+
+    def run(messages):
+        alerts = RecordingAlerts()
+        runtime = LiveSignalRuntime(
+            config, window=40, streamer=MemoryStreamer(messages), alerts=alerts
+        )
+        asyncio.run(runtime.run())
+        return runtime, alerts.times
+
+    run(bars[:50])
+    assert [path.name for path in tmp_path.iterdir()] == ["live.ckpt"]
+    restored, resumed_alerts = run(bars[45:])
+    (tmp_path / "live.ckpt").unlink()
+    uninterrupted, all_alerts = run(bars)
+
+    assert restored.bars_processed == 30
+    resumed_from = bars[50].timestamp.isoformat()
+    assert resumed_alerts
+    assert resumed_alerts == [time for time in all_alerts if time >= resumed_from]
+    assert restored.states["AAA"].last_signal == uninterrupted.states["AAA"].last_signal
+    assert (
+        restored.states["AAA"].strategy.snapshot()
+        == uninterrupted.states["AAA"].strategy.snapshot()
+    )
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, json, timeout):
+        self.posts.append(json)
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def test_dispatcher_batches_embeds_and_honours_retry_after():
+    session = FakeSession([FakeResponse(429, {"retry_after": 0.01}), FakeResponse(204)] * 2)
+    dispatcher = AlertDispatcher("https://example.invalid/hook", max_queue=12, session=session)
+
+    async def scenario():
+        for i in range(13):
+            dispatcher.submit("buy", f"T{i}", {"Price": i})
+        await dispatcher.start()
+        await dispatcher.close()
+
+    asyncio.run(scenario())
+    assert [len(body["embeds"]) for body in session.posts] == [10, 10, 2, 2]
+    assert dispatcher.sent == 12
+    assert dispatcher.dropped == 1
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [("drop_oldest", ["B", "A", "B"]), ("coalesce", ["A", "B"])],
+)
+def test_bar_queue_overflow_policies(policy, expected):
+    queue = BarQueue(maxsize=3, policy=policy)
+    for i, ticker in enumerate(["A", "B", "A", "B"]):
+        queue.put(BarRecord(ticker, i, 1.0, 1.0, 1.0, 1.0, 1.0))
+    drained = []
+    while (bar := queue.get_nowait()) is not None:
+        drained.append(bar)
+    assert [bar.ticker for bar in drained] == expected
+    assert [bar.start_ms for bar in drained][-1] == 3
+    assert queue.dropped == 4 - len(expected)
+
+
+@pytest.mark.parametrize("policy", ["drop_oldest", "coalesce"])
+def test_bar_queue_below_maxsize_keeps_every_bar(policy):
+    queue = BarQueue(maxsize=10, policy=policy)
+    for i, ticker in enumerate(["A", "B", "A", "B", "A"]):
+        queue.put(BarRecord(ticker, i, 1.0, 1.0, 1.0, 1.0, 1.0))
+    drained = []
+    while (bar := queue.get_nowait()) is not None:
+        drained.append(bar.start_ms)
+    assert drained == [0, 1, 2, 3, 4]
+    assert queue.dropped == 0
+
+
+def test_bar_queue_blocks_threaded_producer_until_consumed():
+    queue = BarQueue(maxsize=2, policy="block")
+    bars = [BarRecord("A", i, 1.0, 1.0, 1.0, 1.0, 1.0) for i in range(50)]
+
+    async def consume():
+        producer = threading.Thread(target=lambda: [queue.put(bar) for bar in bars])
+        producer.start()
+        received = [(await queue.get()).start_ms for _ in bars]
+        producer.join()
+        return received
+
+    assert asyncio.run(consume()) == list(range(50))
+    assert queue.max_depth <= 2
+    assert queue.dropped == 0
+
+
+def test_replay_matches_backtest_signals(tmp_path):
+    rng = np.random.default_rng(4)
+    frames = {
+        ticker: bars_to_frame(_bars(ticker, 100 + np.cumsum(rng.normal(0, 1, 200))))
+        for ticker in ("AAA", "BBB")
+    }
+    config = Config(strategy=StrategyConfig(name="macd_trend"))
+    sink = FileAlertSink(tmp_path / "alerts.jsonl")
+    report = asyncio.run(run_replay(config, frames, speed=None, sink=sink))
+
+    assert report.bars == 400
+    assert report.alerts == len(sink.records) > 0
+    assert report.signal_checks == {"AAA": True, "BBB": True}
+    assert len((tmp_path / "alerts.jsonl").read_text().splitlines()) == report.alerts
+    assert parse_speed("1000x") == 1000.0
+    assert parse_speed("max") is None
+
+
+def test_streamer_ingests_local_feed_in_order():
+    tickers = ["AAA", "BBB", "CCC"]
+
+    async def ingest():
+        events = synthetic_events([*tickers, "ZZZ"], count=200, start_ms=0)
+        async with LocalPolygonServer(events, batch=50, drop_after=250) as server:
+            streamer = AggregateStreamer(tickers, api_key="local", feed=server.feed, secure=False)
+            received = []
+            async for bar in streamer.stream():
+                received.append(bar)
+                if len(received) == 600:
+                    break
+        return received, server.connections
+
+    received, connections = asyncio.run(ingest())
+    assert connections == 3
+    for ticker in tickers:
+        starts = [bar.start_ms for bar in received if bar.ticker == ticker]
+        assert starts == [i * 60_000 for i in range(200)]
+
+
+def test_streamer_backfills_gap_after_reconnect_in_time_order():
+    tickers = ["AAA", "BBB"]
+    events = list(synthetic_events(tickers, count=100, start_ms=0))
+    frames = {
+        ticker: bars_to_frame(
+            [
+                BarRecord(ticker, e["s"], e["o"], e["h"], e["l"], e["c"], e["v"], e["vw"])
+                for e in events
+                if e["sym"] == ticker
+            ]
+        )
+        for ticker in tickers
+    }
+
+    class RestSource:
+        def __init__(self):
+            self.calls = []
+
+        def fetch_aggregates(self, ticker, start, end, timespan="minute"):
+            self.calls.append((ticker, int(start), int(end)))
+            return frames[ticker]
+
+    async def ingest(source):
+        async with LocalPolygonServer(iter(events), drop_after=60, drop_gap=30) as server:
+            streamer = AggregateStreamer(
+                tickers, api_key="local", feed=server.feed, secure=False, source=source
+            )
+            received = []
+            async for bar in streamer.stream():
+                received.append(bar)
+                if len(received) == len(events):
+                    break
+        return received, streamer
+
+    source = RestSource()
+    received, streamer = asyncio.run(ingest(source))
+    for ticker in tickers:
+        starts = [bar.start_ms for bar in received if bar.ticker == ticker]
+        assert starts == [i * 60_000 for i in range(100)]
+    assert streamer.gaps == len(source.calls) == 4
+    assert streamer.backfilled == 60
+
+
+@pytest.mark.parametrize(("min_gap", "calls"), [(None, []), (10, [("AAA", 40 * 60_000)])])
+def test_streamer_skips_no_trade_minutes_without_reconnect(min_gap, calls):
+    # Minutes 10-12 and 30-39 have no trades; Polygon sends nothing for them.
+    events = [
+        e
+        for e in synthetic_events(["AAA"], count=60, start_ms=0)
+        if not (10 <= e["s"] // 60_000 <= 12 or 30 <= e["s"] // 60_000 <= 39)
+    ]
+
+    class RestSource:
+        def __init__(self):
+            self.calls = []
+
+        def fetch_aggregates(self, ticker, start, end, timespan="minute"):
+            self.calls.append((ticker, int(end)))
+            return pd.DataFrame()
+
+    async def ingest(source):
+        async with LocalPolygonServer(iter(events)) as server:
+            streamer = AggregateStreamer(
+                "AAA",
+                api_key="local",
+                feed=server.feed,
+                secure=False,
+                source=source,
+                min_gap=min_gap,
+            )
+            received = []
+            async for bar in streamer.stream():
+                received.append(bar)
+                if len(received) == len(events):
+                    break
+        return received, streamer
+
+    source = RestSource()
+    received, streamer = asyncio.run(ingest(source))
+    assert [bar.start_ms for bar in received] == [e["s"] for e in events]
+    assert source.calls == calls
+    assert streamer.gaps == len(calls)
+
+
+def test_runtime_metrics_exposed_as_prometheus_text():
+    config = Config(
+        tickers=["AAA"],
+        strategy=StrategyConfig(name="sma_cross"),
+        live=LiveConfig(warm_start=False),
+    )
+    runtime = LiveSignalRuntime(
+        config,
+        streamer=MemoryStreamer(_bars("AAA", np.linspace(10, 20, 40))),
+        alerts=RecordingAlerts(),
+    )
+    asyncio.run(runtime.run())
+
+    async def scrape():
+        server = MetricsServer(runtime.metrics, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+        await server.close()
+        return response
+
+    response = asyncio.run(scrape())
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert "live_bars_total 40.0" in response
+    assert 'live_stage_seconds_count{stage="evaluate"} 40' in response
+    assert 'live_feed_lag_seconds_bucket{le="+Inf"} 40' in response
@@ -81,3 +81,52 @@ def test_fetch_and_cache_uses_cache_without_api_key(monkeypatch, tmp_path):
     result = ds.fetch_and_cache("SPY", "2023-01-01", "2023-01-02", "1min")
 
     pd.testing.assert_frame_equal(result, df)
+
+
+def test_recent_bars_tops_up_cache_with_one_rest_call(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache", raising=False)
+    index = pd.date_range("2023-11-14 17:30", periods=3, freq="min", tz="US/Eastern")
+    cached = pd.DataFrame(
+        {"open": 1.0, "high": 1.0, "low": 1.0, "close": [1.0, 1.1, 1.2], "volume": 10.0},
+        index=index,
+    )
+    cache.save_dataframe_to_cache(cached, cache.cache_key("SPY", "1min", "a", "b"))
+    calls = []
+
+    class DummyRest:
+        def list_aggs(self, **kwargs):
+            calls.append((kwargs["from_"], kwargs["to"]))
+            # Overlaps the last cached bar and adds one new one.
+            for ts in index[-1:].append(index[-1:] + pd.Timedelta("1min")):
+                yield DummyAgg(ts.value // 1_000_000, 2.0, 2.0, 2.0, 2.0, 5.0, 2.0, 1)
+
+    ds = PolygonDataSource(api_key="test")
+    monkeypatch.setattr(ds, "_rest_client", DummyRest())
+    result = ds.recent_bars("SPY", "1min", 3, now=pd.Timestamp("2023-11-15", tz="US/Eastern"))
+
+    assert calls == [("2023-11-14", "2023-11-15")]
+    assert result["close"].tolist() == [1.1, 2.0, 2.0]
+    assert result.index.is_monotonic_increasing
+
+
+def test_load_recent_bars_reads_only_trailing_row_groups(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache", raising=False)
+    monkeypatch.setattr(cache, "ROW_GROUP_ROWS", 10)
+    index = pd.date_range("2023-11-14 09:30", periods=100, freq="min", tz="US/Eastern")
+    bars = pd.DataFrame({"close": range(100)}, index=index, dtype=float)
+    # The later file overlaps the newest bars of the older one and wins on them.
+    cache.save_dataframe_to_cache(bars.iloc[:60], cache.cache_key("SPY", "1min", "a", "b"))
+    cache.save_dataframe_to_cache(bars.iloc[55:] + 0.5, cache.cache_key("SPY", "1min", "c", "d"))
+    reads = []
+    read_row_group = cache.pq.ParquetFile.read_row_group
+
+    def spy(self, group, *args, **kwargs):
+        reads.append(group)
+        return read_row_group(self, group, *args, **kwargs)
+
+    monkeypatch.setattr(cache.pq.ParquetFile, "read_row_group", spy)
+    result = cache.load_recent_bars("SPY", "1min", 50)
+
+    assert result.index.equals(index[-50:])
+    assert result["close"].tolist() == [*range(50, 55), *(v + 0.5 for v in range(55, 100))]
+    assert len(reads) == 6
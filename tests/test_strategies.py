@@ -1,6 +1,15 @@
+from importlib.metadata import EntryPoint
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from trading_bot.strategies import Signal, create_strategy, registry
+from trading_bot.strategies.base import SIGNAL_CODES
+from trading_bot.strategies.ensemble import EnsembleStrategy
+from trading_bot.strategies.expression import ExpressionStrategy, compile_rules
 from trading_bot.strategies.sma_cross import SmaCrossStrategy
+from trading_bot.strategies.timeframes import higher_timeframe_features
 
 
 def test_sma_cross_signals() -> None:
@@ -15,3 +24,162 @@ def test_sma_cross_signals() -> None:
     signal, confidence = strategy.on_bar(last_bar, state)
     assert signal.value in {"buy", "sell", "hold"}
     assert 0.0 <= confidence <= 1.0
+
+
+def test_expression_strategy_matches_sma_cross() -> None:
+    index = pd.date_range("2023-01-01", periods=60, freq="D")
+    close = pd.Series(np.sin(np.linspace(0, 6, 60)) + 10, index=index)
+    data = pd.DataFrame({"close": close})
+    rule = ExpressionStrategy(
+        entry="sma(close, 3) > sma(close, 8)", exit="sma(close, 8) > sma(close, 3)"
+    )
+    reference = SmaCrossStrategy(fast=3, slow=8)
+    rule_state = rule.prepare(data)
+    reference_state = reference.prepare(data)
+    for timestamp, bar in data.iterrows():
+        bar.name = timestamp
+        assert rule.on_bar(bar, rule_state)[0] is reference.on_bar(bar, reference_state)[0]
+
+
+def test_compile_rules_shares_subexpressions() -> None:
+    rules = compile_rules(
+        {
+            "a": "sma(close, 10) > sma(close, 30) and rsi(close) < 70",
+            "b": "sma(close,30) < sma(close,10)",
+            "c": "macd(close) > macd_signal(close) and macd_hist(close) > 0",
+        }
+    )
+    assert rules.outputs["a"] != rules.outputs["b"]
+    sma_steps = [step for step in rules.steps if step.params in {(10.0,), (30.0,)}]
+    assert len(sma_steps) == 2
+    assert sum(1 for step in rules.steps if step.params == (12.0, 26.0, 9.0)) == 1
+    with pytest.raises(ValueError):
+        compile_rules({"bad": "__import__('os')"})
+
+
+def test_ensemble_vote_combines_member_signals() -> None:
+    index = pd.date_range("2023-01-01", periods=40, freq="D")
+    data = pd.DataFrame({"close": np.linspace(10, 20, 40)}, index=index)
+    ensemble = EnsembleStrategy(
+        members=[
+            {"name": "sma_cross", "params": {"fast": 2, "slow": 4}},
+            {"name": "sma_cross", "params": {"fast": 3, "slow": 6}, "weight": 2.0},
+            {"name": "rsi_reversion", "params": {"window": 5}},
+        ],
+        threshold=0.5,
+    )
+    state = ensemble.prepare(data)
+    assert ensemble.labels == ["sma_cross", "sma_cross_2", "rsi_reversion"]
+    last = data.iloc[-1]
+    # Both SMA members buy a rising series while RSI sells: (1 + 2 - 1) / 4 = 0.5.
+    assert state.data.loc[last.name, ["sma_cross", "sma_cross_2", "rsi_reversion"]].tolist() == [
+        1,
+        1,
+        -1,
+    ]
+    assert ensemble.on_bar(last, state)[0] is Signal.HOLD
+    ensemble.params["threshold"] = 0.25
+    assert ensemble.on_bar(last, ensemble.prepare(data))[0] is Signal.BUY
+
+
+def test_higher_timeframe_features_only_use_completed_bars() -> None:
+    index = pd.date_range("2023-01-03 09:00", periods=180, freq="min", tz="US/Eastern")
+    data = pd.DataFrame({"close": np.arange(180, dtype=float)}, index=index)
+    hourly = higher_timeframe_features(data, "1h", lambda bars: bars["close"])
+    column = hourly["1h_close"]
+    assert column.loc[:"2023-01-03 09:59"].isna().all()
+    # The 09:00 hour closes at 59 and becomes visible from the 10:00 bar onwards.
+    assert column.loc["2023-01-03 10:00"] == 59
+    assert column.loc["2023-01-03 10:59"] == 59
+    assert column.loc["2023-01-03 11:00"] == 119
+
+
+def test_sma_cross_trend_timeframe_filters_entries() -> None:
+    index = pd.date_range("2023-01-03 09:00", periods=240, freq="min")
+    close = np.r_[np.linspace(110, 100, 120), np.linspace(100, 101, 120)]
+    data = pd.DataFrame({"close": close}, index=index)
+    plain = SmaCrossStrategy(fast=2, slow=5)
+    filtered = SmaCrossStrategy(fast=2, slow=5, trend_timeframe="1h", trend_window=2)
+    plain_state, filtered_state = plain.prepare(data), filtered.prepare(data)
+    bar = data.loc[pd.Timestamp("2023-01-03 11:30")]
+    assert plain.on_bar(bar, plain_state)[0] is Signal.BUY
+    # Price is still below the SMA of the last two completed hourly closes.
+    assert filtered.on_bar(bar, filtered_state)[0] is Signal.HOLD
+
+
+@pytest.mark.parametrize("name", ["sma_cross", "rsi_reversion", "macd_trend", "breakout_vwap"])
+def test_streaming_update_matches_on_bar(name: str) -> None:
+    rng = np.random.default_rng(5)
+    index = pd.date_range("2024-01-02 09:30", periods=400, freq="30min", tz="US/Eastern")
+    close = 100 + np.cumsum(rng.normal(0, 0.5, len(index)))
+    data = pd.DataFrame(
+        {"open": close, "high": close + 0.3, "low": close - 0.3, "close": close, "volume": 1e3},
+        index=index,
+    )
+    strategy = create_strategy(name)
+    assert strategy.supports_streaming()
+    state = strategy.prepare(data)
+    strategy.reset_stream()
+    for timestamp, bar in data.iterrows():
+        expected = strategy.on_bar(bar, state)
+        assert strategy.update(timestamp, bar) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("name", ["sma_cross", "rsi_reversion", "macd_trend", "breakout_vwap"])
+def test_prime_stream_matches_replay(name: str) -> None:
+    rng = np.random.default_rng(6)
+    index = pd.date_range("2024-01-02 09:30", periods=400, freq="30min", tz="US/Eastern")
+    close = 100 + np.cumsum(rng.normal(0, 0.5, len(index)))
+    data = pd.DataFrame(
+        {"open": close, "high": close + 0.3, "low": close - 0.3, "close": close, "volume": 1e3},
+        index=index,
+    )
+    replayed = create_strategy(name)
+    replayed.reset_stream()
+    for timestamp, bar in data.iloc[:250].iterrows():
+        replayed.update(timestamp, bar)
+    primed = create_strategy(name)
+    primed.prime_stream(data.iloc[:250])
+    for timestamp, bar in data.iloc[250:].iterrows():
+        assert primed.update(timestamp, bar) == pytest.approx(replayed.update(timestamp, bar))
+
+
+@pytest.mark.parametrize(
+    ("name", "params"),
+    [
+        ("sma_cross", {}),
+        ("sma_cross", {"trend_timeframe": "1h", "trend_window": 3}),
+        ("rsi_reversion", {}),
+        ("macd_trend", {}),
+        ("breakout_vwap", {}),
+        ("expression", {}),
+        ("ensemble", {"mode": "weighted", "threshold": 0.25}),
+    ],
+)
+def test_signal_codes_match_on_bar(name: str, params: dict) -> None:
+    rng = np.random.default_rng(8)
+    index = pd.date_range("2024-01-02 09:30", periods=300, freq="15min", tz="US/Eastern")
+    close = 100 + np.cumsum(rng.normal(0, 0.5, len(index)))
+    data = pd.DataFrame(
+        {"open": close, "high": close + 0.3, "low": close - 0.3, "close": close, "volume": 1e3},
+        index=index,
+    )
+    strategy = create_strategy(name, **params)
+    state = strategy.prepare(data)
+    codes, confidences = strategy.signal_codes(data, state)
+    expected = [strategy.on_bar(bar, state) for _, bar in data.iterrows()]
+    assert codes.tolist() == [SIGNAL_CODES[signal] for signal, _ in expected]
+    assert confidences == pytest.approx([confidence for _, confidence in expected])
+
+
+def test_registry_loads_entry_point_strategies_lazily(monkeypatch: pytest.MonkeyPatch) -> None:
+    value = "trading_bot.strategies.sma_cross:SmaCrossStrategy"
+    found = [EntryPoint("plugin_sma", value, registry.ENTRY_POINT_GROUP)]
+    monkeypatch.setattr(registry, "entry_points", lambda group: found)
+    strategies = registry.StrategyRegistry({"builtin": value})
+    assert strategies._classes == {}
+    assert strategies["builtin"] is SmaCrossStrategy and not strategies._discovered
+    assert strategies["plugin_sma"] is SmaCrossStrategy
+    assert list(strategies) == ["builtin", "plugin_sma"]
+    with pytest.raises(KeyError):
+        strategies["missing"]
@@ -1,14 +1,74 @@
-"""Backtesting utilities."""
+"""Backtesting utilities.
+
+Names are imported from their submodules on first access, so e.g. importing
+``trading_bot.backtest.engine`` does not load scikit-learn for the optimizer.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .batch import BatchMatrix, BatchResult, load_matrix, run_batch
+    from .compare import compare_strategies
+    from .engine import BacktestEngine, BacktestResult, BacktestState, StreamResult, Trade
+    from .metrics import PerformanceSummary
+    from .portfolio import PortfolioEngine, PortfolioResult
+    from .robustness import RobustnessResult, analyze_robustness, export_robustness
+    from .walkforward import OptimizationResult, grid_search
+
+_EXPORTS = {
+    "BacktestEngine": "engine",
+    "BacktestResult": "engine",
+    "BacktestState": "engine",
+    "BatchMatrix": "batch",
+    "BatchResult": "batch",
+    "OptimizationResult": "walkforward",
+    "PerformanceSummary": "metrics",
+    "PortfolioEngine": "portfolio",
+    "PortfolioResult": "portfolio",
+    "RobustnessResult": "robustness",
+    "StreamResult": "engine",
+    "Trade": "engine",
+    "analyze_robustness": "robustness",
+    "compare_strategies": "compare",
+    "export_robustness": "robustness",
+    "grid_search": "walkforward",
+    "load_matrix": "batch",
+    "run_batch": "batch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS})
 
-from .engine import BacktestEngine, BacktestResult, Trade
-from .metrics import PerformanceSummary
-from .walkforward import OptimizationResult, grid_search
 
 __all__ = [
     "BacktestEngine",
     "BacktestResult",
+    "BacktestState",
+    "BatchMatrix",
+    "BatchResult",
     "OptimizationResult",
     "PerformanceSummary",
+    "PortfolioEngine",
+    "PortfolioResult",
+    "RobustnessResult",
+    "StreamResult",
     "Trade",
+    "analyze_robustness",
+    "compare_strategies",
+    "export_robustness",
     "grid_search",
+    "load_matrix",
+    "run_batch",
 ]
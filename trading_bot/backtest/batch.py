@@ -0,0 +1,299 @@
+"""Batch backtests over a ticker x strategy x settings matrix in a process pool."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import structlog
+import yaml
+from pydantic import BaseModel, Field, field_validator
+
+from trading_bot.config import Config, StrategyConfig, load_config
+
+from .engine import BacktestEngine
+
+log = structlog.get_logger(__name__)
+
+RESULTS_FILE = "results.csv"
+KEY_COLUMNS = ["ticker", "strategy", "params", "settings"]
+# Settings may not change which bars are loaded: each ticker's bars are shared by all cells.
+DATA_FIELDS = frozenset({"tickers", "bar_size", "start", "end"})
+
+Loader = Callable[[str, Config], pd.DataFrame]
+
+
+def _no_settings() -> list[dict[str, Any]]:
+    return [{}]
+
+
+class BatchMatrix(BaseModel):
+    """Backtests to run: every ticker x strategy x settings combination.
+
+    ``base`` is a regular config file supplying everything the matrix does not vary
+    (default: :data:`~trading_bot.config.DEFAULT_CONFIG_PATH`);
+    ``tickers`` and ``strategies`` default to the base config's. Each entry in
+    ``settings`` is a partial config (e.g. ``{transaction_cost_bps: 5}`` or
+    ``{risk: {stop_loss: 0.01}}``) merged over the base.
+    """
+
+    base: Path | None = None
+    tickers: list[str] = Field(default_factory=list)
+    strategies: list[StrategyConfig] = Field(default_factory=list)
+    settings: list[dict[str, Any]] = Field(default_factory=_no_settings)
+
+    @field_validator("tickers", mode="before")
+    @classmethod
+    def _uppercase(cls, v):  # type: ignore[override]
+        return [item.upper() for item in v] if isinstance(v, list) else v
+
+    @field_validator("strategies", mode="before")
+    @classmethod
+    def _names(cls, v):  # type: ignore[override]
+        if isinstance(v, list):
+            return [{"name": item} if isinstance(item, str) else item for item in v]
+        return v
+
+    @field_validator("settings")
+    @classmethod
+    def _no_data_fields(cls, v: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for setting in v:
+            if DATA_FIELDS & setting.keys():
+                raise ValueError(f"settings cannot override {sorted(DATA_FIELDS)}")
+        return v or [{}]
+
+
+@dataclass(frozen=True)
+class BatchCell:
+    """One backtest of the matrix; the ticker is implied by the task it belongs to."""
+
+    strategy: StrategyConfig
+    settings: dict[str, Any]
+
+    def key(self, ticker: str) -> tuple[str, str, str, str]:
+        return (
+            ticker,
+            self.strategy.name,
+            json.dumps(self.strategy.params, sort_keys=True),
+            json.dumps(self.settings, sort_keys=True),
+        )
+
+    def label(self, ticker: str) -> str:
+        return " ".join(part for part in self.key(ticker) if part != "{}")
+
+
+@dataclass
+class BatchResult:
+    table: pd.DataFrame
+    ran: int
+    skipped: int
+    failed: dict[str, str]
+
+
+def load_matrix(path: str | Path) -> tuple[BatchMatrix, Config]:
+    """Load a matrix file and the base config it points at (relative to the matrix), or
+    the default config file the other commands read when it names none."""
+
+    matrix_path = Path(path)
+    if not matrix_path.exists():
+        raise FileNotFoundError(f"Matrix file not found: {matrix_path}")
+    matrix = BatchMatrix(**(yaml.safe_load(matrix_path.read_text()) or {}))
+    base = load_config(matrix_path.parent / matrix.base if matrix.base else None)
+    return matrix, base
+
+
+def _merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def pending_cells(
+    matrix: BatchMatrix, base: Config, output_dir: Path
+) -> dict[str, list[BatchCell]]:
+    """Cells per ticker that have no row in ``output_dir``'s results table yet."""
+
+    done: set[tuple[str, ...]] = set()
+    results = output_dir / RESULTS_FILE
+    if results.exists():
+        table = pd.read_csv(results, usecols=KEY_COLUMNS, dtype=str, keep_default_na=False)
+        done = set(table.itertuples(index=False, name=None))
+    strategies = matrix.strategies or [base.strategy]
+    cells = [BatchCell(strategy, setting) for strategy in strategies for setting in matrix.settings]
+    pending: dict[str, list[BatchCell]] = {}
+    for ticker in dict.fromkeys(matrix.tickers or base.tickers):
+        todo = [cell for cell in cells if cell.key(ticker) not in done]
+        if todo:
+            pending[ticker] = todo
+    return pending
+
+
+def _data_range(config: Config) -> tuple[str, str]:
+    return config.start or "2018-01-01", config.end or "2024-01-01"
+
+
+def load_cached_bars(ticker: str, config: Config) -> pd.DataFrame:
+    """Default loader: the ticker's bars for the config's range, from the Parquet cache."""
+
+    from trading_bot.data import PolygonDataSource
+
+    return PolygonDataSource().fetch_and_cache(ticker, *_data_range(config), config.bar_size)
+
+
+def cache_benchmark(config: Config) -> None:
+    """Fetch the benchmark ticker's bars into the cache once, before the workers start, so
+    every cell prices the same benchmark curve from it."""
+
+    from trading_bot.data import PolygonDataSource
+
+    try:
+        PolygonDataSource().fetch_and_cache(
+            config.benchmark_ticker, *_data_range(config), config.bar_size
+        )
+    except Exception as exc:
+        log.warning("batch.benchmark_fetch_failed", ticker=config.benchmark_ticker, error=str(exc))
+
+
+def run_ticker(
+    ticker: str, base: dict[str, Any], cells: list[BatchCell], loader: Loader
+) -> tuple[list[dict[str, Any]], dict[str, str]]:
+    """Load ``ticker``'s bars once and backtest every cell on them.
+
+    Returns the rows of the cells that ran and the errors of those that failed, by
+    :meth:`BatchCell.label`; a failed cell does not stop the others.
+    """
+
+    data = loader(ticker, Config(**base))
+    engine = BacktestEngine(quiet=True)
+    rows: list[dict[str, Any]] = []
+    failed: dict[str, str] = {}
+    for cell in cells:
+        started = time.perf_counter()
+        try:
+            config = Config(
+                **_merge(base, {**cell.settings, "strategy": cell.strategy.model_dump()})
+            )
+            result = engine.run(data, config, None)
+        except Exception as exc:
+            failed[cell.label(ticker)] = str(exc)
+            continue
+        key = dict(zip(KEY_COLUMNS, cell.key(ticker), strict=True))
+        rows.append(
+            {
+                **key,
+                **result.summary.to_dict(),
+                "benchmark_return": result.benchmark.total_return,
+                "bars": len(data),
+                "seconds": round(time.perf_counter() - started, 4),
+            }
+        )
+    return rows, failed
+
+
+def run_batch(
+    matrix: BatchMatrix,
+    base: Config,
+    output_dir: Path,
+    workers: int = 1,
+    loader: Loader = load_cached_bars,
+    progress: Callable[[int], None] | None = None,
+) -> BatchResult:
+    """Run every cell of ``matrix`` not already in ``output_dir/results.csv``.
+
+    Each ticker is one task: its bars are loaded once in a worker process and shared by
+    all of its strategy/settings cells. Rows are appended to the results table as tasks
+    finish, so an interrupted batch resumes where it stopped, as does a rerun for the
+    cells that failed. ``progress`` receives the number of cells each finished task
+    completed. ``workers=1`` runs in this process.
+    With the default loader the benchmark is cached here first; workers only read it.
+    """
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = output_dir / RESULTS_FILE
+    pending = pending_cells(matrix, base, output_dir)
+    tickers = dict.fromkeys(matrix.tickers or base.tickers)
+    total = len(tickers) * len(matrix.strategies or [base.strategy]) * len(matrix.settings)
+    todo = sum(len(cells) for cells in pending.values())
+    skipped = total - todo
+    log.info("batch.start", cells=total, pending=todo, tickers=len(pending), workers=workers)
+
+    started = time.perf_counter()
+    ran = 0
+    failed: dict[str, str] = {}
+    base_payload = base.model_dump(mode="json")
+    if pending and loader is load_cached_bars:
+        cache_benchmark(base)
+
+    def record(outcome: tuple[list[dict[str, Any]], dict[str, str]]) -> None:
+        nonlocal ran
+        rows, errors = outcome
+        if rows:
+            pd.DataFrame(rows).to_csv(results, mode="a", header=not results.exists(), index=False)
+        ran += len(rows)
+        for cell, error in errors.items():
+            failed[cell] = error
+            log.warning("batch.failed", cell=cell, error=error)
+        if progress is not None:
+            progress(len(rows) + len(errors))
+
+    def fail(ticker: str, exc: Exception) -> None:
+        failed[ticker] = str(exc)
+        log.warning("batch.failed", ticker=ticker, error=str(exc))
+        if progress is not None:
+            progress(len(pending[ticker]))
+
+    if workers <= 1:
+        for ticker, cells in pending.items():
+            try:
+                record(run_ticker(ticker, base_payload, cells, loader))
+            except Exception as exc:
+                fail(ticker, exc)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(run_ticker, ticker, base_payload, cells, loader): ticker
+                for ticker, cells in pending.items()
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    record(future.result())
+                except Exception as exc:
+                    fail(ticker, exc)
+
+    table = (
+        pd.read_csv(results, dtype=dict.fromkeys(KEY_COLUMNS, str), keep_default_na=False)
+        if results.exists()
+        else pd.DataFrame(columns=KEY_COLUMNS)
+    )
+    log.info(
+        "batch.completed",
+        ran=ran,
+        skipped=skipped,
+        failed=len(failed),
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    return BatchResult(table=table, ran=ran, skipped=skipped, failed=failed)
+
+
+__all__ = [
+    "BatchCell",
+    "BatchMatrix",
+    "BatchResult",
+    "cache_benchmark",
+    "load_cached_bars",
+    "load_matrix",
+    "pending_cells",
+    "run_batch",
+    "run_ticker",
+]
@@ -2,21 +2,146 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
 import pandas as pd
+import structlog
+
+from trading_bot.data import cache
+
+from .metrics import PerformanceSummary, summarize_backtest
+
+log = structlog.get_logger(__name__)
+
+# Benchmark curves (with their summaries) kept per process; oldest evicted first.
+BENCHMARK_MEMO_SIZE = 64
+
+
+@dataclass(frozen=True)
+class BenchmarkCurve:
+    """A buy-and-hold curve and its summary; ``cached`` if priced from the ticker's cache."""
+
+    equity: pd.Series
+    summary: PerformanceSummary
+    shares: float
+    cached: bool
+
+
+_curves: dict[tuple[object, ...], BenchmarkCurve] = {}
+_fallbacks: set[tuple[str, str]] = set()
+
+
+def benchmark_shares(data: pd.DataFrame, starting_equity: float = 100_000.0) -> float:
+    """Shares bought with ``starting_equity`` at the first close of ``data``."""
+
+    return starting_equity / data["close"].iloc[0]
 
 
 def buy_and_hold_benchmark(
-    data: pd.DataFrame, ticker: str, starting_equity: float = 100_000.0
+    data: pd.DataFrame,
+    ticker: str,
+    starting_equity: float = 100_000.0,
+    shares: float | None = None,
 ) -> pd.Series:
-    """Compute a buy-and-hold equity curve for the provided price series."""
+    """Compute a buy-and-hold equity curve for the provided price series.
+
+    ``shares`` continues an earlier curve instead of buying at the first close.
+    """
 
     if data.empty:
         raise ValueError("No data provided for benchmark")
     prices = data["close"]
-    shares = starting_equity / prices.iloc[0]
+    if shares is None:
+        shares = benchmark_shares(data, starting_equity)
     equity = prices * shares
     equity.name = f"benchmark_{ticker}"
     return equity
 
 
-__all__ = ["buy_and_hold_benchmark"]
+@lru_cache(maxsize=32)
+def _cached_closes(
+    ticker: str, bar_size: str, start: pd.Timestamp, end: pd.Timestamp, directory: Path
+) -> pd.Series | None:
+    bars = cache.load_cached_range(ticker, bar_size, start, end, columns=["close"])
+    return None if bars is None else bars["close"]
+
+
+def benchmark_prices(
+    index: pd.DatetimeIndex, ticker: str, bar_size: str, previous: float | None = None
+) -> pd.Series | None:
+    """Cached closes of ``ticker`` on the bars of ``index``, or ``None`` if none are cached.
+
+    Bars without a benchmark bar at the same time carry the last close forward, starting
+    from ``previous`` (else the first cached close) before the first one.
+    """
+
+    closes = _cached_closes(ticker, bar_size, index[0], index[-1], cache.CACHE_DIR)
+    if closes is None:
+        return None
+    if closes.index.tz is not None and index.tz is not None:
+        closes = closes.tz_convert(index.tz)
+    prices = closes.reindex(index, method="ffill")
+    if previous is not None:
+        prices = prices.fillna(previous)
+    return prices.bfill().rename("close")
+
+
+def benchmark_curve(
+    index: pd.DatetimeIndex,
+    ticker: str,
+    bar_size: str,
+    fallback: pd.Series | None = None,
+    starting_equity: float = 100_000.0,
+) -> BenchmarkCurve | None:
+    """Buy-and-hold of ``ticker`` over the bars of ``index``, with its summary.
+
+    Prices come from ``ticker``'s cached bars (:func:`benchmark_prices`). Those curves are
+    memoized by ticker, bar size, range and bar count, so runs over the same bars (e.g.
+    optimizer folds) share one curve and summary; treat them as read-only. Without cached
+    bars the curve follows the ``fallback`` closes, recomputed each call, or is ``None``.
+    """
+
+    if index.empty:
+        raise ValueError("No data provided for benchmark")
+    key = (ticker, bar_size, index[0], index[-1], len(index), starting_equity, cache.CACHE_DIR)
+    curve = _curves.get(key)
+    if curve is not None:
+        return curve
+    prices = benchmark_prices(index, ticker, bar_size)
+    cached = prices is not None
+    if prices is None:
+        if fallback is None:
+            return None
+        if (ticker, bar_size) not in _fallbacks:
+            _fallbacks.add((ticker, bar_size))
+            log.warning("benchmark.not_cached", ticker=ticker, bar_size=bar_size)
+        prices = fallback
+    equity = buy_and_hold_benchmark(prices.to_frame("close"), ticker, starting_equity)
+    summary = summarize_backtest(equity, [], pd.Series(index=equity.index, data=0.0))
+    curve = BenchmarkCurve(equity, summary, starting_equity / prices.iloc[0], cached)
+    if cached:
+        if len(_curves) >= BENCHMARK_MEMO_SIZE:
+            del _curves[next(iter(_curves))]
+        _curves[key] = curve
+    return curve
+
+
+def clear_benchmark_cache() -> None:
+    """Forget memoized benchmark prices and curves, e.g. after refreshing the cache."""
+
+    _cached_closes.cache_clear()
+    _curves.clear()
+    _fallbacks.clear()
+
+
+__all__ = [
+    "BENCHMARK_MEMO_SIZE",
+    "BenchmarkCurve",
+    "benchmark_curve",
+    "benchmark_prices",
+    "benchmark_shares",
+    "buy_and_hold_benchmark",
+    "clear_benchmark_cache",
+]
@@ -0,0 +1,53 @@
+"""Side-by-side comparison of ensemble members backtested from one data pass."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from trading_bot.config import Config
+from trading_bot.strategies import create_strategy
+from trading_bot.strategies.ensemble import COMBINED, EnsembleStrategy
+
+from .engine import BacktestEngine, BacktestResult
+
+
+def compare_strategies(
+    data: pd.DataFrame,
+    config: Config,
+    report_path: Path | None = None,
+    engine: BacktestEngine | None = None,
+) -> tuple[pd.DataFrame, dict[str, BacktestResult]]:
+    """Backtest every ensemble member and the combined signal on the same data.
+
+    ``config.strategy`` must describe an ``ensemble``. Member indicators and signals are
+    computed once by :meth:`EnsembleStrategy.prepare`; each member is then traded by
+    replaying its signal column. Returns a table with one row per strategy plus the
+    individual results. When ``report_path`` is given the combined strategy's report and
+    ``comparison.csv`` are written there.
+    """
+
+    strategy = create_strategy(config.strategy.name, **config.strategy.params)
+    if not isinstance(strategy, EnsembleStrategy):
+        raise ValueError("compare_strategies requires an 'ensemble' strategy configuration")
+    engine = engine or BacktestEngine()
+    state = strategy.prepare(data)
+
+    results: dict[str, BacktestResult] = {}
+    for label in [*strategy.labels, COMBINED]:
+        replay = strategy.replay(label, state)
+        path = report_path if label == COMBINED else None
+        results[label] = engine.run(data, config, path, strategy=replay)
+
+    table = pd.DataFrame({label: result.summary.to_dict() for label, result in results.items()}).T
+    table.index.name = "strategy"
+    benchmark = next(iter(results.values())).benchmark.to_dict()
+    table.loc["benchmark"] = pd.Series(benchmark)
+    if report_path is not None:
+        report_path.mkdir(parents=True, exist_ok=True)
+        table.to_csv(report_path / "comparison.csv")
+    return table, results
+
+
+__all__ = ["compare_strategies"]
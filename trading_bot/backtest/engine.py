@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import contextlib
+import copy
+import json
+import logging
+import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -9,11 +15,19 @@ import pandas as pd
 import structlog
 
 from trading_bot.config import Config
-from trading_bot.strategies import Signal, create_strategy
+from trading_bot.live.checkpoint import Checkpointer
+from trading_bot.logging_config import is_enabled
+from trading_bot.strategies import Signal, Strategy, create_strategy
 
-from .benchmark import buy_and_hold_benchmark
-from .metrics import PerformanceSummary, summarize_backtest
+from .benchmark import (
+    benchmark_curve,
+    benchmark_prices,
+    benchmark_shares,
+    buy_and_hold_benchmark,
+)
+from .metrics import MetricAccumulator, PerformanceSummary, summarize_backtest
 from .plotting import generate_plots
+from .sink import ParquetSink
 
 log = structlog.get_logger(__name__)
 
@@ -26,9 +40,12 @@ class Trade:
     entry_price: float
     exit_price: float
     pnl: float
+    ticker: str | None = None
 
     def to_dict(self) -> dict[str, float]:
+        row = {"ticker": self.ticker} if self.ticker is not None else {}
         return {
+            **row,
             "entry_time": self.entry_time.isoformat(),
             "exit_time": self.exit_time.isoformat(),
             "qty": self.qty,
@@ -38,6 +55,55 @@ class Trade:
         }
 
 
+@dataclass
+class _Book:
+    cash: float
+    position: float = 0.0
+    entry_price: float = 0.0
+    entry_time: pd.Timestamp | None = None
+    # Cash paid for the open position, entry costs included; closes charge it to P&L.
+    basis: float = 0.0
+
+
+@dataclass
+class _Segment:
+    """Per-bar outputs and trades of one stretch of bars."""
+
+    equity: pd.Series
+    positions: pd.Series
+    exposures: pd.Series
+    signals: pd.Series
+    trades: list[Trade]
+    benchmark: pd.Series
+
+
+@dataclass
+class BacktestState:
+    """Where a backtest stopped, for :meth:`BacktestEngine.resume` to continue from.
+
+    ``strategy`` carries its incremental indicators when it supports streaming; other
+    strategies are re-prepared over ``tail``, their :meth:`~Strategy.warmup` bars, plus
+    the new bars. ``metrics`` and
+    ``benchmark`` exclude the closing of any position still open at ``last_time``.
+    ``benchmark_close`` is the last cached benchmark close, or ``None`` when the
+    benchmark follows the traded bars' own closes.
+    """
+
+    fingerprint: str
+    last_time: pd.Timestamp | None
+    book: _Book
+    strategy: Strategy
+    tail: pd.DataFrame | None
+    metrics: MetricAccumulator
+    benchmark: MetricAccumulator
+    benchmark_shares: float | None
+    benchmark_close: float | None = None
+
+    def save(self, path: Path) -> None:
+        checkpointer = Checkpointer(path, self.fingerprint)
+        checkpointer.save(checkpointer.encode({"backtest": self}))
+
+
 @dataclass
 class BacktestResult:
     equity_curve: pd.Series
@@ -47,188 +113,562 @@ class BacktestResult:
     summary: PerformanceSummary
     benchmark: PerformanceSummary
     signals: pd.Series
+    state: BacktestState | None = None
+
+
+@dataclass
+class StreamResult:
+    """Outcome of :meth:`BacktestEngine.run_stream`; per-bar outputs are in its sink."""
+
+    summary: PerformanceSummary
+    benchmark: PerformanceSummary
+    bars: int
+    trades: int
+    state: BacktestState
 
 
 class BacktestEngine:
     """Event-driven long-only backtest engine."""
 
-    def __init__(self, starting_equity: float = 100_000.0) -> None:
+    def __init__(self, starting_equity: float = 100_000.0, quiet: bool = False) -> None:
         self.starting_equity = starting_equity
+        # Skip the per-fill events; runs still log one summary line each.
+        self.quiet = quiet
+
+    def run(
+        self,
+        data: pd.DataFrame,
+        config: Config,
+        report_path: Path | None,
+        strategy: Strategy | None = None,
+        keep_state: bool = False,
+    ) -> BacktestResult:
+        """Backtest ``data`` and export a report unless ``report_path`` is ``None``.
+
+        ``strategy`` overrides the strategy described by ``config.strategy``. With
+        ``keep_state`` the result carries a :class:`BacktestState` for :meth:`resume`.
+        """
 
-    def run(self, data: pd.DataFrame, config: Config, report_path: Path) -> BacktestResult:
         if data.empty:
             raise ValueError("No data provided for backtest")
-        strategy = create_strategy(config.strategy.name, **config.strategy.params)
+        started = time.perf_counter()
+        if strategy is None:
+            strategy = create_strategy(config.strategy.name, **config.strategy.params)
         state = strategy.prepare(data)
 
+        book = _Book(cash=self.starting_equity)
+        signals = (strategy.on_bar(bar, state) for _, bar in data.iterrows())
+        equity_series, position_series, exposure_series, signal_series, trades = self._simulate(
+            data, config, strategy, book, signals
+        )
+        # The open position is closed on a copy so the state can keep holding it.
+        closed = [*trades, *self._close_final(copy.deepcopy(book), data, config)]
+
+        trade_returns = [trade.pnl / self.starting_equity for trade in closed]
+        summary = summarize_backtest(equity_series, trade_returns, exposure_series)
+
+        curve = benchmark_curve(
+            data.index, config.benchmark_ticker, config.bar_size, fallback=data["close"]
+        )
+        assert curve is not None
+        benchmark_series, benchmark_summary = curve.equity, curve.summary
+        log.info(
+            "backtest.completed",
+            strategy=strategy.name,
+            bars=len(data),
+            trades=len(closed),
+            total_return=round(summary.total_return, 6),
+            sharpe=round(summary.sharpe, 4),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+        backtest_state = None
+        if keep_state:
+            metrics = MetricAccumulator()
+            metrics.update(equity_series, exposure_series, trade_returns[: len(trades)])
+            benchmark = MetricAccumulator()
+            benchmark.update(benchmark_series, pd.Series(index=data.index, data=0.0))
+            tail = None
+            if strategy.supports_streaming():
+                strategy.prime_stream(data)
+            else:
+                tail = strategy.warmup(data)
+            backtest_state = BacktestState(
+                fingerprint=self.fingerprint(config),
+                last_time=data.index[-1],
+                book=book,
+                strategy=strategy,
+                tail=tail,
+                metrics=metrics,
+                benchmark=benchmark,
+                benchmark_shares=curve.shares,
+                benchmark_close=benchmark_series.iloc[-1] / curve.shares if curve.cached else None,
+            )
+
+        if report_path is not None:
+            export_report(
+                report_path,
+                equity_series,
+                position_series,
+                closed,
+                summary,
+                benchmark_summary,
+                benchmark_series,
+                signal_series,
+            )
+
+        return BacktestResult(
+            equity_curve=equity_series,
+            positions=position_series,
+            exposures=exposure_series,
+            trades=closed,
+            summary=summary,
+            benchmark=benchmark_summary,
+            signals=signal_series,
+            state=backtest_state,
+        )
+
+    def resume(
+        self,
+        state: BacktestState,
+        data: pd.DataFrame,
+        config: Config,
+        report_path: Path | None = None,
+    ) -> BacktestResult:
+        """Continue the backtest ``state`` was taken from over the bars of ``data`` after it.
+
+        Only the new bars are simulated. The returned curves and trades cover those bars;
+        ``summary`` and ``benchmark`` cover the whole run and match a full rerun over all
+        bars up to floating point round-off. ``report_path`` is appended to (plots are not
+        re-rendered; use ``tb plot``). ``state`` itself is left unchanged.
+        """
+
+        if state.fingerprint != self.fingerprint(config):
+            raise ValueError("Backtest state was saved under a different configuration")
+        if state.last_time is not None:
+            data = data[data.index > state.last_time]
+        if data.empty:
+            raise ValueError(f"No bars after {state.last_time}")
+        state = copy.deepcopy(state)
+        # The earlier report closed this position at its last bar; that trade is replaced.
+        provisional = state.book.position > 0
+        segment = self._advance(state, data, config)
+
+        final = self._close_final(copy.deepcopy(state.book), data, config)
+        closed = [*segment.trades, *final]
+        metrics = copy.deepcopy(state.metrics)
+        metrics.add_trades(t.pnl / self.starting_equity for t in final)
+        summary = metrics.summary()
+        benchmark_summary = state.benchmark.summary()
+        log.info("backtest.resumed", bars=len(data), trades=len(closed))
+
+        if report_path is not None:
+            append_report(
+                report_path,
+                segment.equity,
+                segment.positions,
+                closed,
+                summary,
+                benchmark_summary,
+                segment.benchmark,
+                segment.signals,
+                replace_last_trade=provisional,
+            )
+
+        return BacktestResult(
+            equity_curve=segment.equity,
+            positions=segment.positions,
+            exposures=segment.exposures,
+            trades=closed,
+            summary=summary,
+            benchmark=benchmark_summary,
+            signals=segment.signals,
+            state=state,
+        )
+
+    def run_stream(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        config: Config,
+        output_path: Path | None,
+        strategy: Strategy | None = None,
+    ) -> StreamResult:
+        """Backtest bars arriving in time-ordered ``chunks``, e.g. Parquet row groups.
+
+        Indicator and position state carry across chunk boundaries (through
+        :meth:`Strategy.update`, or the :meth:`Strategy.warmup` bars for strategies
+        without streaming, which by default keep the whole history), per-bar outputs
+        and trades go to a :class:`ParquetSink` at ``output_path`` as each chunk
+        completes, and the summary comes from running accumulators, so memory is
+        bounded by the chunk size rather than the history.
+        """
+
+        started = time.perf_counter()
+        state = self.start_state(config, strategy)
+        bars = trades = 0
+        last_bar: pd.DataFrame | None = None
+        with contextlib.ExitStack() as stack:
+            sink = stack.enter_context(ParquetSink(output_path)) if output_path else None
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                segment = self._advance(state, chunk, config)
+                if sink is not None:
+                    sink.write_bars(
+                        segment.equity,
+                        segment.positions,
+                        segment.exposures,
+                        segment.signals,
+                        segment.benchmark,
+                    )
+                    sink.write_trades(segment.trades)
+                bars += len(chunk)
+                trades += len(segment.trades)
+                last_bar = chunk.iloc[-1:]
+                log.debug("backtest.chunk", bars=len(chunk), last=str(state.last_time))
+            if last_bar is None:
+                raise ValueError("No data provided for backtest")
+            final = self._close_final(copy.deepcopy(state.book), last_bar, config)
+            if sink is not None:
+                sink.write_trades(final)
+
+        metrics = copy.deepcopy(state.metrics)
+        metrics.add_trades(t.pnl / self.starting_equity for t in final)
+        summary = metrics.summary()
+        benchmark_summary = state.benchmark.summary()
+        if output_path is not None:
+            (output_path / "summary.json").write_text(
+                pd.Series(summary.to_dict()).to_json(indent=2)
+            )
+            (output_path / "benchmark.json").write_text(
+                pd.Series(benchmark_summary.to_dict()).to_json(indent=2)
+            )
+        log.info(
+            "backtest.streamed",
+            bars=bars,
+            trades=trades + len(final),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+        return StreamResult(summary, benchmark_summary, bars, trades + len(final), state)
+
+    def start_state(self, config: Config, strategy: Strategy | None = None) -> BacktestState:
+        """A state before any bar, for :meth:`run_stream` to advance chunk by chunk."""
+
+        if strategy is None:
+            strategy = create_strategy(config.strategy.name, **config.strategy.params)
+        if strategy.supports_streaming():
+            strategy.reset_stream()
+        return BacktestState(
+            fingerprint=self.fingerprint(config),
+            last_time=None,
+            book=_Book(cash=self.starting_equity),
+            strategy=strategy,
+            tail=None,
+            metrics=MetricAccumulator(),
+            benchmark=MetricAccumulator(),
+            benchmark_shares=None,
+        )
+
+    def _advance(self, state: BacktestState, data: pd.DataFrame, config: Config) -> _Segment:
+        """Trade the non-empty ``data`` following ``state``, updating ``state`` in place.
+
+        The closing of a position still open after ``data`` is left to the caller.
+        """
+
+        strategy = state.strategy
+        if strategy.supports_streaming():
+            records = data.to_dict("records")
+            signals = (
+                strategy.update(timestamp, bar)
+                for timestamp, bar in zip(data.index, records, strict=True)
+            )
+        else:
+            combined = data if state.tail is None else pd.concat([state.tail, data])
+            prepared = strategy.prepare(combined)
+            new_bars = combined.iloc[len(combined) - len(data) :]
+            signals = (strategy.on_bar(bar, prepared) for _, bar in new_bars.iterrows())
+            state.tail = strategy.warmup(combined)
+        prices = None
+        if state.benchmark_shares is None or state.benchmark_close is not None:
+            prices = benchmark_prices(
+                data.index, config.benchmark_ticker, config.bar_size, state.benchmark_close
+            )
+            if prices is None and state.benchmark_close is not None:
+                prices = pd.Series(state.benchmark_close, index=data.index, name="close")
+        # Without cached benchmark bars the benchmark follows the traded closes.
+        benchmark_bars = data if prices is None else prices.to_frame()
+        if state.benchmark_shares is None:
+            state.benchmark_shares = benchmark_shares(benchmark_bars)
+        if prices is not None:
+            state.benchmark_close = float(prices.iloc[-1])
+
+        equity, positions, exposures, signal_series, trades = self._simulate(
+            data, config, strategy, state.book, signals
+        )
+        benchmark = buy_and_hold_benchmark(
+            benchmark_bars, config.benchmark_ticker, shares=state.benchmark_shares
+        )
+        state.metrics.update(equity, exposures, [t.pnl / self.starting_equity for t in trades])
+        state.benchmark.update(benchmark, pd.Series(index=benchmark.index, data=0.0))
+        state.last_time = data.index[-1]
+        return _Segment(equity, positions, exposures, signal_series, trades, benchmark)
+
+    def fingerprint(self, config: Config) -> str:
+        """Everything a :class:`BacktestState` depends on besides the bars themselves."""
+
+        return json.dumps(
+            [
+                config.strategy.model_dump(),
+                config.risk.model_dump(),
+                config.transaction_cost_bps,
+                config.slippage_bps,
+                config.bar_size,
+                config.benchmark_ticker,
+                self.starting_equity,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    def load_state(self, path: Path, config: Config) -> BacktestState | None:
+        """The state saved at ``path``, or ``None`` if missing or saved under another config."""
+
+        saved = Checkpointer(path, self.fingerprint(config)).load()
+        return saved["backtest"] if saved else None
+
+    def _simulate(
+        self,
+        data: pd.DataFrame,
+        config: Config,
+        strategy: Strategy,
+        book: _Book,
+        signals: Iterator[tuple[Signal, float]],
+    ) -> tuple[pd.Series, pd.Series, pd.Series, pd.Series, list[Trade]]:
+        """Trade ``signals`` (one per bar of ``data``) against ``book``, updating it in place."""
+
         transaction_cost = config.transaction_cost_bps / 10_000
         slippage = config.slippage_bps / 10_000
-
-        cash = self.starting_equity
-        position = 0.0
-        entry_price = 0.0
-        entry_time: pd.Timestamp | None = None
         trades: list[Trade] = []
+        # Decided once per stretch: fill events are skipped before formatting their fields.
+        fills = self._logs_fills()
 
         equity_curve: list[float] = []
         positions: list[float] = []
         exposures: list[float] = []
-        signals: list[str] = []
-        index: list[pd.Timestamp] = []
-
-        def close_position(timestamp: pd.Timestamp, price: float, reason: str) -> None:
-            nonlocal cash, position, entry_price, entry_time
-            if position == 0 or entry_time is None:
-                return
-            trade_price = price * (1 - slippage)
-            proceeds = position * trade_price
-            cost = proceeds * transaction_cost
-            cash += proceeds - cost
-            pnl = (trade_price - entry_price) * position - cost
-            trades.append(
-                Trade(
-                    entry_time=entry_time,
-                    exit_time=timestamp,
-                    qty=position,
-                    entry_price=entry_price,
-                    exit_price=trade_price,
-                    pnl=pnl,
-                )
-            )
-            log.info("backtest.close", time=timestamp.isoformat(), reason=reason, pnl=pnl)
-            position = 0.0
-            entry_price = 0.0
-            entry_time = None
-
-        for timestamp, bar in data.iterrows():
-            price = float(bar["close"])
-            signal, confidence = strategy.on_bar(bar, state)
-            equity = cash + position * price
-            target_qty = position
+        signal_values: list[str] = []
+
+        for timestamp, price, (signal, _) in zip(
+            data.index, data["close"].astype(float).tolist(), signals, strict=True
+        ):
+            equity = book.cash + book.position * price
+            target_qty = book.position
             if signal is Signal.BUY:
                 target_qty = strategy.position_sizing(signal, equity, price, config.risk)
             elif signal is Signal.SELL:
                 target_qty = 0.0
-            qty_change = target_qty - position
+            qty_change = target_qty - book.position
             if qty_change > 0:  # open/scale long
                 trade_price = price * (1 + slippage)
                 cost = qty_change * trade_price * transaction_cost
-                cash -= qty_change * trade_price + cost
-                position += qty_change
-                entry_price = trade_price if entry_price == 0 else (entry_price + trade_price) / 2
-                entry_time = timestamp if entry_time is None else entry_time
-                log.info(
-                    "backtest.buy",
-                    time=timestamp.isoformat(),
-                    qty=qty_change,
-                    price=trade_price,
+                book.cash -= qty_change * trade_price + cost
+                book.basis += qty_change * trade_price + cost
+                book.position += qty_change
+                book.entry_price = (
+                    trade_price if book.entry_price == 0 else (book.entry_price + trade_price) / 2
                 )
+                book.entry_time = timestamp if book.entry_time is None else book.entry_time
+                if fills:
+                    log.info(
+                        "backtest.buy",
+                        time=timestamp.isoformat(),
+                        qty=qty_change,
+                        price=trade_price,
+                    )
             elif qty_change < 0:
                 trade_price = price * (1 - slippage)
-                qty_to_close = min(position, -qty_change)
+                qty_to_close = min(book.position, -qty_change)
                 proceeds = qty_to_close * trade_price
                 cost = proceeds * transaction_cost
-                cash += proceeds - cost
-                pnl = (trade_price - entry_price) * qty_to_close - cost
+                book.cash += proceeds - cost
+                basis = book.basis * qty_to_close / book.position
+                book.basis -= basis
+                pnl = proceeds - cost - basis
                 trades.append(
                     Trade(
-                        entry_time=entry_time or timestamp,
+                        entry_time=book.entry_time or timestamp,
                         exit_time=timestamp,
                         qty=qty_to_close,
-                        entry_price=entry_price,
+                        entry_price=book.entry_price,
                         exit_price=trade_price,
                         pnl=pnl,
                     )
                 )
-                position -= qty_to_close
-                if position == 0:
-                    entry_price = 0.0
-                    entry_time = None
-                log.info(
-                    "backtest.sell",
-                    time=timestamp.isoformat(),
-                    qty=qty_to_close,
-                    price=trade_price,
-                )
+                book.position -= qty_to_close
+                if book.position == 0:
+                    book.entry_price = 0.0
+                    book.entry_time = None
+                    book.basis = 0.0
+                if fills:
+                    log.info(
+                        "backtest.sell",
+                        time=timestamp.isoformat(),
+                        qty=qty_to_close,
+                        price=trade_price,
+                    )
 
-            equity = cash + position * price
-            if position > 0 and entry_price > 0:
-                change = (price - entry_price) / entry_price
+            equity = book.cash + book.position * price
+            if book.position > 0 and book.entry_price > 0:
+                change = (price - book.entry_price) / book.entry_price
                 if config.risk.stop_loss and change <= -config.risk.stop_loss:
-                    close_position(timestamp, price, "stop_loss")
-                    equity = cash
+                    trades.extend(
+                        self._close(
+                            book, timestamp, price, slippage, transaction_cost, "stop_loss", fills
+                        )
+                    )
+                    equity = book.cash
                 elif config.risk.take_profit and change >= config.risk.take_profit:
-                    close_position(timestamp, price, "take_profit")
-                    equity = cash
+                    trades.extend(
+                        self._close(
+                            book, timestamp, price, slippage, transaction_cost, "take_profit", fills
+                        )
+                    )
+                    equity = book.cash
 
             equity_curve.append(equity)
-            positions.append(position)
-            exposures.append(abs(position * price) / equity if equity else 0.0)
-            signals.append(signal.value)
-            index.append(timestamp)
+            positions.append(book.position)
+            exposures.append(abs(book.position * price) / equity if equity else 0.0)
+            signal_values.append(signal.value)
 
-        if position > 0 and entry_time is not None:
-            close_position(index[-1], float(data.iloc[-1]["close"]), "final")
+        index = data.index
+        return (
+            pd.Series(equity_curve, index=index, name="equity", dtype=float),
+            pd.Series(positions, index=index, name="position", dtype=float),
+            pd.Series(exposures, index=index, name="exposure", dtype=float),
+            pd.Series(signal_values, index=index, name="signal", dtype=object),
+            trades,
+        )
 
-        equity_series = pd.Series(equity_curve, index=index, name="equity")
-        position_series = pd.Series(positions, index=index, name="position")
-        exposure_series = pd.Series(exposures, index=index, name="exposure")
-        signal_series = pd.Series(signals, index=index, name="signal")
+    def _logs_fills(self) -> bool:
+        return not self.quiet and is_enabled(log, logging.INFO)
 
-        trade_returns = [trade.pnl / self.starting_equity for trade in trades]
-        summary = summarize_backtest(equity_series, trade_returns, exposure_series)
+    def _close_final(self, book: _Book, data: pd.DataFrame, config: Config) -> list[Trade]:
+        """Close a position still open after the last bar of ``data``."""
 
-        benchmark_series = buy_and_hold_benchmark(data, config.benchmark_ticker)
-        benchmark_summary = summarize_backtest(
-            benchmark_series,
-            [],
-            pd.Series(index=benchmark_series.index, data=0.0),
-        )
+        if book.position > 0 and book.entry_time is not None and not data.empty:
+            return self._close(
+                book,
+                data.index[-1],
+                float(data.iloc[-1]["close"]),
+                config.slippage_bps / 10_000,
+                config.transaction_cost_bps / 10_000,
+                "final",
+                self._logs_fills(),
+            )
+        return []
 
-        self._export(
-            report_path,
-            equity_series,
-            position_series,
-            trades,
-            summary,
-            benchmark_summary,
-            benchmark_series,
-            signal_series,
+    @staticmethod
+    def _close(
+        book: _Book,
+        timestamp: pd.Timestamp,
+        price: float,
+        slippage: float,
+        transaction_cost: float,
+        reason: str,
+        logged: bool,
+    ) -> list[Trade]:
+        if book.position == 0 or book.entry_time is None:
+            return []
+        trade_price = price * (1 - slippage)
+        proceeds = book.position * trade_price
+        cost = proceeds * transaction_cost
+        book.cash += proceeds - cost
+        pnl = proceeds - cost - book.basis
+        trade = Trade(
+            entry_time=book.entry_time,
+            exit_time=timestamp,
+            qty=book.position,
+            entry_price=book.entry_price,
+            exit_price=trade_price,
+            pnl=pnl,
         )
+        if logged:
+            log.info("backtest.close", time=timestamp.isoformat(), reason=reason, pnl=pnl)
+        book.position = 0.0
+        book.entry_price = 0.0
+        book.entry_time = None
+        book.basis = 0.0
+        return [trade]
 
-        return BacktestResult(
-            equity_curve=equity_series,
-            positions=position_series,
-            exposures=exposure_series,
-            trades=trades,
-            summary=summary,
-            benchmark=benchmark_summary,
-            signals=signal_series,
-        )
 
-    def _export(
-        self,
-        report_path: Path,
-        equity: pd.Series,
-        positions: pd.Series,
-        trades: list[Trade],
-        summary: PerformanceSummary,
-        benchmark: PerformanceSummary,
-        benchmark_curve: pd.Series,
-        signals: pd.Series,
-    ) -> None:
-        report_path.mkdir(parents=True, exist_ok=True)
-        equity.to_csv(report_path / "equity_curve.csv")
-        positions.to_csv(report_path / "positions.csv")
-        signals.to_csv(report_path / "signals.csv")
-        trades_df = pd.DataFrame([t.to_dict() for t in trades])
-        trades_df.to_csv(report_path / "trades.csv", index=False)
-        summary_payload = pd.Series(summary.to_dict()).to_json(indent=2)
-        benchmark_payload = pd.Series(benchmark.to_dict()).to_json(indent=2)
-        (report_path / "summary.json").write_text(summary_payload)
-        (report_path / "benchmark.json").write_text(benchmark_payload)
-        benchmark_curve.to_csv(report_path / "benchmark_curve.csv")
-        generate_plots(report_path, equity, benchmark_curve)
-
-
-__all__ = ["BacktestEngine", "BacktestResult", "Trade"]
+def export_report(
+    report_path: Path,
+    equity: pd.Series,
+    positions: pd.Series | pd.DataFrame,
+    trades: list[Trade],
+    summary: PerformanceSummary,
+    benchmark: PerformanceSummary,
+    benchmark_curve: pd.Series,
+    signals: pd.Series | pd.DataFrame,
+) -> None:
+    """Write the CSV/JSON report files and plots for a backtest."""
+
+    report_path.mkdir(parents=True, exist_ok=True)
+    equity.to_csv(report_path / "equity_curve.csv")
+    positions.to_csv(report_path / "positions.csv")
+    signals.to_csv(report_path / "signals.csv")
+    trades_df = pd.DataFrame([t.to_dict() for t in trades])
+    trades_df.to_csv(report_path / "trades.csv", index=False)
+    summary_payload = pd.Series(summary.to_dict()).to_json(indent=2)
+    benchmark_payload = pd.Series(benchmark.to_dict()).to_json(indent=2)
+    (report_path / "summary.json").write_text(summary_payload)
+    (report_path / "benchmark.json").write_text(benchmark_payload)
+    benchmark_curve.to_csv(report_path / "benchmark_curve.csv")
+    generate_plots(report_path, equity, benchmark_curve)
+
+
+def append_report(
+    report_path: Path,
+    equity: pd.Series,
+    positions: pd.Series,
+    trades: list[Trade],
+    summary: PerformanceSummary,
+    benchmark: PerformanceSummary,
+    benchmark_curve: pd.Series,
+    signals: pd.Series,
+    replace_last_trade: bool = False,
+) -> None:
+    """Extend the CSVs of an existing report with resumed bars and rewrite its summaries.
+
+    ``replace_last_trade`` drops the report's last trade first: the close of a position
+    that was still open when the report was written.
+    """
+
+    report_path.mkdir(parents=True, exist_ok=True)
+    for name, frame in [
+        ("equity_curve.csv", equity),
+        ("positions.csv", positions),
+        ("signals.csv", signals),
+        ("benchmark_curve.csv", benchmark_curve),
+    ]:
+        path = report_path / name
+        frame.to_csv(path, mode="a", header=not path.exists())
+    trades_path = report_path / "trades.csv"
+    trades_df = pd.DataFrame([t.to_dict() for t in trades])
+    if replace_last_trade and trades_path.exists():
+        trades_df = pd.concat([pd.read_csv(trades_path).iloc[:-1], trades_df])
+        trades_df.to_csv(trades_path, index=False)
+    elif not trades_df.empty:
+        trades_df.to_csv(trades_path, mode="a", header=not trades_path.exists(), index=False)
+    (report_path / "summary.json").write_text(pd.Series(summary.to_dict()).to_json(indent=2))
+    (report_path / "benchmark.json").write_text(pd.Series(benchmark.to_dict()).to_json(indent=2))
+
+
+__all__ = [
+    "BacktestEngine",
+    "BacktestResult",
+    "BacktestState",
+    "StreamResult",
+    "Trade",
+    "append_report",
+    "export_report",
+]
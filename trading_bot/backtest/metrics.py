@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 import math
-from collections.abc import Iterable
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
@@ -33,72 +33,556 @@ class PerformanceSummary:
         return self.__dict__.copy()
 
 
-def _annualize_return(series: pd.Series) -> float:
-    total_return = series.iloc[-1] / series.iloc[0] - 1
-    num_days = (series.index[-1] - series.index[0]).days or 1
-    years = num_days / 365.25
-    return (1 + total_return) ** (1 / years) - 1 if years > 0 else total_return
-
-
-def _sharpe_ratio(returns: pd.Series, risk_free: float = 0.0) -> float:
-    excess = returns - risk_free / TRADING_DAYS
-    std = excess.std()
-    if std == 0 or math.isnan(std):
-        return 0.0
-    return (excess.mean() / std) * math.sqrt(TRADING_DAYS)
-
-
-def _sortino_ratio(returns: pd.Series, risk_free: float = 0.0) -> float:
-    downside = returns[returns < 0]
-    downside_std = downside.std()
-    if downside_std == 0 or math.isnan(downside_std):
-        return 0.0
-    return ((returns.mean() - risk_free / TRADING_DAYS) / downside_std) * math.sqrt(TRADING_DAYS)
-
-
 def max_drawdown(equity: pd.Series) -> tuple[float, int]:
     cummax = equity.cummax()
     drawdown = equity / cummax - 1
     max_dd = drawdown.min()
     durations = (drawdown == 0).astype(int)
-    max_duration = (durations.groupby((durations != durations.shift()).cumsum()).cumsum().max())
+    max_duration = durations.groupby((durations != durations.shift()).cumsum()).cumsum().max()
     return float(max_dd), int(max_duration if not math.isnan(max_duration) else 0)
 
 
 def summarize_backtest(
     equity: pd.Series, trades: Iterable[float], exposures: pd.Series
 ) -> PerformanceSummary:
-    returns = equity.pct_change().dropna()
-    total_return = equity.iloc[-1] / equity.iloc[0] - 1
-    cagr = _annualize_return(equity)
-    sharpe = _sharpe_ratio(returns)
-    sortino = _sortino_ratio(returns)
-    volatility = returns.std() * math.sqrt(TRADING_DAYS)
-    max_dd, max_dd_duration = max_drawdown(equity)
-    trades_list = list(trades)
-    wins = [t for t in trades_list if t > 0]
-    win_rate = len(wins) / len(trades_list) if trades_list else 0.0
-    avg_trade = float(np.mean(trades_list)) if trades_list else 0.0
-    exposure = exposures.mean() if not exposures.empty else 0.0
-    turnover = exposures.diff().abs().sum() if not exposures.empty else 0.0
-    best_trade = max(trades_list) if trades_list else 0.0
-    worst_trade = min(trades_list) if trades_list else 0.0
-    return PerformanceSummary(
-        total_return=float(total_return),
-        cagr=float(cagr),
-        sharpe=float(sharpe),
-        sortino=float(sortino),
-        volatility=float(volatility),
-        max_drawdown=float(max_dd),
-        max_drawdown_duration=max_dd_duration,
-        win_rate=float(win_rate),
-        avg_trade=float(avg_trade),
-        trades=len(trades_list),
-        exposure=float(exposure),
-        turnover=float(turnover),
-        best_trade=float(best_trade),
-        worst_trade=float(worst_trade),
-    )
-
-
-__all__ = ["PerformanceSummary", "max_drawdown", "summarize_backtest"]
+    metrics = MetricAccumulator()
+    metrics.update(equity, exposures, trades)
+    return metrics.summary()
+
+
+def summarize_batch(
+    equity: np.ndarray,
+    exposures: np.ndarray,
+    index: pd.Index,
+    trades: Sequence[Iterable[float]] | None = None,
+) -> pd.DataFrame:
+    """:class:`PerformanceSummary` fields for every column of a (bars x runs) matrix.
+
+    ``equity`` and ``exposures`` share the bar ``index``; ``trades`` optionally holds
+    each run's trade returns. Returns one row per run, matching :func:`summarize_backtest`
+    on each column up to floating point round-off. The matrix is fed to a
+    :class:`BatchAccumulator` a few hundred bars at a time.
+    """
+
+    equity = np.asarray(equity, dtype=np.float64)
+    exposures = np.asarray(exposures, dtype=np.float64)
+    if equity.ndim != 2 or exposures.shape != equity.shape or len(index) != len(equity):
+        raise ValueError("equity and exposures must be (bars x runs) arrays along index")
+    bars, runs = equity.shape
+    metrics = BatchAccumulator(runs)
+    step = batch_rows(runs)
+    for start in range(0, bars, step):
+        stop = start + step
+        metrics.update(index[start:stop], equity[start:stop], exposures[start:stop])
+    return metrics.table(trades)
+
+
+# Cells per :meth:`BatchAccumulator.update` in :func:`summarize_batch`: about 2 MiB per
+# float64 intermediate, so a chunk's working set stays in cache.
+BATCH_CHUNK_CELLS = 1 << 18
+
+_Moments = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def batch_rows(runs: int) -> int:
+    """Rows per update that keep a chunk of ``runs`` columns near ``BATCH_CHUNK_CELLS``."""
+
+    return max(1, BATCH_CHUNK_CELLS // max(runs, 1))
+
+
+class BatchAccumulator:
+    """:class:`MetricAccumulator` for many runs at once, updated by array operations.
+
+    :meth:`update` consumes consecutive blocks of rows of (bars x runs) equity and
+    exposures, so a curve matrix never needs to exist in full; :meth:`table` returns one
+    :class:`PerformanceSummary` row per run. Chunks are processed in buffers reused
+    between updates, and masks are applied by multiplication because ``where=``
+    reductions and ``np.where`` copies are several times slower.
+    """
+
+    def __init__(self, runs: int) -> None:
+        self.runs = runs
+        self.bars = 0
+        self.first_time: pd.Timestamp | None = None
+        self.last_time: pd.Timestamp | None = None
+        self.first_equity = np.full(runs, np.nan)
+        self.last_equity = np.full(runs, np.nan)
+        self.last_exposure = np.zeros(runs)
+        self.returns = _zero_moments(runs)
+        self.downside = _zero_moments(runs)
+        self.peak = np.full(runs, -np.inf)
+        self.max_drawdown = np.zeros(runs)
+        self.peak_run = np.zeros(runs, dtype=np.int64)
+        self.max_peak_run = np.zeros(runs, dtype=np.int64)
+        self.exposure_sum = np.zeros(runs)
+        self.turnover = np.zeros(runs)
+        self._rows = 0
+        self._values = self._scratch = np.empty((0, runs))
+        self._mask = np.empty((0, runs), dtype=bool)
+        self._breaks = np.empty((0, runs), dtype=np.int32)
+        self._row_numbers = np.empty((0, 1), dtype=np.int32)
+
+    def _reserve(self, rows: int) -> None:
+        if rows > self._rows:
+            self._rows = rows
+            self._values = np.empty((rows, self.runs))
+            self._scratch = np.empty((rows, self.runs))
+            self._mask = np.empty((rows, self.runs), dtype=bool)
+            self._breaks = np.empty((rows, self.runs), dtype=np.int32)
+            self._row_numbers = np.arange(1, rows + 1, dtype=np.int32)[:, None]
+
+    def update(
+        self, index: pd.Index, equity: np.ndarray, exposures: np.ndarray | None = None
+    ) -> None:
+        """Consume the next ``len(index)`` bars; ``exposures`` defaults to flat."""
+
+        equity = np.asarray(equity, dtype=np.float64)
+        size = len(equity)
+        if equity.shape != (size, self.runs) or len(index) != size:
+            raise ValueError(f"equity must be a (len(index) x {self.runs}) array")
+        if not size:
+            return
+        self._reserve(size)
+        # Each bar's return (and exposure change) against the bar before, which for the
+        # first row is the previous chunk's last one.
+        carried = 1 if self.bars else 0
+        returns = self._values[: size - 1 + carried]
+        scratch = self._scratch[: len(returns)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if carried:
+                np.divide(equity[0], self.last_equity, out=returns[0])
+            np.divide(equity[1:], equity[:-1], out=returns[carried:])
+        returns -= 1
+        # pandas drops the NaN returns of 0/0; zero them and leave them out of the counts.
+        valid = None
+        if np.isnan(returns).any():
+            valid = ~np.isnan(returns)
+            returns[~valid] = 0.0
+        self.returns = _merge_moments(self.returns, returns, valid, scratch)
+        below = np.less(returns, 0, out=self._mask[: len(returns)])
+        self.downside = _merge_moments(self.downside, returns, below, scratch)
+
+        peaks = np.maximum.accumulate(equity, axis=0, out=self._values[:size])
+        np.maximum(peaks, self.peak, out=peaks)
+        self.peak = peaks[-1].copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.divide(equity, peaks, out=self._scratch[:size])
+        np.fmin(self.max_drawdown, np.fmin.reduce(ratio, axis=0) - 1, out=self.max_drawdown)
+
+        # Run at the peak ending on each bar: distance to the last bar off the peak
+        # (``breaks`` holds its 1-based row, 0 if none in this chunk).
+        off_peak = np.not_equal(equity, peaks, out=self._mask[:size])
+        rows = self._row_numbers[:size]
+        breaks = np.multiply(off_peak, rows, out=self._breaks[:size])
+        np.maximum.accumulate(breaks, axis=0, out=breaks)
+        lead = np.where(off_peak.any(axis=0), off_peak.argmax(axis=0), size)
+        continued = lead + self.peak_run
+        lengths = np.subtract(rows, breaks, out=breaks)
+        np.maximum(self.max_peak_run, lengths.max(axis=0), out=self.max_peak_run)
+        np.maximum(self.max_peak_run, continued, out=self.max_peak_run)
+        self.peak_run = np.where(lead == size, continued, lengths[-1])
+
+        if exposures is not None:
+            exposures = np.asarray(exposures, dtype=np.float64)
+            self.exposure_sum += exposures.sum(axis=0)
+            moves = self._scratch[: size - 1 + carried]
+            if carried:
+                np.subtract(exposures[0], self.last_exposure, out=moves[0])
+            np.subtract(exposures[1:], exposures[:-1], out=moves[carried:])
+            self.turnover += np.abs(moves, out=moves).sum(axis=0)
+            self.last_exposure = exposures[-1].copy()
+        elif carried:
+            self.turnover += np.abs(self.last_exposure)
+            self.last_exposure = np.zeros(self.runs)
+
+        if not self.bars:
+            self.first_time, self.first_equity = index[0], equity[0].copy()
+        self.bars += size
+        self.last_time, self.last_equity = index[-1], equity[-1].copy()
+
+    def table(self, trades: Sequence[Iterable[float]] | None = None) -> pd.DataFrame:
+        """One row per run; ``trades`` optionally holds each run's trade returns."""
+
+        if self.first_time is None or self.last_time is None:
+            raise ValueError("No equity observed")
+        count, mean, m2 = self.returns
+        downside_count, _, downside_m2 = self.downside
+        scale = math.sqrt(TRADING_DAYS)
+        total_return = self.last_equity / self.first_equity - 1
+        years = ((self.last_time - self.first_time).days or 1) / 365.25
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+            downside_std = np.where(
+                downside_count > 1, np.sqrt(downside_m2 / (downside_count - 1)), np.nan
+            )
+            mean = np.where(count > 0, mean, np.nan)
+            has_std = (std != 0) & ~np.isnan(std)
+            has_downside = (downside_std != 0) & ~np.isnan(downside_std)
+            columns = {
+                "total_return": total_return,
+                "cagr": (1 + total_return) ** (1 / years) - 1 if years > 0 else total_return,
+                "sharpe": np.where(has_std, mean / std * scale, 0.0),
+                "sortino": np.where(has_downside, mean / downside_std * scale, 0.0),
+                "volatility": std * scale,
+                "max_drawdown": self.max_drawdown,
+                "max_drawdown_duration": self.max_peak_run,
+                "exposure": self.exposure_sum / self.bars,
+                "turnover": self.turnover,
+            }
+        stats = [_trade_stats(list(run)) for run in trades] if trades is not None else []
+        if len(stats) not in (0, self.runs):
+            raise ValueError("trades must hold one entry per run")
+        stats = stats or [_trade_stats([])] * self.runs
+        for position, name in enumerate(
+            ("trades", "win_rate", "avg_trade", "best_trade", "worst_trade")
+        ):
+            columns[name] = np.array([row[position] for row in stats])
+        return pd.DataFrame(columns)[list(PerformanceSummary.__dataclass_fields__)]
+
+
+def _zero_moments(runs: int) -> _Moments:
+    return np.zeros(runs, dtype=np.int64), np.zeros(runs), np.zeros(runs)
+
+
+def _merge_moments(
+    moments: _Moments, values: np.ndarray, valid: np.ndarray | None, scratch: np.ndarray
+) -> _Moments:
+    """Chan et al.'s combination of per-column moments with a chunk's ``valid`` values."""
+
+    count, mean, m2 = moments
+    if valid is None:
+        chunk_count = np.full(values.shape[1], len(values))
+        chunk_sum = values.sum(axis=0)
+    else:
+        chunk_count = np.count_nonzero(valid, axis=0)
+        chunk_sum = np.multiply(values, valid, out=scratch).sum(axis=0)
+    chunk_mean = chunk_sum / np.maximum(chunk_count, 1)
+    deviations = np.subtract(values, chunk_mean, out=scratch)
+    if valid is not None:
+        deviations *= valid
+    chunk_m2 = np.square(deviations, out=deviations).sum(axis=0)
+    total = count + chunk_count
+    delta = chunk_mean - mean
+    weight = chunk_count / np.maximum(total, 1)
+    return total, mean + delta * weight, m2 + chunk_m2 + delta * delta * count * weight
+
+
+def _trade_stats(trades: list[float]) -> tuple[int, float, float, float, float]:
+    if not trades:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    wins = sum(trade > 0 for trade in trades)
+    return len(trades), wins / len(trades), sum(trades) / len(trades), max(trades), min(trades)
+
+
+@dataclass
+class Moments:
+    """Count, mean and sum of squared deviations, combined chunk by chunk (Chan et al.)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, values: np.ndarray) -> None:
+        if values.size:
+            mean = float(values.mean())
+            self.merge(Moments(values.size, mean, float(((values - mean) ** 2).sum())))
+
+    def push(self, value: float) -> None:
+        """Welford's update for a single value."""
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: Moments) -> None:
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+    def std(self) -> float:
+        """Sample standard deviation (``ddof=1``), NaN below two values like pandas."""
+
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+def _empty() -> np.ndarray:
+    return np.empty(0)
+
+
+@dataclass
+class MetricAccumulator:
+    """Running state from which :func:`summarize_backtest` is computed without the curve.
+
+    Feed consecutive chunks of the equity curve, exposures and trade returns to
+    :meth:`update`, or single bars to :meth:`add_bar`; :meth:`summary` covers everything
+    seen so far. State is O(1) in the number of bars.
+
+    Accumulators built independently over adjacent slices of one curve (e.g. in
+    parallel) combine exactly with :meth:`merge`, earliest first. Drawdowns in a later
+    slice depend on the earlier peak, so such accumulators are created with
+    ``segment=True``: they also keep the bars at which their own running peak was set
+    (levels, offsets and the lowest equity before each), which grows with the number of
+    new highs in the slice.
+    """
+
+    segment: bool = False
+    bars: int = 0
+    first_time: pd.Timestamp | None = None
+    first_equity: float = math.nan
+    last_time: pd.Timestamp | None = None
+    last_equity: float = math.nan
+    low: float = math.inf
+    returns: Moments = field(default_factory=Moments)
+    downside: Moments = field(default_factory=Moments)
+    peak: float = -math.inf
+    max_drawdown: float = 0.0
+    peak_run: int = 0
+    max_peak_run: int = 0
+    exposures: int = 0
+    exposure_sum: float = 0.0
+    first_exposure: float = math.nan
+    last_exposure: float = math.nan
+    turnover: float = 0.0
+    trades: int = 0
+    wins: int = 0
+    trade_sum: float = 0.0
+    best_trade: float = -math.inf
+    worst_trade: float = math.inf
+    peak_levels: np.ndarray = field(default_factory=_empty, repr=False)
+    peak_offsets: np.ndarray = field(default_factory=_empty, repr=False)
+    peak_lows: np.ndarray = field(default_factory=_empty, repr=False)
+
+    @classmethod
+    def from_chunk(
+        cls, equity: pd.Series, exposures: pd.Series | None = None, trades: Iterable[float] = ()
+    ) -> MetricAccumulator:
+        """Segment accumulator over one chunk, computed with array operations."""
+
+        acc = cls(segment=True)
+        values = equity.to_numpy(dtype=np.float64)
+        if values.size:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = values[1:] / values[:-1] - 1
+                returns = returns[~np.isnan(returns)]
+                acc.returns.add(returns)
+                acc.downside.add(returns[returns < 0])
+                peaks = np.maximum.accumulate(values)
+                acc.max_drawdown = min(0.0, float(np.nanmin(values / peaks - 1)))
+            acc.bars = values.size
+            acc.first_time, acc.first_equity = equity.index[0], float(values[0])
+            acc.last_time, acc.last_equity = equity.index[-1], float(values[-1])
+            acc.low = float(values.min())
+            acc.peak = float(peaks[-1])
+            # The running maximum's new highs (and ties); their consecutive stretches are
+            # the "at peak" runs whose longest is reported as the drawdown duration.
+            offsets = np.flatnonzero(values == peaks)
+            acc.peak_levels = values[offsets]
+            acc.peak_offsets = offsets
+            acc.peak_lows = np.r_[math.inf, np.minimum.accumulate(values)[:-1]][offsets]
+            runs = _runs(offsets)
+            acc.max_peak_run = int(runs.max())
+            acc.peak_run = int(runs[-1]) if offsets[-1] == values.size - 1 else 0
+
+        shares = np.empty(0) if exposures is None else exposures.to_numpy(dtype=np.float64)
+        if shares.size:
+            acc.exposures = shares.size
+            acc.exposure_sum = float(shares.sum())
+            acc.first_exposure, acc.last_exposure = float(shares[0]), float(shares[-1])
+            acc.turnover = float(np.abs(np.diff(shares)).sum())
+        acc.add_trades(trades)
+        return acc
+
+    def update(self, equity: pd.Series, exposures: pd.Series, trades: Iterable[float] = ()) -> None:
+        """Consume the next chunk of the curve."""
+
+        self.merge(MetricAccumulator.from_chunk(equity, exposures, trades))
+
+    def add_bar(self, timestamp: pd.Timestamp, equity: float, exposure: float = 0.0) -> None:
+        """Consume one bar with scalar arithmetic, e.g. for a live running Sharpe."""
+
+        if self.segment:
+            index = pd.DatetimeIndex([timestamp])
+            self.update(pd.Series([equity], index=index), pd.Series([exposure], index=index))
+            return
+        if self.bars:
+            change = equity / self.last_equity - 1 if self.last_equity else math.nan
+            if not math.isnan(change):
+                self.returns.push(change)
+                if change < 0:
+                    self.downside.push(change)
+        else:
+            self.first_time, self.first_equity = timestamp, equity
+        self.bars += 1
+        self.last_time, self.last_equity = timestamp, equity
+        self.low = min(self.low, equity)
+        if equity >= self.peak:
+            self.peak = equity
+            self.peak_run += 1
+            self.max_peak_run = max(self.max_peak_run, self.peak_run)
+        else:
+            self.peak_run = 0
+            self.max_drawdown = min(self.max_drawdown, equity / self.peak - 1)
+        if self.exposures:
+            self.turnover += abs(exposure - self.last_exposure)
+        else:
+            self.first_exposure = exposure
+        self.exposures += 1
+        self.exposure_sum += exposure
+        self.last_exposure = exposure
+
+    def add_trades(self, trades: Iterable[float]) -> None:
+        for trade in trades:
+            self.trades += 1
+            self.wins += trade > 0
+            self.trade_sum += trade
+            self.best_trade = max(self.best_trade, trade)
+            self.worst_trade = min(self.worst_trade, trade)
+
+    def merge(self, other: MetricAccumulator) -> None:
+        """Append ``other``, a segment accumulator over the bars right after these."""
+
+        if other.bars and self.bars:
+            if not other.segment:
+                raise ValueError("Only segment accumulators can be merged after other bars")
+            self._merge_curve(other)
+        elif other.bars:
+            self._adopt_curve(other)
+        if other.exposures:
+            if self.exposures:
+                self.turnover += abs(other.first_exposure - self.last_exposure)
+            else:
+                self.first_exposure = other.first_exposure
+            self.turnover += other.turnover
+            self.exposures += other.exposures
+            self.exposure_sum += other.exposure_sum
+            self.last_exposure = other.last_exposure
+        self.trades += other.trades
+        self.wins += other.wins
+        self.trade_sum += other.trade_sum
+        self.best_trade = max(self.best_trade, other.best_trade)
+        self.worst_trade = min(self.worst_trade, other.worst_trade)
+
+    def _adopt_curve(self, other: MetricAccumulator) -> None:
+        for name in (
+            "bars", "first_time", "first_equity", "last_time", "last_equity", "low", "peak",
+            "max_drawdown", "peak_run", "max_peak_run",
+        ):  # fmt: skip
+            setattr(self, name, getattr(other, name))
+        self.returns.merge(other.returns)
+        self.downside.merge(other.downside)
+        if self.segment:
+            self.peak_levels = other.peak_levels
+            self.peak_offsets = other.peak_offsets
+            self.peak_lows = other.peak_lows
+
+    def _merge_curve(self, other: MetricAccumulator) -> None:
+        change = other.first_equity / self.last_equity - 1 if self.last_equity else math.nan
+        if not math.isnan(change):
+            self.returns.push(change)
+            if change < 0:
+                self.downside.push(change)
+        self.returns.merge(other.returns)
+        self.downside.merge(other.downside)
+
+        # ``other``'s bars before it first reaches this peak are measured against this
+        # peak instead of its own lower one; from then on its own figures hold.
+        first = int(np.searchsorted(other.peak_levels, self.peak, side="left"))
+        if first < other.peak_offsets.size:
+            low_before = float(other.peak_lows[first])
+        else:
+            low_before = other.low
+        if low_before < math.inf and self.peak > 0:
+            self.max_drawdown = min(self.max_drawdown, low_before / self.peak - 1)
+        self.max_drawdown = min(self.max_drawdown, other.max_drawdown)
+
+        offsets = other.peak_offsets[first:]
+        peak_run = 0
+        if offsets.size:
+            runs = _runs(offsets)
+            if offsets[0] == 0:
+                runs[0] += self.peak_run
+            self.max_peak_run = max(self.max_peak_run, int(runs.max()))
+            if offsets[-1] == other.bars - 1:
+                peak_run = int(runs[-1])
+        self.peak_run = peak_run
+
+        if self.segment:
+            self.peak_levels = np.r_[self.peak_levels, other.peak_levels[first:]]
+            self.peak_offsets = np.r_[self.peak_offsets, offsets + self.bars]
+            self.peak_lows = np.r_[self.peak_lows, np.minimum(other.peak_lows[first:], self.low)]
+        self.bars += other.bars
+        self.last_time, self.last_equity = other.last_time, other.last_equity
+        self.low = min(self.low, other.low)
+        self.peak = max(self.peak, other.peak)
+
+    @property
+    def sharpe(self) -> float:
+        """Annualized Sharpe ratio of the returns so far."""
+
+        std = self.returns.std()
+        if std == 0 or math.isnan(std):
+            return 0.0
+        return self.returns.mean / std * math.sqrt(TRADING_DAYS)
+
+    @property
+    def drawdown(self) -> float:
+        """Current drawdown from the running peak."""
+
+        return self.last_equity / self.peak - 1 if self.bars and self.peak > 0 else 0.0
+
+    def summary(self) -> PerformanceSummary:
+        if self.first_time is None or self.last_time is None:
+            raise ValueError("No equity observed")
+        years = ((self.last_time - self.first_time).days or 1) / 365.25
+        # numpy scalars give inf/nan for a zero first equity or an overflowing CAGR.
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            total_return = np.float64(self.last_equity) / np.float64(self.first_equity) - 1
+            cagr = (1 + total_return) ** (1 / years) - 1 if years > 0 else total_return
+        std = self.returns.std()
+        downside_std = self.downside.std()
+        has_downside = downside_std != 0 and not math.isnan(downside_std)
+        # pandas' mean of no returns is NaN, which Sortino then propagates.
+        mean = self.returns.mean if self.returns.count else math.nan
+        scale = math.sqrt(TRADING_DAYS)
+        trades = self.trades
+        return PerformanceSummary(
+            total_return=float(total_return),
+            cagr=float(cagr),
+            sharpe=self.sharpe,
+            sortino=mean / downside_std * scale if has_downside else 0.0,
+            volatility=std * scale,
+            max_drawdown=self.max_drawdown,
+            max_drawdown_duration=self.max_peak_run,
+            win_rate=self.wins / trades if trades else 0.0,
+            avg_trade=self.trade_sum / trades if trades else 0.0,
+            trades=trades,
+            exposure=self.exposure_sum / self.exposures if self.exposures else 0.0,
+            turnover=self.turnover,
+            best_trade=self.best_trade if trades else 0.0,
+            worst_trade=self.worst_trade if trades else 0.0,
+        )
+
+
+def _runs(offsets: np.ndarray) -> np.ndarray:
+    """Lengths of the stretches of consecutive integers in sorted, non-empty ``offsets``."""
+
+    breaks = np.flatnonzero(np.diff(offsets) != 1)
+    return np.diff(np.r_[-1, breaks, offsets.size - 1])
+
+
+__all__ = [
+    "BATCH_CHUNK_CELLS",
+    "BatchAccumulator",
+    "MetricAccumulator",
+    "Moments",
+    "PerformanceSummary",
+    "batch_rows",
+    "max_drawdown",
+    "summarize_backtest",
+    "summarize_batch",
+]
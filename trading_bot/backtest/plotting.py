@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
+from functools import cache
 from pathlib import Path
+from types import ModuleType
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
-plt.switch_backend("Agg")
+
+@cache
+def _pyplot() -> ModuleType:
+    """``matplotlib.pyplot`` on the Agg backend, imported on the first plot."""
+
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+    return plt
 
 
 def _plot_equity(report_path: Path, equity: pd.Series, benchmark: pd.Series) -> None:
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 5))
     equity.plot(ax=ax, label="Strategy")
     benchmark.plot(ax=ax, label="Benchmark")
@@ -23,6 +33,7 @@ def _plot_equity(report_path: Path, equity: pd.Series, benchmark: pd.Series) ->
 
 
 def _plot_drawdown(report_path: Path, equity: pd.Series) -> None:
+    plt = _pyplot()
     cummax = equity.cummax()
     drawdown = equity / cummax - 1
     fig, ax = plt.subplots(figsize=(10, 3))
@@ -35,6 +46,7 @@ def _plot_drawdown(report_path: Path, equity: pd.Series) -> None:
 
 
 def _plot_rolling_sharpe(report_path: Path, equity: pd.Series, window: int = 63) -> None:
+    plt = _pyplot()
     returns = equity.pct_change().dropna()
     sharpe = returns.rolling(window=window).mean() / returns.rolling(window=window).std()
     fig, ax = plt.subplots(figsize=(10, 3))
@@ -45,10 +57,28 @@ def _plot_rolling_sharpe(report_path: Path, equity: pd.Series, window: int = 63)
     plt.close(fig)
 
 
+def plot_distributions(
+    report_path: Path, samples: pd.DataFrame, observed: pd.Series, method: str
+) -> None:
+    """Histograms of resampled Sharpe and max drawdown with the observed values marked."""
+
+    plt = _pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+    for ax, metric in zip(axes, ["sharpe", "max_drawdown"], strict=True):
+        ax.hist(samples[metric], bins=50, color="steelblue")
+        ax.axvline(observed[metric], color="red", label="Observed")
+        ax.set_title(metric)
+        ax.legend()
+    fig.suptitle(f"Robustness ({method}, {len(samples)} samples)")
+    fig.tight_layout()
+    fig.savefig(report_path / "robustness.png")
+    plt.close(fig)
+
+
 def generate_plots(report_path: Path, equity: pd.Series, benchmark: pd.Series) -> None:
     _plot_equity(report_path, equity, benchmark)
     _plot_drawdown(report_path, equity)
     _plot_rolling_sharpe(report_path, equity)
 
 
-__all__ = ["generate_plots"]
+__all__ = ["generate_plots", "plot_distributions"]
@@ -0,0 +1,305 @@
+"""Multi-ticker portfolio backtests on a shared time index."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from trading_bot.config import Config
+from trading_bot.strategies import Signal, Strategy, create_strategy
+
+from .benchmark import benchmark_curve, buy_and_hold_benchmark
+from .engine import Trade, export_report
+from .metrics import PerformanceSummary, summarize_backtest
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass
+class PricePanel:
+    """Close prices of N tickers on the union of their bar times (T x N arrays).
+
+    ``close`` is forward-filled and NaN before a ticker's first bar; ``has_bar`` marks
+    the cells where the ticker actually traded.
+    """
+
+    index: pd.DatetimeIndex
+    tickers: list[str]
+    close: np.ndarray
+    has_bar: np.ndarray
+
+    def place(self, frame_index: pd.Index, values: np.ndarray, fill: float) -> np.ndarray:
+        """Spread one ticker's per-bar ``values`` onto the shared index."""
+
+        out = np.full(len(self.index), fill, dtype=values.dtype)
+        out[self.index.get_indexer(frame_index)] = values
+        return out
+
+
+def align_panel(frames: Mapping[str, pd.DataFrame]) -> PricePanel:
+    """Align every frame's ``close`` onto the sorted union of their indexes."""
+
+    if not frames or any(frame.empty for frame in frames.values()):
+        raise ValueError("No data provided for portfolio backtest")
+    tickers = list(frames)
+    index = reduce(lambda left, right: left.union(right), (f.index for f in frames.values()))
+    close = np.full((len(index), len(tickers)), np.nan)
+    has_bar = np.zeros((len(index), len(tickers)), dtype=bool)
+    for column, frame in enumerate(frames.values()):
+        rows = index.get_indexer(frame.index)
+        close[rows, column] = frame["close"].to_numpy(dtype=np.float64)
+        has_bar[rows, column] = True
+    close = pd.DataFrame(close).ffill().to_numpy()
+    return PricePanel(pd.DatetimeIndex(index), tickers, close, has_bar)
+
+
+@dataclass
+class PortfolioResult:
+    equity_curve: pd.Series
+    positions: pd.DataFrame
+    exposures: pd.Series
+    trades: list[Trade]
+    summary: PerformanceSummary
+    benchmark: PerformanceSummary
+    signals: pd.DataFrame
+
+
+class PortfolioEngine:
+    """Long-only backtest of one strategy across many tickers sharing one cash balance.
+
+    Signals for each ticker come from :meth:`Strategy.signal_codes` on its own bars; the
+    simulation then steps once through the shared index with every ticker updated by
+    array operations. On each bar:
+
+    * SELL signals close held positions;
+    * BUY signals for tickers not held open positions sized by
+      :meth:`Strategy.position_sizing` (``risk.fraction`` of current equity) while fewer
+      than ``risk.max_positions`` are open, highest confidence first and scaled down to
+      the available cash;
+    * stop-loss and take-profit are checked at the close, as in :class:`BacktestEngine`.
+
+    Unlike :class:`BacktestEngine`, repeated BUY signals do not resize a held position.
+    """
+
+    def __init__(self, starting_equity: float = 100_000.0) -> None:
+        self.starting_equity = starting_equity
+
+    def run(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        config: Config,
+        report_path: Path | None = None,
+        strategy: Strategy | None = None,
+    ) -> PortfolioResult:
+        """Backtest ``frames`` (ticker -> OHLCV) and export a report unless ``report_path``
+        is ``None``."""
+
+        started = time.perf_counter()
+        if strategy is None:
+            strategy = create_strategy(config.strategy.name, **config.strategy.params)
+        panel = align_panel(frames)
+        codes = np.zeros(panel.close.shape, dtype=np.int8)
+        confidences = np.zeros(panel.close.shape, dtype=np.float64)
+        for column, frame in enumerate(frames.values()):
+            frame_codes, frame_confidences = strategy.signal_codes(frame, strategy.prepare(frame))
+            codes[:, column] = panel.place(frame.index, frame_codes, 0)
+            confidences[:, column] = panel.place(frame.index, frame_confidences, 0.0)
+
+        equity, positions, gross, trades = self._simulate(
+            panel, codes, confidences, config, strategy
+        )
+
+        equity_series = pd.Series(equity, index=panel.index, name="equity")
+        position_frame = pd.DataFrame(positions, index=panel.index, columns=panel.tickers)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exposure = np.where(equity != 0, np.abs(gross) / equity, 0.0)
+        exposure_series = pd.Series(exposure, index=panel.index, name="exposure")
+        signal_frame = pd.DataFrame(codes, index=panel.index, columns=panel.tickers)
+
+        trade_returns = [trade.pnl / self.starting_equity for trade in trades]
+        summary = summarize_backtest(equity_series, trade_returns, exposure_series)
+        benchmark_series, benchmark_summary = self._benchmark(panel, frames, config)
+        log.info(
+            "portfolio.completed",
+            tickers=len(panel.tickers),
+            bars=len(panel.index),
+            trades=len(trades),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+        if report_path is not None:
+            export_report(
+                report_path,
+                equity_series,
+                position_frame,
+                trades,
+                summary,
+                benchmark_summary,
+                benchmark_series,
+                signal_frame,
+            )
+
+        return PortfolioResult(
+            equity_curve=equity_series,
+            positions=position_frame,
+            exposures=exposure_series,
+            trades=trades,
+            summary=summary,
+            benchmark=benchmark_summary,
+            signals=signal_frame,
+        )
+
+    def _simulate(
+        self,
+        panel: PricePanel,
+        codes: np.ndarray,
+        confidences: np.ndarray,
+        config: Config,
+        strategy: Strategy,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[Trade]]:
+        risk = config.risk
+        transaction_cost = config.transaction_cost_bps / 10_000
+        slippage = config.slippage_bps / 10_000
+        # Unpriced cells only occur before a ticker's first bar, where it holds nothing.
+        prices = np.nan_to_num(panel.close, nan=0.0)
+        n_bars, n_tickers = prices.shape
+
+        cash = self.starting_equity
+        qty = np.zeros(n_tickers)
+        entry_price = np.zeros(n_tickers)
+        entry_row = np.zeros(n_tickers, dtype=np.int64)
+        held = 0
+        equity = np.empty(n_bars)
+        gross = np.empty(n_bars)
+        positions = np.empty((n_bars, n_tickers))
+
+        # (entry row, exit row, column, qty, entry price, exit price, pnl); Trades are built
+        # after the loop so timestamps are boxed in bulk.
+        closed: list[tuple[int, int, int, float, float, float, float]] = []
+
+        def close(mask: np.ndarray, row: int, price: np.ndarray) -> None:
+            nonlocal cash, held
+            columns = np.flatnonzero(mask)
+            fill = price[columns] * (1 - slippage)
+            proceeds = qty[columns] * fill
+            costs = proceeds * transaction_cost
+            cash += float((proceeds - costs).sum())
+            # Entry costs are charged to the trade as well, so P&L adds up to the cash.
+            basis = entry_price[columns] * qty[columns] * (1 + transaction_cost)
+            pnl = proceeds - costs - basis
+            closed.extend(
+                zip(
+                    entry_row[columns].tolist(),
+                    [row] * len(columns),
+                    columns.tolist(),
+                    qty[columns].tolist(),
+                    entry_price[columns].tolist(),
+                    fill.tolist(),
+                    pnl.tolist(),
+                    strict=True,
+                )
+            )
+            qty[columns] = 0.0
+            entry_price[columns] = 0.0
+            held -= len(columns)
+
+        for row in range(n_bars):
+            price = prices[row]
+            code = codes[row]
+            if held:
+                exits = (code == -1) & (qty > 0)
+                if exits.any():
+                    close(exits, row, price)
+            if held < risk.max_positions:
+                candidates = np.flatnonzero((code == 1) & (qty == 0))
+                if candidates.size:
+                    free = risk.max_positions - held
+                    if candidates.size > free:
+                        order = np.argsort(-confidences[row, candidates], kind="stable")
+                        candidates = candidates[order[:free]]
+                    value = cash + float(qty @ price)
+                    sizes = np.array(
+                        [
+                            strategy.position_sizing(Signal.BUY, value, price[column], risk)
+                            for column in candidates
+                        ]
+                    )
+                    fill = price[candidates] * (1 + slippage)
+                    outlay = sizes * fill * (1 + transaction_cost)
+                    total = float(outlay.sum())
+                    if total > cash:
+                        scale = max(cash, 0.0) / total
+                        sizes *= scale
+                        total *= scale
+                    opened = sizes > 0
+                    if opened.any():
+                        cash -= total
+                        columns = candidates[opened]
+                        qty[columns] = sizes[opened]
+                        entry_price[columns] = fill[opened]
+                        entry_row[columns] = row
+                        held += int(opened.sum())
+            if held and (risk.stop_loss or risk.take_profit):
+                open_ = (qty > 0) & panel.has_bar[row]
+                change = np.divide(price, entry_price, out=np.ones(n_tickers), where=open_) - 1
+                hits = np.zeros(n_tickers, dtype=bool)
+                if risk.stop_loss:
+                    hits |= open_ & (change <= -risk.stop_loss)
+                if risk.take_profit:
+                    hits |= open_ & (change >= risk.take_profit)
+                if hits.any():
+                    close(hits, row, price)
+            market_value = float(qty @ price)
+            equity[row] = cash + market_value
+            gross[row] = market_value
+            positions[row] = qty
+
+        if held:
+            close(qty > 0, n_bars - 1, prices[-1])
+            equity[-1] = cash
+        entry_times = panel.index[[trade[0] for trade in closed]]
+        exit_times = panel.index[[trade[1] for trade in closed]]
+        trades = [
+            Trade(entry_time, exit_time, size, entry, exit_, pnl, panel.tickers[column])
+            for entry_time, exit_time, (_, _, column, size, entry, exit_, pnl) in zip(
+                entry_times, exit_times, closed, strict=True
+            )
+        ]
+        return equity, positions, gross, trades
+
+    def _benchmark(
+        self, panel: PricePanel, frames: Mapping[str, pd.DataFrame], config: Config
+    ) -> tuple[pd.Series, PerformanceSummary]:
+        """Buy-and-hold of the benchmark ticker from the portfolio or the cache, else of
+        every ticker in equal weight."""
+
+        ticker = config.benchmark_ticker
+        if ticker in frames:
+            curve = buy_and_hold_benchmark(frames[ticker], ticker, self.starting_equity)
+            curve = curve.reindex(panel.index).ffill().bfill()
+        else:
+            cached = benchmark_curve(
+                panel.index, ticker, config.bar_size, starting_equity=self.starting_equity
+            )
+            if cached is not None:
+                return cached.equity, cached.summary
+            curve = self._equal_weight(panel)
+        return curve, summarize_backtest(curve, [], pd.Series(index=curve.index, data=0.0))
+
+    def _equal_weight(self, panel: PricePanel) -> pd.Series:
+        first = panel.close[np.argmax(panel.has_bar, axis=0), np.arange(len(panel.tickers))]
+        with np.errstate(invalid="ignore"):
+            relative = np.nanmean(panel.close / first, axis=1)
+        curve = pd.Series(relative * self.starting_equity, index=panel.index)
+        curve.name = "benchmark_equal_weight"
+        return curve.ffill().bfill()
+
+
+__all__ = ["PortfolioEngine", "PortfolioResult", "PricePanel", "align_panel"]
@@ -0,0 +1,91 @@
+"""Incremental Parquet output for streamed backtests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from .engine import Trade
+
+BARS_FILE = "bars.parquet"
+TRADES_FILE = "trades.parquet"
+
+
+class ParquetSink:
+    """Appends per-bar outputs and trades under ``path``, one row group per chunk.
+
+    ``bars.parquet`` holds equity, position, exposure, signal and benchmark equity indexed
+    by bar time; ``trades.parquet`` holds the closed trades. Nothing is kept in memory
+    between chunks.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._writers: dict[str, pq.ParquetWriter] = {}
+
+    def __enter__(self) -> ParquetSink:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write_bars(
+        self,
+        equity: pd.Series,
+        positions: pd.Series,
+        exposures: pd.Series,
+        signals: pd.Series,
+        benchmark: pd.Series,
+    ) -> None:
+        frame = pd.DataFrame(
+            {
+                "equity": equity,
+                "position": positions,
+                "exposure": exposures,
+                "signal": signals.astype(str),
+                "benchmark": benchmark.astype(float),
+            }
+        )
+        self._write(BARS_FILE, frame)
+
+    def write_trades(self, trades: list[Trade]) -> None:
+        if not trades:
+            return
+        frame = pd.DataFrame(
+            {
+                "entry_time": [trade.entry_time for trade in trades],
+                "exit_time": [trade.exit_time for trade in trades],
+                "qty": [trade.qty for trade in trades],
+                "entry_price": [trade.entry_price for trade in trades],
+                "exit_price": [trade.exit_price for trade in trades],
+                "pnl": [trade.pnl for trade in trades],
+            }
+        )
+        self._write(TRADES_FILE, frame, index=False)
+
+    def _write(self, name: str, frame: pd.DataFrame, index: bool = True) -> None:
+        table = pa.Table.from_pandas(frame, preserve_index=index)
+        writer = self._writers.get(name)
+        if writer is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            writer = self._writers[name] = pq.ParquetWriter(self.path / name, table.schema)
+        writer.write_table(table)
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+__all__ = ["BARS_FILE", "TRADES_FILE", "ParquetSink"]
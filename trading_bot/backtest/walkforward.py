@@ -8,7 +8,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
 
 from trading_bot.config import Config
 
@@ -30,9 +29,12 @@ def grid_search(
 ) -> OptimizationResult:
     """Perform a simple walk-forward grid search returning the best Sharpe."""
 
+    # scikit-learn takes about a second to import; only the optimizer needs it.
+    from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+
     tscv = TimeSeriesSplit(n_splits=splits)
     best_result = OptimizationResult(params={}, sharpe=float("-inf"), trades=0)
-    engine = BacktestEngine()
+    engine = BacktestEngine(quiet=True)
     for params in ParameterGrid(param_grid):
         sharpes: list[float] = []
         trade_counts: list[int] = []
@@ -1,18 +1,24 @@
-"""Command line interface for the trading bot."""
+"""Command line interface for the trading bot.
+
+Commands import the engines, data sources and plotting they use when they run, so
+startup (and ``--help``) does not pay for scikit-learn, Matplotlib or the Polygon client.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
 import typer
 
-from trading_bot.backtest import BacktestEngine, grid_search
 from trading_bot.config import Config, StrategyConfig, load_config
-from trading_bot.data import PolygonDataSource, cache_key
-from trading_bot.live.signal_runtime import LiveSignalRuntime
+from trading_bot.logging_config import configure_logging
+
+if TYPE_CHECKING:
+    from trading_bot.data import PolygonDataSource
 
 DEFAULT_CONFIG_PATH = Path("config.yaml")
 DEFAULT_REPORT_NAME = "run"
@@ -38,6 +44,21 @@ def _handle_polygon_error(exc: RuntimeError) -> None:
     raise exc
 
 
+def _cache_benchmark(ds: PolygonDataSource, cfg: Config, start: str, end: str) -> None:
+    """Fetch the benchmark ticker's bars into the cache for the engines to price it from."""
+
+    if cfg.benchmark_ticker in cfg.tickers:
+        return
+    try:
+        ds.fetch_and_cache(cfg.benchmark_ticker, start, end, cfg.bar_size)
+    except Exception as exc:  # pragma: no cover - thin CLI wrapper
+        typer.echo(
+            f"Warning: could not fetch benchmark {cfg.benchmark_ticker} ({exc}); "
+            "benchmarking against the traded ticker instead.",
+            err=True,
+        )
+
+
 @app.command()
 def fetch(
     ticker: str = typer.Option(..., help="Ticker symbol"),
@@ -48,6 +69,9 @@ def fetch(
 ) -> None:
     """Fetch and cache historical data."""
 
+    configure_logging()
+    from trading_bot.data import PolygonDataSource, cache_key
+
     ds = PolygonDataSource()
     try:
         df = ds.fetch_and_cache(ticker, start, end, bar_size, force=force)
@@ -62,10 +86,123 @@ def fetch(
 def backtest(
     config: Path = typer.Option(DEFAULT_CONFIG_PATH, help="Path to config"),  # noqa: B008
     report_name: str = typer.Option(DEFAULT_REPORT_NAME, help="Report folder name"),
+    resume: bool = typer.Option(
+        False, help="Continue the report's saved state over bars added since (single ticker)"
+    ),
+    stream: bool = typer.Option(
+        False, help="Stream the cached bars in Parquet row groups with bounded memory"
+    ),
+) -> None:
+    """Run a backtest and write a report.
+
+    With several tickers in the config they are backtested together as one portfolio
+    under ``risk.max_positions``. With ``--resume`` a single-ticker run saves its end state
+    next to the report, and later runs only simulate bars appended after it. ``--stream``
+    writes ``bars.parquet`` and ``trades.parquet`` chunk by chunk instead of CSVs and plots.
+    """
+
+    from trading_bot.backtest.engine import BacktestEngine
+    from trading_bot.backtest.portfolio import PortfolioEngine
+    from trading_bot.data import PolygonDataSource
+
+    cfg = load_config(config)
+    configure_logging(cfg.logging)
+    report_path = Path("reports") / report_name
+    if stream:
+        _backtest_stream(cfg, report_path)
+        return
+    state_path = report_path / "state.bin"
+    engine = BacktestEngine(quiet=cfg.logging.quiet)
+    state = engine.load_state(state_path, cfg) if resume else None
+    # A resumed run only needs the bars from the last backtested day onwards.
+    start = cfg.start or "2018-01-01"
+    if state is not None and state.last_time is not None:
+        start = state.last_time.strftime("%Y-%m-%d")
+    ds = PolygonDataSource()
+    try:
+        frames = {
+            ticker: ds.fetch_and_cache(ticker, start, cfg.end or "2024-01-01", cfg.bar_size)
+            for ticker in dict.fromkeys(cfg.tickers)
+        }
+    except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
+        _handle_polygon_error(exc)
+        raise
+    _cache_benchmark(ds, cfg, start, cfg.end or "2024-01-01")
+    if len(frames) > 1:
+        if resume:
+            typer.echo("Error: --resume supports single-ticker backtests only", err=True)
+            raise typer.Exit(code=1)
+        PortfolioEngine().run(frames, cfg, report_path)
+    elif state is not None:
+        data = next(iter(frames.values()))
+        try:
+            result = engine.resume(state, data, cfg, report_path)
+        except ValueError as exc:
+            typer.echo(f"Nothing to resume: {exc}")
+            return
+        assert result.state is not None
+        result.state.save(state_path)
+        typer.echo(f"Resumed over {len(result.equity_curve)} new bars.")
+    else:
+        data = next(iter(frames.values()))
+        result = engine.run(data, cfg, report_path, keep_state=resume)
+        if result.state is not None:
+            result.state.save(state_path)
+    typer.echo(f"Backtest complete. Summary saved to {report_path / 'summary.json'}")
+
+
+def _backtest_stream(cfg: Config, report_path: Path) -> None:
+    from trading_bot.backtest.engine import BacktestEngine
+    from trading_bot.data import PolygonDataSource, cache_key
+    from trading_bot.data.cache import iter_cached_chunks
+
+    if len(cfg.tickers) > 1:
+        typer.echo("Error: --stream supports single-ticker backtests only", err=True)
+        raise typer.Exit(code=1)
+    start, end = cfg.start or "2018-01-01", cfg.end or "2024-01-01"
+    path = cache_key(cfg.tickers[0], cfg.bar_size, start, end)
+    ds = PolygonDataSource()
+    if not path.exists():
+        try:
+            ds.fetch_and_cache(cfg.tickers[0], start, end, cfg.bar_size)
+        except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
+            _handle_polygon_error(exc)
+            raise
+    _cache_benchmark(ds, cfg, start, end)
+    result = BacktestEngine(quiet=cfg.logging.quiet).run_stream(
+        iter_cached_chunks(path), cfg, report_path
+    )
+    typer.echo(
+        f"Streamed {result.bars:,} bars, {result.trades:,} trades. "
+        f"Summary saved to {report_path / 'summary.json'}"
+    )
+
+
+@app.command()
+def compare(
+    config: Path = typer.Option(DEFAULT_CONFIG_PATH, help="Path to config"),  # noqa: B008
+    report_name: str = typer.Option("compare", help="Report folder name"),
+    strategies: str | None = typer.Option(
+        None, help="Comma separated strategies to compare (defaults to the config's ensemble)"
+    ),
+    mode: str = typer.Option("vote", help="Ensemble combination when --strategies is used"),
 ) -> None:
-    """Run a backtest and write a report."""
+    """Backtest several strategies and their ensemble from one data pass."""
+
+    from trading_bot.backtest.compare import compare_strategies
+    from trading_bot.data import PolygonDataSource
 
     cfg = load_config(config)
+    configure_logging(cfg.logging)
+    if strategies:
+        members = [name.strip() for name in strategies.split(",") if name.strip()]
+        cfg = cfg.model_copy(
+            update={
+                "strategy": StrategyConfig(
+                    name="ensemble", params={"members": members, "mode": mode}
+                )
+            }
+        )
     ticker = cfg.tickers[0]
     ds = PolygonDataSource()
     try:
@@ -78,10 +215,84 @@ def backtest(
     except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
         _handle_polygon_error(exc)
         raise
-    engine = BacktestEngine()
+    _cache_benchmark(ds, cfg, cfg.start or "2018-01-01", cfg.end or "2024-01-01")
     report_path = Path("reports") / report_name
-    engine.run(df, cfg, report_path)
-    typer.echo(f"Backtest complete. Summary saved to {report_path / 'summary.json'}")
+    table, _ = compare_strategies(df, cfg, report_path)
+    columns = ["total_return", "sharpe", "max_drawdown", "trades", "win_rate"]
+    typer.echo(table[columns].to_string(float_format=lambda value: f"{value:.4f}"))
+    typer.echo(f"Comparison saved to {report_path / 'comparison.csv'}")
+
+
+@app.command()
+def batch(
+    matrix: Path = typer.Option(..., help="Matrix file (tickers x strategies x settings)"),  # noqa: B008
+    workers: int = typer.Option(1, help="Worker processes"),
+    report_name: str = typer.Option("batch", help="Report folder name"),
+) -> None:
+    """Backtest a ticker x strategy x settings matrix, resuming a partial run."""
+
+    from trading_bot.backtest.batch import load_matrix, pending_cells, run_batch
+
+    spec, base = load_matrix(matrix)
+    configure_logging(base.logging)
+    report_path = Path("reports") / report_name
+    todo = sum(len(cells) for cells in pending_cells(spec, base, report_path).values())
+    with typer.progressbar(length=todo, label="Backtests") as progress:
+        result = run_batch(spec, base, report_path, workers, progress=progress.update)
+    for name, error in result.failed.items():
+        typer.echo(f"{name}: {error}", err=True)
+    typer.echo(
+        f"Ran {result.ran} backtests ({result.skipped} already done, "
+        f"{len(result.failed)} failed). Results saved to {report_path / 'results.csv'}"
+    )
+    if result.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def robustness(
+    config: Path = typer.Option(DEFAULT_CONFIG_PATH, help="Path to config"),  # noqa: B008
+    report_name: str = typer.Option("robustness", help="Report folder name"),
+    method: str = typer.Option(
+        "bars",
+        help="bars (block bootstrap of bar returns), trades (resample trade P&L) "
+        "or permute (shuffle trade order)",
+    ),
+    samples: int = typer.Option(1000, help="Number of resamples"),
+    block: int = typer.Option(0, help="Bootstrap block in bars (0: cube root of the bar count)"),
+    seed: int = typer.Option(0, help="Random seed"),
+    workers: int = typer.Option(1, help="Worker processes"),
+) -> None:
+    """Backtest, then report metric distributions over resampled returns or trades."""
+
+    from trading_bot.backtest.engine import BacktestEngine
+    from trading_bot.backtest.robustness import analyze_robustness, export_robustness
+    from trading_bot.data import PolygonDataSource
+
+    cfg = load_config(config)
+    configure_logging(cfg.logging)
+    if len(cfg.tickers) > 1:
+        typer.echo("Error: robustness supports single-ticker backtests only", err=True)
+        raise typer.Exit(code=1)
+    ds = PolygonDataSource()
+    try:
+        df = ds.fetch_and_cache(
+            cfg.tickers[0], cfg.start or "2018-01-01", cfg.end or "2024-01-01", cfg.bar_size
+        )
+    except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
+        _handle_polygon_error(exc)
+        raise
+    _cache_benchmark(ds, cfg, cfg.start or "2018-01-01", cfg.end or "2024-01-01")
+    report_path = Path("reports") / report_name
+    result = BacktestEngine(quiet=cfg.logging.quiet).run(df, cfg, report_path)
+    try:
+        analysis = analyze_robustness(result, method, samples, block or None, seed, workers)
+    except ValueError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1) from exc
+    export_robustness(report_path, analysis)
+    typer.echo(analysis.percentiles.to_string(float_format=lambda value: f"{value:.4f}"))
+    typer.echo(f"Distributions saved to {report_path / 'robustness.csv'}")
 
 
 @app.command()
@@ -95,6 +306,10 @@ def optimize(
 ) -> None:
     """Grid search optimization for a strategy."""
 
+    configure_logging()
+    from trading_bot.backtest.walkforward import grid_search
+    from trading_bot.data import PolygonDataSource
+
     param_grid = json.loads(grid)
     ds = PolygonDataSource()
     try:
@@ -109,6 +324,7 @@ def optimize(
         end=end,
         strategy=StrategyConfig(name=strategy, params={}),
     )
+    _cache_benchmark(ds, cfg, start, end)
     result = grid_search(data, cfg, param_grid)
     typer.echo(f"Best Sharpe: {result.sharpe:.2f} params={result.params} trades={result.trades}")
 
@@ -119,19 +335,116 @@ def live(
 ) -> None:
     """Run the live alert runtime."""
 
+    from trading_bot.live.signal_runtime import LiveSignalRuntime
+
     cfg = load_config(config)
+    # Log lines are written from a listener thread so the event loop never blocks on them.
+    listener = configure_logging(cfg.logging, queued=True)
     runtime = LiveSignalRuntime(cfg)
     try:
         asyncio.run(runtime.run())
     except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
         _handle_polygon_error(exc)
         raise
+    finally:
+        if listener is not None:
+            listener.stop()
+
+
+@app.command()
+def replay(
+    config: Path = typer.Option(DEFAULT_CONFIG_PATH, help="Config file"),  # noqa: B008
+    speed: str = typer.Option("max", help="Replay speed, e.g. 1000x, or max"),
+    alerts_file: Path | None = typer.Option(  # noqa: B008
+        None, help="Write alerts as JSON lines here instead of discarding them"
+    ),
+    window: int = typer.Option(1000, help="Bars kept for strategies without streaming"),
+    verify: bool = typer.Option(True, help="Compare live signals with a backtest"),
+) -> None:
+    """Replay cached bars through the live runtime and report throughput and latency."""
+
+    from trading_bot.data import PolygonDataSource
+    from trading_bot.live.replay import parse_speed, run_replay
+    from trading_bot.live.sinks import FileAlertSink, NullAlertSink
+
+    cfg = load_config(config)
+    listener = configure_logging(cfg.logging, queued=True)
+    ds = PolygonDataSource()
+    try:
+        frames = {
+            ticker: ds.fetch_and_cache(
+                ticker, cfg.start or "2018-01-01", cfg.end or "2024-01-01", cfg.bar_size
+            )
+            for ticker in cfg.tickers
+        }
+    except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
+        _handle_polygon_error(exc)
+        raise
+    sink = FileAlertSink(alerts_file) if alerts_file else NullAlertSink()
+    try:
+        report = asyncio.run(run_replay(cfg, frames, parse_speed(speed), sink, window, verify))
+    finally:
+        if listener is not None:
+            listener.stop()
+    typer.echo(
+        f"Replayed {report.bars} bars in {report.seconds:.2f}s "
+        f"({report.bars_per_second:,.0f} bars/sec), {report.alerts} alerts"
+    )
+    latency = ", ".join(f"{name}={value:.1f}us" for name, value in report.latency_us.items())
+    typer.echo(f"Per-bar latency: {latency}")
+    if verify:
+        mismatched = [ticker for ticker, ok in report.signal_checks.items() if not ok]
+        if mismatched:
+            typer.echo(f"Signals differ from the backtest for: {', '.join(mismatched)}", err=True)
+            raise typer.Exit(code=1)
+        typer.echo("Live signals match the backtest.")
+
+
+@app.command("feed-server")
+def feed_server(
+    config: Path = typer.Option(DEFAULT_CONFIG_PATH, help="Config file"),  # noqa: B008
+    port: int = typer.Option(8765, help="Port to listen on (127.0.0.1)"),
+    rate: float | None = typer.Option(None, help="Events per second (default: unthrottled)"),
+    synthetic: bool = typer.Option(False, help="Serve endless random-walk bars, not the cache"),
+) -> None:
+    """Serve cached or synthetic bars over a local Polygon-compatible WebSocket feed."""
+
+    from trading_bot.data import PolygonDataSource
+    from trading_bot.live.local_server import LocalPolygonServer, frame_events, synthetic_events
+
+    cfg = load_config(config)
+    configure_logging(cfg.logging)
+    if synthetic:
+        events = synthetic_events(cfg.tickers)
+    else:
+        ds = PolygonDataSource()
+        try:
+            frames = {
+                ticker: ds.fetch_and_cache(
+                    ticker, cfg.start or "2018-01-01", cfg.end or "2024-01-01", cfg.bar_size
+                )
+                for ticker in cfg.tickers
+            }
+        except RuntimeError as exc:  # pragma: no cover - thin CLI wrapper
+            _handle_polygon_error(exc)
+            raise
+        cadence_ms = 1_000 if cfg.bar_size == "1sec" else 60_000
+        events = frame_events(frames, cadence_ms)
+    server = LocalPolygonServer(events, port=port, rate=rate)
+    typer.echo(f"Serving on ws://127.0.0.1:{port}; set live.feed to 127.0.0.1:{port}")
+    typer.echo("and live.secure to false, then run `tb live`.")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
 
 
 @app.command()
 def plot(report: Path = typer.Option(..., help="Path to summary.json")) -> None:  # noqa: B008
     """Re-render plots for an existing report."""
 
+    import pandas as pd
+
+    from trading_bot.backtest.plotting import generate_plots
+
     if not report.exists():
         typer.echo(f"Error: {report} does not exist", err=True)
         raise typer.Exit(code=1)
@@ -146,8 +459,6 @@ def plot(report: Path = typer.Option(..., help="Path to summary.json")) -> None:
         raise typer.Exit(code=1)
     equity = pd.read_csv(equity_path, index_col=0, parse_dates=True).squeeze()
     benchmark = pd.read_csv(benchmark_path, index_col=0, parse_dates=True).squeeze()
-    from trading_bot.backtest.plotting import generate_plots
-
     generate_plots(report_dir, equity, benchmark)
     typer.echo(f"Plots re-generated in {report_dir}")
 
@@ -28,6 +28,33 @@ class StrategyConfig(BaseModel):
     params: dict[str, Any] = Field(default_factory=dict)
 
 
+class LiveConfig(BaseModel):
+    """Live runtime configuration."""
+
+    queue_size: int = Field(10_000, ge=1)
+    overflow: Literal["block", "drop_oldest", "coalesce"] = "block"
+    warm_start: bool = True
+    checkpoint_path: Path | None = None
+    checkpoint_interval: float = Field(30.0, gt=0)
+    feed: str = "delayed.polygon.io"
+    secure: bool = True
+    backfill: bool = True
+    backfill_min_gap: int | None = Field(None, ge=1)
+    metrics_port: int | None = None
+    metrics_interval: float = Field(60.0, gt=0)
+
+
+class LoggingConfig(BaseModel):
+    """Logging configuration."""
+
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    json_format: bool = False
+    # Keep 1 in N of these events (the first, then every N-th).
+    sample: dict[str, int] = Field(default_factory=lambda: {"discord.alert_dropped": 100})
+    # One summary line per backtest instead of one per fill.
+    quiet: bool = False
+
+
 class Config(BaseModel):
     """Top-level configuration structure."""
 
@@ -40,6 +67,8 @@ class Config(BaseModel):
     risk: RiskConfig = Field(default_factory=RiskConfig)
     strategy: StrategyConfig = Field(default_factory=lambda: StrategyConfig(name="sma_cross"))
     benchmark_ticker: str = "SPY"
+    live: LiveConfig = Field(default_factory=LiveConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
     @field_validator("tickers", mode="before")
     @classmethod
@@ -67,4 +96,12 @@ def load_config(path: str | Path | None = None) -> Config:
         raise ValueError(f"Invalid configuration: {exc}") from exc
 
 
-__all__ = ["DEFAULT_CONFIG_PATH", "Config", "RiskConfig", "StrategyConfig", "load_config"]
+__all__ = [
+    "DEFAULT_CONFIG_PATH",
+    "Config",
+    "LiveConfig",
+    "LoggingConfig",
+    "RiskConfig",
+    "StrategyConfig",
+    "load_config",
+]
@@ -1,6 +1,34 @@
-"""Data access layer."""
+"""Data access layer.
 
+``PolygonDataSource`` is imported on first access, so cache helpers load without the
+Polygon client.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .bars import BarQueue, BarRecord
 from .cache import CACHE_DIR, cache_key, ensure_cache_dir
-from .polygon_source import PolygonDataSource
 
-__all__ = ["CACHE_DIR", "PolygonDataSource", "cache_key", "ensure_cache_dir"]
+if TYPE_CHECKING:
+    from .polygon_source import PolygonDataSource
+
+
+def __getattr__(name: str) -> Any:
+    if name != "PolygonDataSource":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .polygon_source import PolygonDataSource
+
+    globals()[name] = PolygonDataSource
+    return PolygonDataSource
+
+
+__all__ = [
+    "CACHE_DIR",
+    "BarQueue",
+    "BarRecord",
+    "PolygonDataSource",
+    "cache_key",
+    "ensure_cache_dir",
+]
@@ -0,0 +1,298 @@
+"""Compact bar records and the bounded queue that carries them from the feed."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+MARKET_TZ = "US/Eastern"
+BAR_FIELDS = ("open", "high", "low", "close", "volume", "vwap")
+OverflowPolicy = Literal["block", "drop_oldest", "coalesce"]
+AGGREGATE_EVENTS = frozenset({"A", "AM"})
+
+
+@dataclass(slots=True)
+class BarRecord(Mapping[str, Any]):
+    """One aggregate bar; a mapping of the :data:`BAR_FIELDS`, so ``bar["close"]`` works
+    like on the ``pd.Series`` it replaces.
+
+    ``received`` is the ``time.perf_counter()`` reading when the bar came off the socket
+    (0.0 for bars from other sources); it only feeds latency metrics.
+    """
+
+    ticker: str
+    start_ms: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    vwap: float = float("nan")
+    received: float = field(default=0.0, compare=False, repr=False)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in BAR_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(BAR_FIELDS)
+
+    def __len__(self) -> int:
+        return len(BAR_FIELDS)
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return _market_timestamp(self.start_ms)
+
+    def to_series(self) -> pd.Series:
+        return pd.Series({field: getattr(self, field) for field in BAR_FIELDS}, name=self.timestamp)
+
+
+@lru_cache(maxsize=4096)
+def _market_timestamp(start_ms: int) -> pd.Timestamp:
+    # Bars of every ticker share the same few bar-start times, so conversions are cached.
+    return pd.Timestamp(start_ms, unit="ms", tz="UTC").tz_convert(MARKET_TZ)
+
+
+def bar_from_event(event: Any) -> BarRecord | None:
+    """Convert a Polygon aggregate event into a :class:`BarRecord` (``None`` for others)."""
+
+    if getattr(event, "event_type", None) not in AGGREGATE_EVENTS:
+        return None
+    vwap = event.vwap
+    return BarRecord(
+        event.symbol,
+        int(event.start_timestamp),
+        float(event.open),
+        float(event.high),
+        float(event.low),
+        float(event.close),
+        float(event.volume),
+        float("nan") if vwap is None else float(vwap),
+    )
+
+
+def bars_to_frame(bars: Any) -> pd.DataFrame:
+    """Build the OHLCV frame strategies expect from an iterable of records."""
+
+    bars = list(bars)
+    index = pd.to_datetime([bar.start_ms for bar in bars], unit="ms", utc=True)
+    rows = [[getattr(bar, field) for field in BAR_FIELDS] for bar in bars]
+    return pd.DataFrame(rows, columns=list(BAR_FIELDS), index=index.tz_convert(MARKET_TZ))
+
+
+def frame_to_bars(ticker: str, frame: pd.DataFrame) -> list[BarRecord]:
+    """Inverse of :func:`bars_to_frame` for a frame with a tz-aware ``DatetimeIndex``."""
+
+    if frame.empty:
+        return []
+    columns = frame.reindex(columns=list(BAR_FIELDS)).to_numpy(dtype=np.float64, na_value=np.nan)
+    start_ms = frame.index.as_unit("ms").asi8.tolist()
+    return [BarRecord(ticker, ms, *row) for ms, row in zip(start_ms, columns.tolist(), strict=True)]
+
+
+class BarBuffer:
+    """Fixed-capacity ring buffer of bars stored column-wise in NumPy arrays."""
+
+    __slots__ = ("_ms", "_pos", "_size", "_values")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._ms = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, len(BAR_FIELDS)), dtype=np.float64)
+        self._pos = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._ms.size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, bar: BarRecord) -> None:
+        pos = self._pos
+        self._ms[pos] = bar.start_ms
+        self._values[pos] = (bar.open, bar.high, bar.low, bar.close, bar.volume, bar.vwap)
+        self._pos = (pos + 1) % self._ms.size
+        self._size = min(self._size + 1, self._ms.size)
+
+    def extend(self, bars: Any) -> None:
+        for bar in bars:
+            self.append(bar)
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._size = 0
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Copies of the bar start times (ms) and values, oldest first."""
+
+        if self._size < self._ms.size:
+            return self._ms[: self._size].copy(), self._values[: self._size].copy()
+        order = np.r_[self._pos : self._ms.size, 0 : self._pos]
+        return self._ms[order], self._values[order]
+
+    def load(self, start_ms: np.ndarray, values: np.ndarray) -> None:
+        """Replace the contents with ``arrays()`` output, keeping the newest bars."""
+
+        start_ms, values = start_ms[-self._ms.size :], values[-self._ms.size :]
+        size = start_ms.size
+        self._ms[:size] = start_ms
+        self._values[:size] = values
+        self._size = size
+        self._pos = size % self._ms.size
+
+    def to_frame(self) -> pd.DataFrame:
+        start_ms, values = self.arrays()
+        index = pd.to_datetime(start_ms, unit="ms", utc=True).tz_convert(MARKET_TZ)
+        return pd.DataFrame(values, columns=list(BAR_FIELDS), index=index)
+
+
+class BarQueue:
+    """Bounded, thread-safe bar queue with an asyncio consumer.
+
+    Producers may call :meth:`put` from any thread (or :meth:`put_async` from a
+    coroutine); one consumer awaits :meth:`get`. When ``maxsize`` bars are pending the
+    ``policy`` decides what happens:
+
+    * ``block`` - the producer waits for space (backpressure onto the socket reader).
+    * ``drop_oldest`` - the oldest pending bar is discarded.
+    * ``coalesce`` - each ticker's pending bars collapse to its newest one (the incoming
+      bar replacing its ticker's), in arrival order; if that leaves the queue full, the
+      oldest pending bar is discarded.
+
+    Below ``maxsize`` every policy is a plain FIFO that loses nothing. ``depth``,
+    ``max_depth`` and ``dropped`` expose the queue's health.
+    """
+
+    def __init__(self, maxsize: int = 10_000, policy: OverflowPolicy = "block") -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if policy not in ("block", "drop_oldest", "coalesce"):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._items: deque[BarRecord] = deque()
+        self._getter: tuple[asyncio.AbstractEventLoop, asyncio.Future[None]] | None = None
+        self._putters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def put(self, bar: BarRecord) -> None:
+        """Enqueue ``bar``; with ``block`` this waits for space, so never call it on the
+        consumer's event loop thread (use :meth:`put_async` there)."""
+
+        with self._lock:
+            if self.policy == "block":
+                while len(self._items) >= self.maxsize:
+                    self._not_full.wait()
+            self._push(bar)
+
+    async def put_async(self, bar: BarRecord) -> None:
+        while True:
+            with self._lock:
+                if self.policy != "block" or len(self._items) < self.maxsize:
+                    self._push(bar)
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._putters.append((asyncio.get_running_loop(), waiter))
+            await waiter
+
+    async def get(self) -> BarRecord:
+        while True:
+            with self._lock:
+                if self.depth:
+                    return self._pop()
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._getter = (loop, waiter)
+            try:
+                await waiter
+            finally:
+                self._getter = None
+
+    def get_nowait(self) -> BarRecord | None:
+        with self._lock:
+            return self._pop() if self.depth else None
+
+    # ------------------------------------------------------------------
+    def _push(self, bar: BarRecord) -> None:
+        # Called with the lock held.
+        if len(self._items) >= self.maxsize and self.policy == "coalesce":
+            self._coalesce(bar.ticker)
+        if len(self._items) >= self.maxsize:
+            self._items.popleft()
+            self.dropped += 1
+        self._items.append(bar)
+        self.max_depth = max(self.max_depth, self.depth)
+        if self._getter is not None:
+            _wake(*self._getter)
+
+    def _coalesce(self, ticker: str) -> None:
+        # Called with the lock held on a full queue: keep each ticker's newest pending bar,
+        # none for ``ticker`` whose incoming bar is newer still.
+        seen = {ticker}
+        kept: deque[BarRecord] = deque()
+        for pending in reversed(self._items):
+            if pending.ticker not in seen:
+                seen.add(pending.ticker)
+                kept.appendleft(pending)
+        self.dropped += len(self._items) - len(kept)
+        self._items = kept
+
+    def _pop(self) -> BarRecord:
+        # Called with the lock held and at least one bar pending.
+        bar = self._items.popleft()
+        if self.policy == "block":
+            self._not_full.notify()
+            while self._putters:
+                loop, waiter = self._putters.pop(0)
+                if not waiter.done():
+                    _wake(loop, waiter)
+                    break
+        return bar
+
+
+def _wake(loop: asyncio.AbstractEventLoop, waiter: asyncio.Future[None]) -> None:
+    def resolve() -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        resolve()
+    else:
+        loop.call_soon_threadsafe(resolve)
+
+
+__all__ = [
+    "BAR_FIELDS",
+    "MARKET_TZ",
+    "BarBuffer",
+    "BarQueue",
+    "BarRecord",
+    "OverflowPolicy",
+    "bar_from_event",
+    "bars_to_frame",
+    "frame_to_bars",
+]
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 CACHE_DIR = Path(".cache")
+# Rows per Parquet row group; bounds the memory of :func:`iter_cached_chunks`.
+ROW_GROUP_ROWS = 100_000
 
 
 def ensure_cache_dir() -> Path:
@@ -32,17 +37,126 @@ def load_cached_dataframe(path: Path) -> pd.DataFrame | None:
     return None
 
 
+def _newest_in_group(parquet: pq.ParquetFile, group: int) -> pd.Timestamp | None:
+    # Latest index value of a row group from its statistics, if the file records them.
+    index = (parquet.schema_arrow.pandas_metadata or {}).get("index_columns", [])
+    if len(index) != 1 or not isinstance(index[0], str):
+        return None
+    column = parquet.schema_arrow.get_field_index(index[0])
+    if column < 0:
+        return None
+    stats = parquet.metadata.row_group(group).column(column).statistics
+    if stats is None or not stats.has_min_max:
+        return None
+    return pd.Timestamp(stats.max)
+
+
+def load_recent_bars(ticker: str, bar_size: str, count: int) -> pd.DataFrame | None:
+    """Return the last ``count`` cached bars for ``ticker`` across all cached ranges.
+
+    Row groups are read newest first, by the Parquet statistics of the index, until no
+    unread group can hold one of the last ``count`` bars; the rest stay on disk.
+    """
+
+    safe_ticker = ticker.replace("/", "_")
+    unknown, dated = [], []
+    for order, path in enumerate(sorted(CACHE_DIR.glob(f"{safe_ticker}_{bar_size}_*.parquet"))):
+        parquet = pq.ParquetFile(path)
+        for group in range(parquet.num_row_groups):
+            newest = _newest_in_group(parquet, group)
+            if newest is None:
+                unknown.append((order, group, parquet))
+            else:
+                dated.append((newest, order, group, parquet))
+    dated.sort(key=lambda entry: entry[0], reverse=True)
+    frames: list[tuple[int, int, pd.DataFrame]] = []
+    seen = pd.DatetimeIndex([])
+    cutoff: pd.Timestamp | None = None
+    for newest, order, group, parquet in [(None, *entry) for entry in unknown] + dated:
+        if cutoff is not None and newest is not None and newest < cutoff:
+            break
+        frame = parquet.read_row_group(group).to_pandas()
+        if frame.empty:
+            continue
+        frames.append((order, group, frame))
+        seen = seen.union(frame.index)
+        if len(seen) >= count:
+            cutoff = seen[-count]
+    if not frames:
+        return None
+    # Later cache files win on overlapping bars, as when each file is read in full.
+    frames.sort(key=lambda entry: entry[:2])
+    df = pd.concat([frame for _, _, frame in frames])
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df.tail(count)
+
+
+def load_cached_range(
+    ticker: str,
+    bar_size: str,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """Cached bars for ``ticker`` between ``start`` and ``end`` across all cached ranges.
+
+    Row groups outside the range are skipped using the Parquet statistics of the index.
+    """
+
+    safe_ticker = ticker.replace("/", "_")
+    frames = []
+    for path in sorted(CACHE_DIR.glob(f"{safe_ticker}_{bar_size}_*.parquet")):
+        metadata = pq.read_schema(path).pandas_metadata or {}
+        index = metadata.get("index_columns", [])
+        filters = None
+        if len(index) == 1 and isinstance(index[0], str):
+            filters = [(index[0], ">=", start), (index[0], "<=", end)]
+        frame = pd.read_parquet(path, columns=columns, filters=filters)
+        frame = frame.loc[start:end]
+        if not frame.empty:
+            frames.append(frame)
+    if not frames:
+        return None
+    df = pd.concat(frames)
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def iter_cached_chunks(path: Path, rows: int | None = None) -> Iterator[pd.DataFrame]:
+    """Yield a cached dataframe one Parquet row group (or ``rows`` rows) at a time.
+
+    Row groups larger than :data:`ROW_GROUP_ROWS`, as in caches written before it
+    existed, are split into chunks of that size so memory stays bounded either way.
+    """
+
+    parquet = pq.ParquetFile(path)
+    if rows is None:
+        metadata = parquet.metadata
+        for group in range(parquet.num_row_groups):
+            if metadata.row_group(group).num_rows <= ROW_GROUP_ROWS:
+                yield parquet.read_row_group(group).to_pandas()
+                continue
+            for batch in parquet.iter_batches(batch_size=ROW_GROUP_ROWS, row_groups=[group]):
+                yield pa.Table.from_batches([batch]).to_pandas()
+    else:
+        for batch in parquet.iter_batches(batch_size=rows):
+            yield pa.Table.from_batches([batch]).to_pandas()
+
+
 def save_dataframe_to_cache(df: pd.DataFrame, path: Path) -> None:
     """Persist dataframe to the cache."""
 
     ensure_cache_dir()
-    df.to_parquet(path)
+    df.to_parquet(path, row_group_size=ROW_GROUP_ROWS)
 
 
 __all__ = [
     "CACHE_DIR",
+    "ROW_GROUP_ROWS",
     "cache_key",
     "ensure_cache_dir",
+    "iter_cached_chunks",
     "load_cached_dataframe",
+    "load_cached_range",
+    "load_recent_bars",
     "save_dataframe_to_cache",
 ]
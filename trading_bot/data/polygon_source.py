@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 from collections.abc import AsyncIterator
 from typing import Any
@@ -10,9 +11,15 @@ from typing import Any
 import pandas as pd
 import structlog
 from polygon import RESTClient, WebSocketClient
-from polygon.websocket.models import WebSocketMessage
+from polygon.websocket.models import Feed, WebSocketMessage
 
-from .cache import cache_key, load_cached_dataframe, save_dataframe_to_cache
+from .bars import BarQueue, BarRecord, OverflowPolicy, bar_from_event
+from .cache import (
+    cache_key,
+    load_cached_dataframe,
+    load_recent_bars,
+    save_dataframe_to_cache,
+)
 
 log = structlog.get_logger(__name__)
 
@@ -124,6 +131,41 @@ class PolygonDataSource:
         save_dataframe_to_cache(df, key)
         return df
 
+    def recent_bars(
+        self,
+        ticker: str,
+        bar_size: str,
+        count: int,
+        now: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Last ``count`` bars: the Parquet cache topped up with one REST call.
+
+        The REST top-up covers the day of the last cached bar through today (or a lookback
+        sized for ``count`` bars when nothing is cached). If it fails, e.g. without an API
+        key, the cached bars are returned on their own.
+        """
+
+        now = now or pd.Timestamp.now(tz="US/Eastern")
+        cached = load_recent_bars(ticker, bar_size, count)
+        if cached is not None and not cached.empty:
+            start = cached.index[-1].strftime("%Y-%m-%d")
+        else:
+            bars_per_day = 23_400 if bar_size == "1sec" else 390
+            days = count // bars_per_day + 5  # weekends and holidays
+            start = (now - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+        timespan = "second" if bar_size == "1sec" else "minute"
+        try:
+            fresh = self.fetch_aggregates(ticker, start, now.strftime("%Y-%m-%d"), timespan)
+        except Exception as exc:
+            log.warning("polygon.recent_bars.top_up_failed", ticker=ticker, error=str(exc))
+            fresh = None
+        frames = [frame for frame in (cached, fresh) if frame is not None and not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        df = pd.concat(frames)
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        return df.tail(count)
+
     # endregion ------------------------------------------------------------------------------
 
     # region Reference data -------------------------------------------------------------------
@@ -154,49 +196,37 @@ class PolygonDataSource:
         self,
         ticker: str,
         timespan: str = "minute",
-    ) -> AsyncIterator[pd.Series]:
+        max_queue: int = 10_000,
+        overflow: OverflowPolicy = "block",
+        feed: Feed | str = Feed.Delayed,
+        secure: bool = True,
+    ) -> AsyncIterator[BarRecord]:
         """Yield aggregate bars from the Polygon WebSocket."""
 
-        loop = asyncio.get_event_loop()
-        queue: asyncio.Queue[pd.Series] = asyncio.Queue()
-
-        def handle_message(msg: WebSocketMessage) -> None:
-            for event in msg.events:
-                if event.event_type not in {"A", "AM"}:  # aggregate types
-                    continue
-                if event.ticker != ticker:
-                    continue
-                timestamp = pd.Timestamp(event.start_timestamp, unit="ms", tz="UTC").tz_convert(
-                    "US/Eastern"
-                )
-                bar = pd.Series(
-                    {
-                        "open": event.open,
-                        "high": event.high,
-                        "low": event.low,
-                        "close": event.close,
-                        "volume": event.volume,
-                        "vwap": event.vwap,
-                        "trade_count": event.transactions,
-                    },
-                    name=timestamp,
-                )
-                loop.call_soon_threadsafe(queue.put_nowait, bar)
+        queue = BarQueue(max_queue, overflow)
+
+        async def handle_message(messages: list[WebSocketMessage]) -> None:
+            for event in messages:
+                bar = bar_from_event(event)
+                if bar is not None and bar.ticker == ticker:
+                    await queue.put_async(bar)
 
         api_key = self._require_api_key("stream data from Polygon")
-        client = WebSocketClient(subscriptions=[f"A.{ticker}"], api_key=api_key, feed="delayed")
-        client.on_message = handle_message
+        client = WebSocketClient(
+            subscriptions=[f"A.{ticker}"], api_key=api_key, feed=feed, secure=secure
+        )
 
         log.info("polygon.stream.start", ticker=ticker, timespan=timespan)
-        task = asyncio.create_task(client.connect_async())
+        task = asyncio.create_task(client.connect(handle_message))
         try:
             while True:
-                bar = await queue.get()
-                yield bar
+                yield await queue.get()
         finally:
-            client.close()
-            await task
-            log.info("polygon.stream.stop", ticker=ticker)
+            await client.close()
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            log.info("polygon.stream.stop", ticker=ticker, dropped=queue.dropped)
 
     # endregion -----------------------------------------------------------------------------
 
@@ -1,5 +1,30 @@
 """Indicator exports."""
 
-from .ta import bollinger_bands, ema, macd, rsi, sma, vwap
+from . import kernels, streaming
+from .ta import (
+    bollinger_bands,
+    ema,
+    macd,
+    opening_range,
+    rsi,
+    session_high_low,
+    session_starts,
+    session_vwap,
+    sma,
+    vwap,
+)
 
-__all__ = ["bollinger_bands", "ema", "macd", "rsi", "sma", "vwap"]
+__all__ = [
+    "bollinger_bands",
+    "ema",
+    "kernels",
+    "macd",
+    "opening_range",
+    "rsi",
+    "session_high_low",
+    "session_starts",
+    "session_vwap",
+    "sma",
+    "streaming",
+    "vwap",
+]
@@ -0,0 +1,486 @@
+"""NumPy indicator kernels operating directly on ``ndarray`` inputs.
+
+Every kernel accepts one-dimensional array-likes, returns ``float64`` arrays and
+can write into caller supplied ``out`` buffers so hot loops (live runtime, parameter
+sweeps) avoid allocating fresh results on every call. The pandas API in
+:mod:`trading_bot.indicators.ta` is a thin wrapper around these functions and the
+numerical semantics (warm-up ``NaN`` handling, RSI neutral fill, ...) match it.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+FloatArray = np.ndarray
+
+# Rolling sums are computed from cumulative sums restarted every few windows so
+# round-off does not grow with the length of the input.
+_MIN_BLOCK = 64
+_BLOCK_PER_WINDOW = 8
+# Largest EMA block keeps ``(1 - alpha) ** -block`` far away from overflow.
+_EMA_MAX_BLOCK = 1024
+
+
+def _as_float(values: object) -> FloatArray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim != 1:
+        raise ValueError("Indicator kernels expect one-dimensional input")
+    return array
+
+
+def _prepare_out(out: FloatArray | None, size: int) -> FloatArray:
+    if out is None:
+        return np.empty(size, dtype=np.float64)
+    if out.shape != (size,) or out.dtype != np.float64:
+        raise ValueError(f"out buffer must be a float64 array of shape ({size},)")
+    return out
+
+
+def _window_sums(csum: FloatArray, window: int) -> FloatArray:
+    """Differences of a row-wise cumulative sum over ``window`` columns."""
+
+    sums = csum[:, window - 1 :].copy()
+    sums[:, 1:] -= csum[:, :-window]
+    return sums
+
+
+def _rolling_moments(
+    x: FloatArray,
+    window: int,
+    mean_out: FloatArray,
+    var_out: FloatArray | None = None,
+) -> None:
+    """Rolling mean (and sample variance) with pandas ``min_periods=window`` semantics.
+
+    Any window containing ``NaN`` yields ``NaN``. The input is cut into overlapping
+    rows of a strided view; every row is shifted by its first value and accumulated
+    with a restarted ``cumsum`` so round-off stays proportional to the local spread
+    instead of growing with the length of the input. Windows of one repeated value are
+    exact, as in pandas: their mean is that value and their variance 0, so e.g. a flat
+    run leaves RSI's average loss at exactly 0 rather than a round-off residue.
+    """
+
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    n = x.size
+    warmup = min(window - 1, n)
+    mean_out[:warmup] = np.nan
+    if var_out is not None:
+        var_out[:warmup] = np.nan
+    n_valid = n - warmup
+    if n < window:
+        return
+    missing_any = bool(np.isnan(x).any())
+    block = max(_MIN_BLOCK, _BLOCK_PER_WINDOW * window)
+    if n_valid <= block:
+        rows = x[None, :]
+    else:
+        nblocks = -(-n_valid // block)
+        padded = np.empty(nblocks * block + window - 1, dtype=np.float64)
+        padded[:n] = x
+        padded[n:] = x[-1]
+        rows = np.lib.stride_tricks.sliding_window_view(padded, block + window - 1)[::block]
+    if missing_any:
+        missing = np.isnan(rows)
+        first = np.argmax(~missing, axis=1)
+        ref = rows[np.arange(rows.shape[0]), first]
+        ref[np.isnan(ref)] = 0.0
+        shifted = rows - ref[:, None]
+        shifted[missing] = 0.0
+        has_nan = _window_sums(np.cumsum(missing, axis=1), window) > 0
+    else:
+        ref = rows[:, 0].copy()
+        shifted = rows - ref[:, None]
+    squares = shifted * shifted if var_out is not None else None
+    sums = _window_sums(np.cumsum(shifted, axis=1, out=shifted), window)
+    mean = sums / window
+    mean += ref[:, None]
+    if missing_any:
+        mean[has_nan] = np.nan
+    mean_out[warmup:] = mean.reshape(-1)[:n_valid]
+    flat = _flat_windows(x, window) if window > 1 else None
+    if flat is not None:
+        mean_out[warmup:][flat] = x[warmup:][flat]
+    if var_out is None or squares is None:
+        return
+    if window == 1:
+        var_out[warmup:] = np.nan
+        return
+    var = _window_sums(np.cumsum(squares, axis=1, out=squares), window)
+    sums *= sums
+    sums /= window
+    var -= sums
+    var /= window - 1
+    np.maximum(var, 0.0, out=var)
+    if missing_any:
+        var[has_nan] = np.nan
+    var_out[warmup:] = var.reshape(-1)[:n_valid]
+    if flat is not None:
+        var_out[warmup:][flat] = 0.0
+
+
+def _flat_windows(x: FloatArray, window: int) -> FloatArray:
+    """Mask of the full windows of ``x`` whose values are all equal (never with ``NaN``)."""
+
+    changes = np.empty(x.size, dtype=np.int64)
+    changes[0] = 0
+    np.cumsum(x[1:] != x[:-1], out=changes[1:])
+    return changes[window - 1 :] == changes[: x.size - window + 1]
+
+
+def _ema_recurrence(x: FloatArray, alpha: float, out: FloatArray) -> None:
+    """Evaluate ``y[t] = (1 - alpha) * y[t-1] + alpha * x[t]`` with ``y[0] = x[0]``.
+
+    The input is reshaped into blocks that are solved in closed form with a single
+    ``cumsum``; only the per-block carries are propagated with a scalar loop.
+    """
+
+    n = x.size
+    beta = 1.0 - alpha
+    if beta <= 0.0 or n == 1:
+        out[:] = x
+        return
+    block = int(min(_EMA_MAX_BLOCK, max(1, 300.0 / -math.log(beta))))
+    block = min(block, n)
+    nblocks = -(-n // block)
+    padded = np.zeros(nblocks * block, dtype=np.float64)
+    padded[:n] = x
+    rows = padded.reshape(nblocks, block)
+    powers = np.arange(1, block + 1, dtype=np.float64)
+    growth = beta**-powers
+    decay = beta**powers
+    local = np.cumsum(rows * growth, axis=1)
+    local *= alpha * decay
+    carries = np.empty(nblocks, dtype=np.float64)
+    # Seeding the carry with x[0] makes y[0] = alpha * x[0] + beta * x[0] = x[0].
+    carry = float(x[0])
+    block_decay = beta**block
+    last = local[:, -1]
+    for i in range(nblocks):
+        carries[i] = carry
+        carry = block_decay * carry + last[i]
+    local += carries[:, None] * decay
+    out[:] = local.reshape(-1)[:n]
+
+
+def _ema_with_gaps(x: FloatArray, alpha: float, out: FloatArray) -> None:
+    """Scalar fallback replicating pandas ``ewm(adjust=False)`` around interior NaNs."""
+
+    com = (1.0 - alpha) / alpha
+    old_wt_factor = 1.0 - alpha
+    new_wt = alpha
+    weighted = float(x[0])
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, x.size):
+        cur = float(x[i])
+        is_observation = cur == cur
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if com == 1:
+                new_wt = 1.0 - old_wt
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted
+
+
+def sma(values: object, window: int, out: FloatArray | None = None) -> FloatArray:
+    """Simple moving average."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    _rolling_moments(x, window, result)
+    return result
+
+
+def ema(values: object, window: int, out: FloatArray | None = None) -> FloatArray:
+    """Exponential moving average (``span=window``, ``adjust=False``)."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    if x.size == 0:
+        return result
+    alpha = 2.0 / (window + 1.0)
+    observed = ~np.isnan(x)
+    if not observed.any():
+        result[:] = np.nan
+        return result
+    first = int(np.argmax(observed))
+    result[:first] = np.nan
+    tail = x[first:]
+    if observed[first:].all():
+        _ema_recurrence(tail, alpha, result[first:])
+    else:
+        _ema_with_gaps(tail, alpha, result[first:])
+    return result
+
+
+def rsi(values: object, window: int = 14, out: FloatArray | None = None) -> FloatArray:
+    """Relative Strength Index using simple moving averages of gains and losses."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    if x.size == 0:
+        return result
+    delta = np.empty_like(x)
+    delta[0] = np.nan
+    np.subtract(x[1:], x[:-1], out=delta[1:])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    _rolling_moments(gain, window, result)
+    avg_loss = gain  # reuse the gain buffer, it is no longer needed
+    _rolling_moments(loss, window, avg_loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(result, avg_loss, out=result)
+        result += 1.0
+        np.divide(100.0, result, out=result)
+        np.subtract(100.0, result, out=result)
+    result[np.isnan(result)] = 50.0
+    return result
+
+
+def macd(
+    values: object,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    out: tuple[FloatArray, FloatArray, FloatArray] | None = None,
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """Return ``(macd, signal, histogram)`` arrays."""
+
+    x = _as_float(values)
+    macd_out, signal_out, hist_out = out if out is not None else (None, None, None)
+    macd_line = ema(x, fast, out=_prepare_out(macd_out, x.size))
+    slow_line = ema(x, slow, out=_prepare_out(hist_out, x.size))
+    macd_line -= slow_line
+    signal_line = ema(macd_line, signal, out=signal_out)
+    histogram = np.subtract(macd_line, signal_line, out=slow_line)
+    return macd_line, signal_line, histogram
+
+
+def bollinger_bands(
+    values: object,
+    window: int = 20,
+    num_std: float = 2.0,
+    out: tuple[FloatArray, FloatArray, FloatArray] | None = None,
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """Return ``(mid, upper, lower)`` arrays."""
+
+    x = _as_float(values)
+    mid_out, upper_out, lower_out = out if out is not None else (None, None, None)
+    mid = _prepare_out(mid_out, x.size)
+    upper = _prepare_out(upper_out, x.size)
+    lower = _prepare_out(lower_out, x.size)
+    _rolling_moments(x, window, mid, var_out=lower)
+    np.sqrt(lower, out=lower)
+    lower *= num_std
+    np.add(mid, lower, out=upper)
+    np.subtract(mid, lower, out=lower)
+    return mid, upper, lower
+
+
+def vwap(
+    high: object,
+    low: object,
+    close: object,
+    volume: object,
+    out: FloatArray | None = None,
+) -> FloatArray:
+    """Cumulative volume weighted average price of the typical price."""
+
+    h = _as_float(high)
+    price = h + _as_float(low)
+    price += _as_float(close)
+    price /= 3
+    vol = _as_float(volume)
+    price *= vol
+    cumulative = _nancumsum(price)
+    result = _prepare_out(out, vol.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(cumulative, _nancumsum(vol), out=result)
+    return result
+
+
+def _nancumsum(x: FloatArray) -> FloatArray:
+    """``cumsum`` skipping NaNs while keeping them in place (pandas ``skipna``)."""
+
+    missing = np.isnan(x)
+    result = np.nancumsum(x)
+    if missing.any():
+        result[missing] = np.nan
+    return result
+
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+# Padded (sessions x longest session) matrices are used for segmented extrema as long
+# as they stay within this multiple of the input size; otherwise fall back to ranks.
+_MAX_PADDING_FACTOR = 4
+
+
+def session_starts(local_ns: object, anchor_ns: int = 0) -> np.ndarray:
+    """Return start positions of the sessions in sorted wall-clock timestamps.
+
+    ``local_ns`` are tz-naive (exchange local) nanoseconds. A new session begins
+    whenever the trading day, measured from ``anchor_ns`` after midnight, changes;
+    bars before the anchor belong to the previous session.
+    """
+
+    stamps = np.asarray(local_ns, dtype=np.int64)
+    if stamps.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    day = (stamps - anchor_ns) // NS_PER_DAY
+    return np.concatenate(([0], np.flatnonzero(day[1:] != day[:-1]) + 1))
+
+
+def segment_ids(starts: object, size: int) -> np.ndarray:
+    """Map every position to the index of the segment that contains it."""
+
+    marks = np.zeros(size, dtype=np.intp)
+    bounds = np.asarray(starts, dtype=np.intp)
+    if size:
+        marks[bounds[1:]] = 1
+    return np.cumsum(marks, out=marks)
+
+
+def segmented_cumsum(values: object, starts: object, out: FloatArray | None = None) -> FloatArray:
+    """Cumulative sum that restarts at every segment start (``NaN`` skipped in place)."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    if x.size == 0:
+        return result
+    bounds = np.asarray(starts, dtype=np.intp)
+    missing = np.isnan(x)
+    np.nancumsum(x, out=result)
+    offsets = np.empty(bounds.size, dtype=np.float64)
+    offsets[0] = 0.0
+    offsets[1:] = result[bounds[1:] - 1]
+    result -= offsets[segment_ids(bounds, x.size)]
+    if missing.any():
+        result[missing] = np.nan
+    return result
+
+
+def _segmented_running_max(x: FloatArray, bounds: np.ndarray, out: FloatArray) -> None:
+    n = x.size
+    ids = segment_ids(bounds, n)
+    lengths = np.diff(np.append(bounds, n))
+    filled = np.where(np.isnan(x), -np.inf, x)
+    if bounds.size * int(lengths.max()) <= _MAX_PADDING_FACTOR * n:
+        columns = np.arange(n) - bounds[ids]
+        padded = np.full((bounds.size, int(lengths.max())), -np.inf)
+        padded[ids, columns] = filled
+        np.maximum.accumulate(padded, axis=1, out=padded)
+        out[:] = padded[ids, columns]
+    else:
+        # Offsetting integer ranks by segment keeps earlier segments from leaking in.
+        order = np.argsort(filled, kind="stable")
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[order] = np.arange(n)
+        offset = ids.astype(np.int64) * n
+        best = np.maximum.accumulate(ranks + offset) - offset
+        out[:] = filled[order][best]
+    out[np.isneginf(out)] = np.nan
+
+
+def segmented_cummax(values: object, starts: object, out: FloatArray | None = None) -> FloatArray:
+    """Running maximum that restarts at every segment start, ignoring ``NaN``."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    if x.size:
+        _segmented_running_max(x, np.asarray(starts, dtype=np.intp), result)
+    return result
+
+
+def segmented_cummin(values: object, starts: object, out: FloatArray | None = None) -> FloatArray:
+    """Running minimum that restarts at every segment start, ignoring ``NaN``."""
+
+    x = _as_float(values)
+    result = _prepare_out(out, x.size)
+    if x.size:
+        _segmented_running_max(-x, np.asarray(starts, dtype=np.intp), result)
+        np.negative(result, out=result)
+    return result
+
+
+def session_vwap(
+    high: object,
+    low: object,
+    close: object,
+    volume: object,
+    starts: object,
+    out: FloatArray | None = None,
+) -> FloatArray:
+    """VWAP of the typical price re-anchored at every session start."""
+
+    price = _as_float(high) + _as_float(low)
+    price += _as_float(close)
+    price /= 3
+    vol = _as_float(volume)
+    price *= vol
+    bounds = np.asarray(starts, dtype=np.intp)
+    result = segmented_cumsum(price, bounds, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(result, segmented_cumsum(vol, bounds, out=price), out=result)
+    return result
+
+
+def opening_range(
+    high: object,
+    low: object,
+    elapsed: object,
+    length: float,
+    starts: object,
+    out: tuple[FloatArray, FloatArray] | None = None,
+) -> tuple[FloatArray, FloatArray]:
+    """Return ``(range_high, range_low)`` of the first ``length`` of every session.
+
+    ``elapsed`` holds the time since the session's first bar in the same unit as
+    ``length``. Bars inside the opening window are ``NaN`` so the range is only
+    visible once it is complete.
+    """
+
+    h = _as_float(high)
+    lo = _as_float(low)
+    n = h.size
+    high_out, low_out = out if out is not None else (None, None)
+    range_high = _prepare_out(high_out, n)
+    range_low = _prepare_out(low_out, n)
+    if n == 0:
+        return range_high, range_low
+    bounds = np.asarray(starts, dtype=np.intp)
+    in_range = np.asarray(elapsed) < length
+    ids = segment_ids(bounds, n)
+    with np.errstate(invalid="ignore"):
+        session_high = np.fmax.reduceat(np.where(in_range, h, np.nan), bounds)
+        session_low = np.fmin.reduceat(np.where(in_range, lo, np.nan), bounds)
+    np.take(session_high, ids, out=range_high)
+    np.take(session_low, ids, out=range_low)
+    range_high[in_range] = np.nan
+    range_low[in_range] = np.nan
+    return range_high, range_low
+
+
+__all__ = [
+    "NS_PER_DAY",
+    "bollinger_bands",
+    "ema",
+    "macd",
+    "opening_range",
+    "rsi",
+    "segment_ids",
+    "segmented_cummax",
+    "segmented_cummin",
+    "segmented_cumsum",
+    "session_starts",
+    "session_vwap",
+    "sma",
+    "vwap",
+]
@@ -0,0 +1,334 @@
+"""Incremental indicators updated in constant time per bar.
+
+Each class mirrors a function of :mod:`trading_bot.indicators.ta`: feeding the values
+of a series one at a time through :meth:`update` yields the same numbers as the
+vectorized function over the whole series (up to floating point round-off). They are
+used by the live runtime so a new bar does not re-process the full history. ``prime``
+sets the state :meth:`update` would reach over an array of past values with array
+operations instead.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from . import kernels
+
+NAN = float("nan")
+
+
+class RollingWindow:
+    """Ring buffer with running sum/sum of squares and pandas ``min_periods`` semantics.
+
+    Sums are taken relative to a reference value and rebuilt from the buffer once per
+    ``window`` updates, which keeps round-off bounded at amortised O(1) cost.
+    """
+
+    __slots__ = ("_buffer", "_count", "_missing", "_pos", "_ref", "_since_rebuild", "_sq", "_sum")
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self._buffer = np.zeros(window, dtype=np.float64)
+        self._pos = 0
+        self._count = 0
+        self._missing = 0
+        self._ref = NAN
+        self._sum = 0.0
+        self._sq = 0.0
+        self._since_rebuild = 0
+
+    @property
+    def window(self) -> int:
+        return self._buffer.size
+
+    def push(self, value: float) -> None:
+        window = self._buffer.size
+        old = float(self._buffer[self._pos]) if self._count == window else None
+        self._buffer[self._pos] = value
+        self._pos = (self._pos + 1) % window
+        if old is None:
+            self._count += 1
+        else:
+            self._remove(old)
+        self._add(value)
+        self._since_rebuild += 1
+        if self._since_rebuild >= window:
+            self._rebuild()
+
+    def prime(self, values: np.ndarray) -> None:
+        """State after pushing every value of ``values`` into a fresh window."""
+
+        window = self._buffer.size
+        count = min(values.size, window)
+        self._buffer[:] = 0.0
+        self._buffer[np.arange(values.size - count, values.size) % window] = values[
+            values.size - count :
+        ]
+        self._pos = values.size % window
+        self._count = count
+        self._rebuild()
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            self._missing += 1
+            return
+        if self._ref != self._ref:
+            self._ref = value
+        shifted = value - self._ref
+        self._sum += shifted
+        self._sq += shifted * shifted
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            self._missing -= 1
+            return
+        shifted = value - self._ref
+        self._sum -= shifted
+        self._sq -= shifted * shifted
+
+    def _rebuild(self) -> None:
+        values = self._buffer[: self._count]
+        finite = values[~np.isnan(values)]
+        self._missing = int(values.size - finite.size)
+        self._ref = float(finite[0]) if finite.size else NAN
+        shifted = finite - self._ref if finite.size else finite
+        self._sum = float(shifted.sum())
+        self._sq = float((shifted * shifted).sum())
+        self._since_rebuild = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._count == self._buffer.size and self._missing == 0
+
+    def mean(self) -> float:
+        if not self.ready:
+            return NAN
+        return self._ref + self._sum / self._buffer.size
+
+    def std(self) -> float:
+        window = self._buffer.size
+        if not self.ready or window < 2:
+            return NAN
+        var = (self._sq - self._sum * self._sum / window) / (window - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class SMA:
+    """Incremental :func:`trading_bot.indicators.ta.sma`."""
+
+    __slots__ = ("_window", "value")
+
+    def __init__(self, window: int) -> None:
+        self._window = RollingWindow(window)
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._window.push(x)
+        self.value = self._window.mean()
+        return self.value
+
+    def prime(self, values: np.ndarray) -> None:
+        self._window.prime(values)
+        self.value = self._window.mean()
+
+
+class EMA:
+    """Incremental :func:`trading_bot.indicators.ta.ema` (``adjust=False``)."""
+
+    __slots__ = ("_alpha", "_com", "_old_wt", "_span", "value")
+
+    def __init__(self, window: int) -> None:
+        self._span = window
+        self._alpha = 2.0 / (window + 1.0)
+        self._com = (1.0 - self._alpha) / self._alpha
+        self._old_wt = 1.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        # Mirrors pandas' ewm recursion, including its weighting across NaN gaps.
+        weighted = self.value
+        if weighted != weighted:
+            if x == x:
+                self.value = x
+            return self.value
+        new_wt = self._alpha
+        self._old_wt *= 1.0 - self._alpha
+        if self._com == 1:
+            new_wt = 1.0 - self._old_wt
+        if x == x:
+            if weighted != x:
+                self.value = (self._old_wt * weighted + new_wt * x) / (self._old_wt + new_wt)
+            self._old_wt = 1.0
+        return self.value
+
+    def prime(self, values: np.ndarray) -> np.ndarray:
+        """Set the state after ``values`` and return the EMA of each of them."""
+
+        line = kernels.ema(values, self._span)
+        observed = np.flatnonzero(~np.isnan(values))
+        self.value = float(line[-1]) if observed.size else NAN
+        # Every NaN after the last observation decays the old weight once.
+        gap = values.size - 1 - int(observed[-1]) if observed.size else 0
+        self._old_wt = (1.0 - self._alpha) ** gap
+        return line
+
+
+class RSI:
+    """Incremental :func:`trading_bot.indicators.ta.rsi`."""
+
+    __slots__ = ("_gain", "_loss", "_prev", "value")
+
+    def __init__(self, window: int = 14) -> None:
+        self._gain = RollingWindow(window)
+        self._loss = RollingWindow(window)
+        self._prev: float | None = None
+        self.value = 50.0
+
+    def update(self, x: float) -> float:
+        delta = NAN if self._prev is None else x - self._prev
+        self._prev = x
+        self._gain.push(delta if delta > 0 else 0.0)
+        self._loss.push(-delta if delta < 0 else 0.0)
+        return self._refresh()
+
+    def prime(self, values: np.ndarray) -> None:
+        if not values.size:
+            return
+        delta = np.empty_like(values)
+        delta[0] = NAN
+        np.subtract(values[1:], values[:-1], out=delta[1:])
+        self._gain.prime(np.where(delta > 0, delta, 0.0))
+        self._loss.prime(np.where(delta < 0, -delta, 0.0))
+        self._prev = float(values[-1])
+        self._refresh()
+
+    def _refresh(self) -> float:
+        gain = self._gain.mean()
+        loss = self._loss.mean()
+        if gain != gain or loss != loss or (gain == 0 and loss == 0):
+            self.value = 50.0
+        elif loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+        return self.value
+
+
+class MACD:
+    """Incremental :func:`trading_bot.indicators.ta.macd`."""
+
+    __slots__ = ("_fast", "_signal", "_slow", "histogram", "macd", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+        self.macd = NAN
+        self.signal = NAN
+        self.histogram = NAN
+
+    def update(self, x: float) -> tuple[float, float, float]:
+        self.macd = self._fast.update(x) - self._slow.update(x)
+        self.signal = self._signal.update(self.macd)
+        self.histogram = self.macd - self.signal
+        return self.macd, self.signal, self.histogram
+
+    def prime(self, values: np.ndarray) -> None:
+        line = self._fast.prime(values)
+        line -= self._slow.prime(values)
+        self._signal.prime(line)
+        self.macd = self._fast.value - self._slow.value
+        self.signal = self._signal.value
+        self.histogram = self.macd - self.signal
+
+
+class BollingerBands:
+    """Incremental :func:`trading_bot.indicators.ta.bollinger_bands`."""
+
+    __slots__ = ("_num_std", "_window", "lower", "mid", "upper")
+
+    def __init__(self, window: int = 20, num_std: float = 2.0) -> None:
+        self._window = RollingWindow(window)
+        self._num_std = num_std
+        self.mid = NAN
+        self.upper = NAN
+        self.lower = NAN
+
+    def update(self, x: float) -> tuple[float, float, float]:
+        self._window.push(x)
+        return self._refresh()
+
+    def prime(self, values: np.ndarray) -> None:
+        self._window.prime(values)
+        self._refresh()
+
+    def _refresh(self) -> tuple[float, float, float]:
+        self.mid = self._window.mean()
+        width = self._num_std * self._window.std()
+        self.upper = self.mid + width
+        self.lower = self.mid - width
+        return self.mid, self.upper, self.lower
+
+
+class VWAP:
+    """Incremental VWAP; ``update`` with a new ``session`` key restarts the average.
+
+    Pass a constant session (the default) for :func:`~trading_bot.indicators.ta.vwap`
+    or the bar's trading day for :func:`~trading_bot.indicators.ta.session_vwap`.
+    """
+
+    __slots__ = ("_session", "_volume", "_weighted", "value")
+
+    def __init__(self) -> None:
+        self._session: object = None
+        self._weighted = 0.0
+        self._volume = 0.0
+        self.value = NAN
+
+    def update(
+        self, high: float, low: float, close: float, volume: float, session: object = None
+    ) -> float:
+        if session != self._session:
+            self._session = session
+            self._weighted = 0.0
+            self._volume = 0.0
+        price = (high + low + close) / 3
+        weighted = price * volume
+        if weighted == weighted:
+            self._weighted += weighted
+        if volume == volume:
+            self._volume += volume
+        return self._refresh(weighted, volume)
+
+    def prime(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        session: object = None,
+    ) -> None:
+        """State after the bars of the current ``session`` (all of them belong to it)."""
+
+        if not volume.size:
+            return
+        weighted = (high + low + close) / 3 * volume
+        self._session = session
+        self._weighted = float(np.nansum(weighted))
+        self._volume = float(np.nansum(volume))
+        self._refresh(float(weighted[-1]), float(volume[-1]))
+
+    def _refresh(self, weighted: float, volume: float) -> float:
+        if weighted != weighted or volume != volume:
+            self.value = NAN
+        elif self._volume == 0:
+            self.value = NAN if self._weighted == 0 else math.copysign(math.inf, self._weighted)
+        else:
+            self.value = self._weighted / self._volume
+        return self.value
+
+
+__all__ = ["EMA", "MACD", "RSI", "SMA", "VWAP", "BollingerBands", "RollingWindow"]
@@ -1,64 +1,141 @@
-"""Technical indicators implemented with pandas/numpy."""
+"""Technical indicators implemented with pandas/numpy.
+
+The functions here accept and return pandas objects; the arithmetic is delegated to
+the ndarray kernels in :mod:`trading_bot.indicators.kernels`.
+"""
 
 from __future__ import annotations
 
 import numpy as np
 import pandas as pd
 
+from . import kernels
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
 
 def sma(series: pd.Series, window: int) -> pd.Series:
     """Simple moving average."""
 
-    return series.rolling(window=window, min_periods=window).mean()
+    return pd.Series(kernels.sma(_values(series), window), index=series.index, name=series.name)
 
 
 def ema(series: pd.Series, window: int) -> pd.Series:
     """Exponential moving average."""
 
-    return series.ewm(span=window, adjust=False).mean()
+    return pd.Series(kernels.ema(_values(series), window), index=series.index, name=series.name)
 
 
 def rsi(series: pd.Series, window: int = 14) -> pd.Series:
     """Relative Strength Index."""
 
-    delta = series.diff()
-    gain = np.where(delta > 0, delta, 0.0)
-    loss = np.where(delta < 0, -delta, 0.0)
-    avg_gain = pd.Series(gain, index=series.index).rolling(window=window, min_periods=window).mean()
-    avg_loss = pd.Series(loss, index=series.index).rolling(window=window, min_periods=window).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.fillna(50.0)
+    return pd.Series(kernels.rsi(_values(series), window), index=series.index)
 
 
 def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
     """Moving Average Convergence Divergence."""
 
-    ema_fast = ema(series, fast)
-    ema_slow = ema(series, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = ema(macd_line, signal)
-    histogram = macd_line - signal_line
-    return pd.DataFrame({"macd": macd_line, "signal": signal_line, "histogram": histogram})
+    macd_line, signal_line, histogram = kernels.macd(_values(series), fast, slow, signal)
+    return pd.DataFrame(
+        {"macd": macd_line, "signal": signal_line, "histogram": histogram},
+        index=series.index,
+    )
 
 
 def bollinger_bands(series: pd.Series, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
     """Bollinger Bands."""
 
-    mid = sma(series, window)
-    std = series.rolling(window=window, min_periods=window).std()
-    upper = mid + num_std * std
-    lower = mid - num_std * std
-    return pd.DataFrame({"mid": mid, "upper": upper, "lower": lower})
+    mid, upper, lower = kernels.bollinger_bands(_values(series), window, num_std)
+    return pd.DataFrame({"mid": mid, "upper": upper, "lower": lower}, index=series.index)
 
 
 def vwap(df: pd.DataFrame) -> pd.Series:
     """Volume weighted average price."""
 
-    price = (df["high"] + df["low"] + df["close"]) / 3
-    cumulative = (price * df["volume"]).cumsum()
-    vol = df["volume"].cumsum()
-    return cumulative / vol
-
-
-__all__ = ["bollinger_bands", "ema", "macd", "rsi", "sma", "vwap"]
+    values = kernels.vwap(
+        _values(df["high"]), _values(df["low"]), _values(df["close"]), _values(df["volume"])
+    )
+    return pd.Series(values, index=df.index)
+
+
+def _wall_clock_ns(index: pd.Index) -> np.ndarray | None:
+    if not isinstance(index, pd.DatetimeIndex):
+        return None
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def session_starts(index: pd.Index, anchor: str | None = None) -> np.ndarray:
+    """Positions where a new trading session starts.
+
+    Sessions follow the calendar day of the index's own timezone. ``anchor`` (e.g.
+    ``"09:30"``) moves the boundary so earlier bars count towards the previous
+    session. Non-datetime indexes form a single session.
+    """
+
+    stamps = _wall_clock_ns(index)
+    if stamps is None:
+        return np.zeros(1 if len(index) else 0, dtype=np.intp)
+    anchor_ns = pd.Timedelta(f"{anchor}:00").value if anchor else 0
+    return kernels.session_starts(stamps, anchor_ns)
+
+
+def session_vwap(df: pd.DataFrame, anchor: str | None = None) -> pd.Series:
+    """Volume weighted average price that resets at every session start."""
+
+    values = kernels.session_vwap(
+        _values(df["high"]),
+        _values(df["low"]),
+        _values(df["close"]),
+        _values(df["volume"]),
+        session_starts(df.index, anchor),
+    )
+    return pd.Series(values, index=df.index)
+
+
+def session_high_low(df: pd.DataFrame, anchor: str | None = None) -> pd.DataFrame:
+    """Running high and low of the current session."""
+
+    starts = session_starts(df.index, anchor)
+    return pd.DataFrame(
+        {
+            "session_high": kernels.segmented_cummax(_values(df["high"]), starts),
+            "session_low": kernels.segmented_cummin(_values(df["low"]), starts),
+        },
+        index=df.index,
+    )
+
+
+def opening_range(df: pd.DataFrame, minutes: int = 30, anchor: str | None = None) -> pd.DataFrame:
+    """High/low of the first ``minutes`` of each session, published once complete."""
+
+    starts = session_starts(df.index, anchor)
+    stamps = _wall_clock_ns(df.index)
+    if stamps is None:
+        raise TypeError("opening_range requires a DatetimeIndex")
+    elapsed = stamps - stamps[starts][kernels.segment_ids(starts, len(stamps))]
+    range_high, range_low = kernels.opening_range(
+        _values(df["high"]),
+        _values(df["low"]),
+        elapsed,
+        pd.Timedelta(minutes=minutes).value,
+        starts,
+    )
+    return pd.DataFrame({"or_high": range_high, "or_low": range_low}, index=df.index)
+
+
+__all__ = [
+    "bollinger_bands",
+    "ema",
+    "macd",
+    "opening_range",
+    "rsi",
+    "session_high_low",
+    "session_starts",
+    "session_vwap",
+    "sma",
+    "vwap",
+]
@@ -0,0 +1,65 @@
+"""Compact binary checkpoints of live runtime state."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+log = structlog.get_logger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers only ever see a complete file."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    """Encodes runtime state with a configuration fingerprint and persists it atomically.
+
+    A checkpoint written under a different fingerprint (strategy, parameters, window or
+    bar size) is ignored on load rather than restored into incompatible state.
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+
+    def encode(self, state: dict[str, Any]) -> bytes:
+        envelope = {"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "state": state}
+        return pickle.dumps(envelope, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save(self, data: bytes) -> None:
+        write_atomic(self.path, data)
+
+    def load(self) -> dict[str, Any] | None:
+        if not self.path.exists():
+            return None
+        try:
+            # Only files written by :meth:`save` are read back.
+            envelope = pickle.loads(self.path.read_bytes())  # noqa: S301
+        except Exception as exc:
+            log.warning("live.checkpoint_unreadable", path=str(self.path), error=str(exc))
+            return None
+        if (
+            envelope.get("version") != CHECKPOINT_VERSION
+            or envelope.get("fingerprint") != self.fingerprint
+        ):
+            log.warning("live.checkpoint_mismatch", path=str(self.path))
+            return None
+        return envelope["state"]
+
+
+__all__ = ["CHECKPOINT_VERSION", "Checkpointer", "write_atomic"]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import os
 import time
 from typing import Any
@@ -9,10 +11,14 @@ from typing import Any
 import requests
 import structlog
 
+from .metrics import Histogram, LiveMetrics
+
 log = structlog.get_logger(__name__)
 
 DEFAULT_RETRIES = 3
 DEFAULT_BACKOFF = 2.0
+DEFAULT_QUEUE_SIZE = 1000
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord's per-message embed limit
 
 
 def build_embed(signal: str, ticker: str, payload: dict[str, Any]) -> dict[str, Any]:
@@ -32,6 +38,26 @@ def build_embed(signal: str, ticker: str, payload: dict[str, Any]) -> dict[str,
     }
 
 
+def _resolve_url(webhook_url: str | None) -> str:
+    url = webhook_url or os.environ.get("DISCORD_WEBHOOK_URL")
+    if not url:
+        raise RuntimeError("DISCORD_WEBHOOK_URL is not configured")
+    return url
+
+
+def _retry_delay(response: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying, preferring Discord's rate-limit hint on 429."""
+
+    if response.status_code == 429:
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            header = response.headers.get("Retry-After")
+            if header is not None:
+                return float(header)
+    return DEFAULT_BACKOFF**attempt
+
+
 def send_alert(
     signal: str,
     ticker: str,
@@ -41,10 +67,7 @@ def send_alert(
 ) -> None:
     """Send an alert to Discord with retries."""
 
-    url = webhook_url or os.environ.get("DISCORD_WEBHOOK_URL")
-    if not url:
-        raise RuntimeError("DISCORD_WEBHOOK_URL is not configured")
-
+    url = _resolve_url(webhook_url)
     body = {"embeds": [build_embed(signal, ticker, payload)]}
 
     for attempt in range(1, retries + 1):
@@ -58,8 +81,118 @@ def send_alert(
             body=response.text,
             attempt=attempt,
         )
-        time.sleep(DEFAULT_BACKOFF ** attempt)
+        time.sleep(_retry_delay(response, attempt))
     response.raise_for_status()
 
 
-__all__ = ["build_embed", "send_alert"]
+class AlertDispatcher:
+    """Non-blocking alert sink backed by a bounded queue and a background sender.
+
+    :meth:`submit` never waits: embeds are queued (or dropped and counted when the queue
+    is full) and a task started by :meth:`start` posts them over one pooled
+    ``requests.Session`` in a worker thread, packing up to ten embeds per webhook call.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str | None = None,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.webhook_url = webhook_url
+        self.retries = retries
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self._session = session or requests.Session()
+        self._task: asyncio.Task[None] | None = None
+        self._url: str | None = None
+        self._latency: Histogram | None = None
+
+    def register_metrics(self, metrics: LiveMetrics) -> None:
+        self._latency = metrics.stage("alert")
+        metrics.register(
+            "live_alerts_total",
+            "counter",
+            "Alert embeds by outcome",
+            lambda: {"sent": self.sent, "failed": self.failed, "dropped": self.dropped},
+            label="outcome",
+        )
+        metrics.register(
+            "live_alert_queue_depth", "gauge", "Alerts waiting to be sent", self._queue.qsize
+        )
+
+    def submit(self, signal: str, ticker: str, payload: dict[str, Any]) -> bool:
+        """Queue an alert; returns ``False`` when it was dropped because the queue is full."""
+
+        try:
+            self._queue.put_nowait(build_embed(signal, ticker, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            log.warning("discord.alert_dropped", ticker=ticker, dropped=self.dropped)
+            return False
+        return True
+
+    async def start(self) -> None:
+        self._url = _resolve_url(self.webhook_url)
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Flush queued alerts (up to ``timeout`` seconds) and stop the sender."""
+
+        if self._task is not None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue.join(), timeout)
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._session.close()
+
+    async def _drain(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < MAX_EMBEDS_PER_MESSAGE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            started = time.perf_counter()
+            try:
+                await self._post(batch)
+            finally:
+                if self._latency is not None:
+                    self._latency.observe(time.perf_counter() - started)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _post(self, embeds: list[dict[str, Any]]) -> None:
+        assert self._url is not None
+        for attempt in range(1, self.retries + 1):
+            try:
+                response = await asyncio.to_thread(
+                    self._session.post, self._url, json={"embeds": embeds}, timeout=10
+                )
+            except requests.RequestException as exc:
+                log.warning("discord.alert_failed", error=str(exc), attempt=attempt)
+                await asyncio.sleep(DEFAULT_BACKOFF**attempt)
+                continue
+            if response.status_code < 300:
+                self.sent += len(embeds)
+                log.info("discord.alert_sent", embeds=len(embeds))
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    # Bucket exhausted: wait it out instead of collecting a 429.
+                    await asyncio.sleep(float(response.headers.get("X-RateLimit-Reset-After", 0)))
+                return
+            log.warning(
+                "discord.alert_failed",
+                status=response.status_code,
+                body=response.text,
+                attempt=attempt,
+            )
+            await asyncio.sleep(_retry_delay(response, attempt))
+        self.failed += len(embeds)
+        log.error("discord.alert_gave_up", embeds=len(embeds))
+
+
+__all__ = ["AlertDispatcher", "build_embed", "send_alert"]
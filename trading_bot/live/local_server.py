@@ -0,0 +1,249 @@
+"""Local stand-in for Polygon's aggregate WebSocket feed.
+
+The server speaks enough of Polygon's protocol for ``polygon.WebSocketClient``: a
+``connected`` status on connect, ``auth_success`` for any key, subscription
+acknowledgements, then JSON arrays of ``"A"`` aggregate events for the subscribed
+tickers. Events come from cached frames or a synthetic random walk and are sent at a
+configurable rate, so the live path can be load-tested without a Polygon connection::
+
+    async with LocalPolygonServer(synthetic_events(["SPY", "QQQ"]), rate=20_000) as server:
+        streamer = AggregateStreamer(
+            ["SPY", "QQQ"], api_key="local", feed=server.feed, secure=False
+        )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import structlog
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+log = structlog.get_logger(__name__)
+
+MINUTE_MS = 60_000
+
+
+def _event(
+    symbol: str,
+    start_ms: int,
+    o: float,
+    h: float,
+    low: float,
+    c: float,
+    v: float,
+    vwap: float,
+    cadence_ms: int,
+) -> dict[str, Any]:
+    return {
+        "ev": "A",
+        "sym": symbol,
+        "v": v,
+        "av": v,
+        "op": o,
+        "vw": vwap,
+        "o": o,
+        "c": c,
+        "h": h,
+        "l": low,
+        "a": vwap,
+        "z": 100,
+        "s": start_ms,
+        "e": start_ms + cadence_ms,
+    }
+
+
+def synthetic_events(
+    tickers: Sequence[str],
+    count: int | None = None,
+    start_ms: int | None = None,
+    cadence_ms: int = MINUTE_MS,
+    seed: int = 0,
+) -> Iterator[dict[str, Any]]:
+    """Random-walk aggregate events, one per ticker per bar (``count`` bars, or endless)."""
+
+    rng = np.random.default_rng(seed)
+    start_ms = start_ms if start_ms is not None else int(time.time() * 1000)
+    prices = np.full(len(tickers), 100.0)
+    bars = range(count) if count is not None else itertools.count()
+    for bar in bars:
+        prices *= np.exp(rng.normal(0, 0.001, len(tickers)))
+        for symbol, close in zip(tickers, prices.tolist(), strict=True):
+            yield _event(
+                symbol,
+                start_ms + bar * cadence_ms,
+                close,
+                close * 1.0005,
+                close * 0.9995,
+                close,
+                1_000.0,
+                close,
+                cadence_ms,
+            )
+
+
+def frame_events(
+    frames: Mapping[str, pd.DataFrame], cadence_ms: int = MINUTE_MS
+) -> Iterator[dict[str, Any]]:
+    """Aggregate events for cached bars of several tickers, in time order."""
+
+    columns = ["open", "high", "low", "close", "volume", "vwap"]
+    merged: list[tuple[int, str, list[float]]] = []
+    for symbol, frame in frames.items():
+        values = frame.reindex(columns=columns).to_numpy(dtype=np.float64, na_value=np.nan)
+        values[:, 5] = np.where(np.isnan(values[:, 5]), values[:, 3], values[:, 5])
+        start_ms = frame.index.as_unit("ms").asi8.tolist()
+        merged.extend((ms, symbol, row) for ms, row in zip(start_ms, values.tolist(), strict=True))
+    merged.sort(key=lambda item: item[0])
+    for ms, symbol, (o, h, low, c, v, vwap) in merged:
+        yield _event(symbol, ms, o, h, low, c, v, vwap, cadence_ms)
+
+
+class LocalPolygonServer:
+    """Serve aggregate ``events`` over WebSocket on ``host:port`` (``port=0`` picks one).
+
+    ``rate`` caps events per second (``None`` sends as fast as the socket allows);
+    events go out in JSON arrays of up to ``batch`` events, like Polygon's own frames.
+    With ``stamp_send_time`` each event's ``s``/``e`` carry the send time in epoch ms, so a
+    client can measure ingest latency. ``drop_after`` closes each connection abnormally
+    once it has been sent that many events, which makes the client reconnect, and
+    ``drop_gap`` then discards that many events as if they were published during the
+    outage. All connections draw from the same event iterator, so a reconnecting client
+    resumes where the previous connection stopped.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate: float | None = None,
+        batch: int = 100,
+        stamp_send_time: bool = False,
+        drop_after: int | None = None,
+        drop_gap: int = 0,
+    ) -> None:
+        self.events = iter(events)
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.batch = batch
+        self.stamp_send_time = stamp_send_time
+        self.drop_after = drop_after
+        self.drop_gap = drop_gap
+        self.sent = 0
+        self.connections = 0
+        self._server: Server | None = None
+
+    @property
+    def feed(self) -> str:
+        """Value for the streamer's ``feed`` (host and port) with ``secure=False``."""
+
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("local_feed.start", feed=self.feed, rate=self.rate)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            log.info("local_feed.stop", sent=self.sent, connections=self.connections)
+
+    async def __aenter__(self) -> LocalPolygonServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.close()
+
+    # ------------------------------------------------------------------
+    async def _handle(self, connection: ServerConnection) -> None:
+        self.connections += 1
+        await _send_status(connection, "connected", "Connected Successfully")
+        subscribed: set[str] = set()
+        sender: asyncio.Task[None] | None = None
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                action = message.get("action")
+                params = str(message.get("params", ""))
+                if action == "auth":
+                    await _send_status(connection, "auth_success", "authenticated")
+                elif action in {"subscribe", "unsubscribe"}:
+                    topics = {topic.strip() for topic in params.split(",") if topic.strip()}
+                    symbols = {topic.split(".", 1)[-1] for topic in topics}
+                    if action == "subscribe":
+                        subscribed |= symbols
+                    else:
+                        subscribed -= symbols
+                    for topic in sorted(topics):
+                        await _send_status(connection, "success", f"{action}d to: {topic}")
+                    if sender is None and subscribed:
+                        sender = asyncio.create_task(self._stream(connection, subscribed))
+        except ConnectionClosed:
+            pass
+        finally:
+            if sender is not None:
+                sender.cancel()
+
+    async def _stream(self, connection: ServerConnection, subscribed: set[str]) -> None:
+        started = time.perf_counter()
+        sent = 0
+        while True:
+            if self.drop_after is not None and sent >= self.drop_after:
+                for _ in itertools.islice(self.events, self.drop_gap):
+                    pass
+                await connection.close(code=1011, reason="local feed dropped the connection")
+                return
+            size = (
+                self.batch if self.drop_after is None else min(self.batch, self.drop_after - sent)
+            )
+            batch: list[dict[str, Any]] = []
+            for event in self.events:
+                if "*" in subscribed or event["sym"] in subscribed:
+                    batch.append(event)
+                    if len(batch) >= size:
+                        break
+            if not batch:
+                return
+            if self.rate is not None:
+                delay = started + (sent + len(batch)) / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if self.stamp_send_time:
+                stamp = int(time.time() * 1000)
+                for event in batch:
+                    event["s"] = event["e"] = stamp
+            try:
+                await connection.send(json.dumps(batch))
+            except ConnectionClosed:
+                return
+            sent += len(batch)
+            self.sent += len(batch)
+            await asyncio.sleep(0)
+
+
+async def _send_status(connection: ServerConnection, status: str, message: str) -> None:
+    await connection.send(json.dumps([{"ev": "status", "status": status, "message": message}]))
+
+
+__all__ = ["LocalPolygonServer", "frame_events", "synthetic_events"]
@@ -0,0 +1,231 @@
+"""Low-overhead live pipeline metrics with a Prometheus text endpoint.
+
+Only latencies are pushed (one ``bisect`` per observation into fixed buckets); counters
+and gauges are read from the components that already keep them, at scrape or summary
+time, so the hot path pays nothing for them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+import structlog
+
+log = structlog.get_logger(__name__)
+
+MetricKind = Literal["counter", "gauge"]
+Reading = float | Mapping[str, float]
+
+
+def _decades(low: int, high: int) -> tuple[float, ...]:
+    return tuple(m * 10.0**e for e in range(low, high) for m in (1.0, 2.5, 5.0))
+
+
+STAGE_BUCKETS = _decades(-6, 2)  # 1us .. 50s
+LAG_BUCKETS = _decades(-2, 4)  # 10ms .. 5000s; the delayed feed sits around 900s
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a ``bisect`` and three additions."""
+
+    __slots__ = ("bounds", "count", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = STAGE_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``nan`` when empty)."""
+
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+@dataclass(slots=True)
+class _Registered:
+    kind: MetricKind
+    help: str
+    read: Callable[[], Reading]
+    label: str | None
+
+
+class LiveMetrics:
+    """Stage latency histograms, feed lag, and registered counters/gauges.
+
+    Components contribute their own counters through :meth:`register`, typically from a
+    ``register_metrics(metrics)`` method the runtime calls when present.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, Histogram] = {}
+        self.feed_lag = Histogram(LAG_BUCKETS)
+        self.bars_per_second = 0.0
+        self._registered: dict[str, _Registered] = {}
+
+    def stage(self, name: str) -> Histogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = Histogram()
+        return histogram
+
+    def register(
+        self,
+        name: str,
+        kind: MetricKind,
+        help: str,
+        read: Callable[[], Reading],
+        label: str | None = None,
+    ) -> None:
+        """Expose ``read()`` as ``name``; a mapping result becomes one series per ``label``."""
+
+        self._registered[name] = _Registered(kind, help, read, label)
+
+    def values(self) -> dict[str, Reading]:
+        return {name: metric.read() for name, metric in self._registered.items()}
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+
+        lines: list[str] = []
+        if self.stages:
+            lines += _help("live_stage_seconds", "histogram", "Time spent per pipeline stage")
+            for name, histogram in self.stages.items():
+                lines += _histogram_lines("live_stage_seconds", histogram, f'stage="{name}"')
+        lines += _help("live_feed_lag_seconds", "histogram", "Wall clock minus bar start time")
+        lines += _histogram_lines("live_feed_lag_seconds", self.feed_lag, "")
+        lines += _help("live_bars_per_second", "gauge", "Bars evaluated per second, last interval")
+        lines.append(f"live_bars_per_second {_number(self.bars_per_second)}")
+        for name, metric in self._registered.items():
+            lines += _help(name, metric.kind, metric.help)
+            reading = metric.read()
+            if isinstance(reading, Mapping):
+                lines += [
+                    f'{name}{{{metric.label}="{key}"}} {_number(value)}'
+                    for key, value in reading.items()
+                ]
+            else:
+                lines.append(f"{name} {_number(reading)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict[str, object]:
+        """Compact view for the periodic log line: p50/p99 per stage plus all values."""
+
+        summary: dict[str, object] = {
+            f"{name}_p50_p99_ms": (
+                round(histogram.quantile(0.5) * 1e3, 3),
+                round(histogram.quantile(0.99) * 1e3, 3),
+            )
+            for name, histogram in self.stages.items()
+        }
+        summary["feed_lag_p50_s"] = self.feed_lag.quantile(0.5)
+        summary.update(self.values())
+        return summary
+
+
+def _help(name: str, kind: str, text: str) -> list[str]:
+    return [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str) -> list[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts, strict=False):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total!r}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+class MetricsServer:
+    """Minimal HTTP endpoint serving :meth:`LiveMetrics.render` on every request."""
+
+    def __init__(self, metrics: LiveMetrics, host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("metrics.listening", url=f"http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Read and ignore the request line and headers; every path gets the metrics.
+            while (await reader.readline()).strip():
+                pass
+            body = self.metrics.render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def log_summaries(metrics: LiveMetrics, interval: float, bars: Callable[[], int]) -> None:
+    """Every ``interval`` seconds update ``bars_per_second`` and log a summary."""
+
+    last_bars, last_time = bars(), time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        now, count = time.perf_counter(), bars()
+        metrics.bars_per_second = (count - last_bars) / (now - last_time)
+        last_bars, last_time = count, now
+        log.info(
+            "live.metrics",
+            bars_per_second=round(metrics.bars_per_second, 1),
+            **metrics.summary(),
+        )
+
+
+__all__ = [
+    "LAG_BUCKETS",
+    "STAGE_BUCKETS",
+    "Histogram",
+    "LiveMetrics",
+    "MetricsServer",
+    "log_summaries",
+]
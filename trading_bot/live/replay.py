@@ -0,0 +1,169 @@
+"""Replay cached bars through the live runtime at accelerated speed."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from trading_bot.backtest.engine import BacktestEngine
+from trading_bot.config import Config
+from trading_bot.data.bars import BarRecord, frame_to_bars
+
+from .signal_runtime import LiveSignalRuntime
+from .sinks import NullAlertSink
+
+log = structlog.get_logger(__name__)
+
+
+def parse_speed(text: str) -> float | None:
+    """``"1000x"`` -> ``1000.0``; ``"max"`` -> ``None`` (no pacing)."""
+
+    text = text.strip().lower()
+    if text == "max":
+        return None
+    factor = float(text.removesuffix("x"))
+    if factor <= 0:
+        raise ValueError("speed must be positive")
+    return factor
+
+
+class ReplayStreamer:
+    """Yields cached bars of several tickers in time order, paced by ``speed``.
+
+    Implements the same ``stream()`` interface as
+    :class:`~trading_bot.live.streamer.AggregateStreamer`. The time between handing out a
+    bar and being asked for the next one is recorded as that bar's processing latency.
+    """
+
+    def __init__(self, frames: Mapping[str, pd.DataFrame], speed: float | None = None) -> None:
+        self.frames = frames
+        self.speed = speed
+        self.latencies: list[float] = []
+
+    async def stream(self) -> AsyncIterator[BarRecord]:
+        bars = heapq.merge(
+            *(frame_to_bars(ticker, frame) for ticker, frame in self.frames.items()),
+            key=lambda bar: bar.start_ms,
+        )
+        first_ms: int | None = None
+        started = time.perf_counter()
+        for count, bar in enumerate(bars, 1):
+            if self.speed is not None:
+                first_ms = bar.start_ms if first_ms is None else first_ms
+                due = started + (bar.start_ms - first_ms) / 1000 / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % 1024 == 0:
+                await asyncio.sleep(0)  # let background tasks run at max speed
+            handed_out = time.perf_counter()
+            yield bar
+            self.latencies.append(time.perf_counter() - handed_out)
+
+
+@dataclass
+class ReplayReport:
+    bars: int
+    seconds: float
+    alerts: int
+    latency_us: dict[str, float]
+    signal_checks: dict[str, bool] = field(default_factory=dict)
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.seconds if self.seconds else float("nan")
+
+    @property
+    def signals_match(self) -> bool:
+        return all(self.signal_checks.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bars": self.bars,
+            "seconds": self.seconds,
+            "bars_per_second": self.bars_per_second,
+            "alerts": self.alerts,
+            "latency_us": self.latency_us,
+            "signal_checks": self.signal_checks,
+        }
+
+
+def _percentiles(latencies: list[float]) -> dict[str, float]:
+    if not latencies:
+        return {}
+    values = np.percentile(np.asarray(latencies) * 1e6, [50, 90, 99, 100])
+    return dict(zip(["p50", "p90", "p99", "max"], values.round(1).tolist(), strict=True))
+
+
+def backtest_transitions(
+    config: Config, frames: Mapping[str, pd.DataFrame]
+) -> dict[str, list[tuple[int, str]]]:
+    """BUY/SELL signal transitions per ticker as produced by :class:`BacktestEngine`."""
+
+    engine = BacktestEngine()
+    expected: dict[str, list[tuple[int, str]]] = {}
+    for ticker, frame in frames.items():
+        signals = engine.run(frame, config, None).signals
+        changes = signals[signals.ne(signals.shift())]
+        changes = changes[changes != "hold"]
+        expected[ticker] = list(
+            zip((changes.index.as_unit("ms").asi8).tolist(), changes.tolist(), strict=True)
+        )
+    return expected
+
+
+async def run_replay(
+    config: Config,
+    frames: Mapping[str, pd.DataFrame],
+    speed: float | None = None,
+    sink: NullAlertSink | None = None,
+    window: int = 1000,
+    verify: bool = True,
+) -> ReplayReport:
+    """Drive :class:`LiveSignalRuntime` with ``frames`` and report throughput and latency.
+
+    With ``verify`` the runtime's alerts are compared with the signal transitions of a
+    backtest over the same bars.
+    """
+
+    sink = sink or NullAlertSink()
+    live = config.live.model_copy(update={"warm_start": False, "checkpoint_path": None})
+    config = config.model_copy(update={"tickers": list(frames), "live": live})
+    streamer = ReplayStreamer(frames, speed)
+    runtime = LiveSignalRuntime(config, window=window, streamer=streamer, alerts=sink)
+    started = time.perf_counter()
+    await runtime.run()
+    seconds = time.perf_counter() - started
+    report = ReplayReport(
+        bars=runtime.bars_processed,
+        seconds=seconds,
+        alerts=len(sink.records),
+        latency_us=_percentiles(streamer.latencies),
+    )
+    if verify:
+        live_alerts: dict[str, list[tuple[int, str]]] = {ticker: [] for ticker in frames}
+        for ticker, signal, stamp in sink.records:
+            live_alerts[ticker].append((pd.Timestamp(stamp).value // 1_000_000, signal))
+        expected = backtest_transitions(config, frames)
+        report.signal_checks = {
+            ticker: live_alerts[ticker] == expected[ticker] for ticker in frames
+        }
+    log.info("live.replay_complete", **report.to_dict())
+    return report
+
+
+__all__ = [
+    "ReplayReport",
+    "ReplayStreamer",
+    "backtest_transitions",
+    "parse_speed",
+    "run_replay",
+]
@@ -3,65 +3,288 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+import contextlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any
 
-import pandas as pd
 import structlog
 
 from trading_bot.config import Config
-from trading_bot.strategies import Signal, create_strategy
+from trading_bot.data.bars import BarBuffer, BarRecord, frame_to_bars
+from trading_bot.data.polygon_source import PolygonDataSource
+from trading_bot.strategies import Signal, Strategy, create_strategy
 
-from .discord import send_alert
-from .streamer import AggregateStreamer
+from .checkpoint import Checkpointer
+from .discord import AlertDispatcher
+from .metrics import LiveMetrics, MetricsServer, log_summaries
+from .sinks import AlertSink
+from .streamer import AggregateStreamer, BarStream
 
 log = structlog.get_logger(__name__)
 
 
+@dataclass(slots=True)
+class TickerState:
+    """Per-ticker evaluation state; ``history`` is only kept for non-streaming strategies."""
+
+    strategy: Strategy
+    streaming: bool
+    history: BarBuffer | None
+    last_signal: Signal | None = None
+    last_ms: int = -1
+
+
 class LiveSignalRuntime:
-    """Consumes live bars, evaluates a strategy, and pushes Discord alerts."""
+    """Consumes live bars for every configured ticker, evaluates a strategy per ticker,
+    and pushes Discord alerts."""
 
     def __init__(
         self,
         config: Config,
         window: int = 1000,
+        streamer: BarStream | None = None,
+        alerts: AlertSink | None = None,
+        source: PolygonDataSource | None = None,
     ) -> None:
         self.config = config
         self.window = window
-        self.strategy = create_strategy(config.strategy.name, **config.strategy.params)
-        self.streamer = AggregateStreamer(config.tickers[0])
-        self.history: deque[pd.Series] = deque(maxlen=window)
-        self.last_signal: Signal | None = None
+        self.source = source
+        self.streamer: BarStream = streamer or AggregateStreamer(
+            config.tickers,
+            max_queue=config.live.queue_size,
+            overflow=config.live.overflow,
+            feed=config.live.feed,
+            secure=config.live.secure,
+            cadence_ms=1_000 if config.bar_size == "1sec" else 60_000,
+            backfill=config.live.backfill,
+            source=source,
+            min_gap=config.live.backfill_min_gap,
+        )
+        self.states: dict[str, TickerState] = {
+            ticker: self._new_state() for ticker in dict.fromkeys(config.tickers)
+        }
+        self.alerts: AlertSink = alerts or AlertDispatcher()
+        path = config.live.checkpoint_path
+        self.checkpointer = Checkpointer(path, self._fingerprint()) if path else None
+        self.bars_processed = 0
+        self.metrics = LiveMetrics()
+        self.metrics.register(
+            "live_bars_total", "counter", "Bars evaluated", lambda: self.bars_processed
+        )
+        for component in (self.streamer, self.alerts):
+            register = getattr(component, "register_metrics", None)
+            if register is not None:
+                register(self.metrics)
+
+    def _new_state(self) -> TickerState:
+        strategy = create_strategy(self.config.strategy.name, **self.config.strategy.params)
+        streaming = strategy.supports_streaming()
+        if streaming:
+            strategy.reset_stream()
+        history = None if streaming else BarBuffer(self.window)
+        return TickerState(strategy, streaming, history)
 
     async def run(self) -> None:
         log.info(
             "live.runtime_start",
-            ticker=self.config.tickers[0],
+            tickers=len(self.states),
             note="Polygon data is 15 minutes delayed per plan",
         )
-        async for bar in self.streamer.stream():
-            self.history.append(bar)
-            df = pd.DataFrame(list(self.history))
-            df.index = [b.name for b in self.history]
-            state = self.strategy.prepare(df)
-            signal, confidence = self.strategy.on_bar(bar, state)
-            if self.last_signal == signal:
-                continue
-            self.last_signal = signal
-            if signal is Signal.HOLD:
-                continue
-            payload = {
-                "Price": f"${bar['close']:.2f}",
-                "Time": bar.name.isoformat(),
-                "Strategy": self.strategy.name,
-                "Params": self.strategy.params,
-                "Confidence": f"{confidence:.2f}",
+        if self.checkpointer is not None:
+            self.restore()
+        if self.config.live.warm_start:
+            await self.warm_start()
+        await self.alerts.start()
+        checkpoints = asyncio.create_task(self._checkpoint_loop()) if self.checkpointer else None
+        live = self.config.live
+        server = MetricsServer(self.metrics, port=live.metrics_port) if live.metrics_port else None
+        if server is not None:
+            await server.start()
+        summaries = asyncio.create_task(
+            log_summaries(self.metrics, live.metrics_interval, lambda: self.bars_processed)
+        )
+        queue_wait = self.metrics.stage("queue")
+        evaluate = self.metrics.stage("evaluate")
+        feed_lag = self.metrics.feed_lag
+        try:
+            async for bar in self.streamer.stream():
+                started = time.perf_counter()
+                if bar.received:
+                    queue_wait.observe(started - bar.received)
+                feed_lag.observe(time.time() - bar.start_ms / 1000)
+                self.process(bar)
+                evaluate.observe(time.perf_counter() - started)
+        finally:
+            for task in (checkpoints, summaries):
+                if task is not None:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+            if self.checkpointer is not None:
+                await self.checkpoint()
+            if server is not None:
+                await server.close()
+            await self.alerts.close()
+
+    def process(self, bar: BarRecord) -> Signal | None:
+        """Evaluate one bar for its ticker; returns the signal when it changed."""
+
+        ticker = bar.ticker
+        state = self.states.get(ticker)
+        # Bars already seen during warm start (or replayed by the feed) are skipped.
+        if state is None or bar.start_ms <= state.last_ms:
+            return None
+        state.last_ms = bar.start_ms
+        self.bars_processed += 1
+        timestamp = bar.timestamp
+        if state.streaming:
+            signal, confidence = state.strategy.update(timestamp, bar)
+            indicators = state.strategy.snapshot()
+        else:
+            signal, confidence, indicators = self._evaluate_window(state, bar)
+        if state.last_signal == signal:
+            return None
+        state.last_signal = signal
+        if signal is Signal.HOLD:
+            return signal
+        payload: dict[str, Any] = {
+            "Price": f"${bar['close']:.2f}",
+            "Time": timestamp.isoformat(),
+            "Strategy": state.strategy.name,
+            "Params": state.strategy.params,
+            "Confidence": f"{confidence:.2f}",
+        }
+        if "rsi" in indicators:
+            payload["RSI"] = round(indicators["rsi"], 2)
+        if "macd" in indicators:
+            payload["MACD"] = round(indicators["macd"], 2)
+        # Queued for the background sender; bar processing never waits on the webhook.
+        self.alerts.submit(signal.value, ticker, payload)
+        return signal
+
+    async def warm_start(self) -> None:
+        """Prime every ticker with its last ``window`` bars from the cache plus a REST top-up.
+
+        Signals computed while priming only set ``last_signal``; no alerts are sent, so
+        the first live bar alerts only on a genuine transition.
+        """
+
+        started = time.perf_counter()
+        source = self.source or PolygonDataSource()
+        frames = await asyncio.gather(
+            *(
+                asyncio.to_thread(source.recent_bars, ticker, self.config.bar_size, self.window)
+                for ticker in self.states
+            )
+        )
+        primed = 0
+        for (ticker, state), frame in zip(self.states.items(), frames, strict=True):
+            primed += self._prime(state, frame_to_bars(ticker, frame))
+        log.info(
+            "live.warm_start",
+            tickers=len(self.states),
+            bars=primed,
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+    def _prime(self, state: TickerState, bars: list[BarRecord]) -> int:
+        bars = [bar for bar in bars if bar.start_ms > state.last_ms]
+        if not bars:
+            return 0
+        if state.streaming:
+            for bar in bars:
+                state.last_signal, _ = state.strategy.update(bar.timestamp, bar)
+        else:
+            assert state.history is not None
+            state.history.extend(bars[:-1])
+            state.last_signal, _, _ = self._evaluate_window(state, bars[-1])
+        state.last_ms = bars[-1].start_ms
+        return len(bars)
+
+    # region Checkpointing ----------------------------------------------------------------
+    def _fingerprint(self) -> str:
+        strategy = self.config.strategy
+        return json.dumps(
+            [strategy.name, strategy.params, self.window, self.config.bar_size],
+            sort_keys=True,
+            default=str,
+        )
+
+    def checkpoint_state(self) -> dict[str, Any]:
+        """Snapshot of per-ticker state; streaming strategies carry their indicators."""
+
+        snapshot: dict[str, Any] = {}
+        for ticker, state in self.states.items():
+            snapshot[ticker] = {
+                "strategy": state.strategy if state.streaming else None,
+                "history": state.history.arrays() if state.history is not None else None,
+                "last_signal": state.last_signal.value if state.last_signal else None,
+                "last_ms": state.last_ms,
             }
-            if "rsi" in state.data.columns:
-                payload["RSI"] = round(state.data.iloc[-1]["rsi"], 2)
-            if "macd" in state.data.columns:
-                payload["MACD"] = round(state.data.iloc[-1]["macd"], 2)
-            send_alert(signal.value, self.config.tickers[0], payload)
-            await asyncio.sleep(0)
+        return snapshot
+
+    async def checkpoint(self) -> None:
+        """Encode state on the loop (consistent view), then write it from a worker thread."""
+
+        assert self.checkpointer is not None
+        started = time.perf_counter()
+        data = self.checkpointer.encode(self.checkpoint_state())
+        await asyncio.to_thread(self.checkpointer.save, data)
+        log.debug(
+            "live.checkpoint_saved",
+            size=len(data),
+            seconds=round(time.perf_counter() - started, 4),
+        )
+
+    async def _checkpoint_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.live.checkpoint_interval)
+            try:
+                await self.checkpoint()
+            except OSError as exc:
+                log.error("live.checkpoint_failed", error=str(exc))
+
+    def restore(self) -> bool:
+        """Load the last checkpoint, if one matches this configuration."""
+
+        assert self.checkpointer is not None
+        started = time.perf_counter()
+        snapshot = self.checkpointer.load()
+        if snapshot is None:
+            return False
+        for ticker, saved in snapshot.items():
+            state = self.states.get(ticker)
+            if state is None:
+                continue
+            if state.streaming and saved["strategy"] is not None:
+                state.strategy = saved["strategy"]
+            if state.history is not None and saved["history"] is not None:
+                state.history.load(*saved["history"])
+            last_signal = saved["last_signal"]
+            state.last_signal = Signal(last_signal) if last_signal else None
+            state.last_ms = saved["last_ms"]
+        log.info(
+            "live.checkpoint_restored",
+            tickers=len(snapshot),
+            seconds=round(time.perf_counter() - started, 4),
+        )
+        return True
+
+    # endregion --------------------------------------------------------------------------
+
+    def _evaluate_window(
+        self, state: TickerState, bar: BarRecord
+    ) -> tuple[Signal, float, dict[str, float]]:
+        """Fallback for strategies without incremental state: re-prepare the window."""
+
+        assert state.history is not None
+        state.history.append(bar)
+        df = state.history.to_frame()
+        strategy_state = state.strategy.prepare(df)
+        signal, confidence = state.strategy.on_bar(df.iloc[-1], strategy_state)
+        return signal, confidence, strategy_state.data.iloc[-1].to_dict()
 
 
-__all__ = ["LiveSignalRuntime"]
+__all__ = ["LiveSignalRuntime", "TickerState"]
@@ -0,0 +1,62 @@
+"""Alert sinks the live runtime can publish to instead of Discord."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+
+class AlertSink(Protocol):
+    """What :class:`~trading_bot.live.signal_runtime.LiveSignalRuntime` needs from alerts."""
+
+    def submit(self, signal: str, ticker: str, payload: dict[str, Any]) -> bool: ...
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class NullAlertSink:
+    """Discards alerts, keeping ``(ticker, signal, time)`` records for inspection."""
+
+    def __init__(self) -> None:
+        self.records: list[tuple[str, str, str]] = []
+
+    def submit(self, signal: str, ticker: str, payload: dict[str, Any]) -> bool:
+        self.records.append((ticker, signal, str(payload.get("Time"))))
+        return True
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class FileAlertSink(NullAlertSink):
+    """Appends alerts to a JSON-lines file."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self._handle: IO[str] | None = None
+
+    def submit(self, signal: str, ticker: str, payload: dict[str, Any]) -> bool:
+        super().submit(signal, ticker, payload)
+        if self._handle is not None:
+            record = {"signal": signal, "ticker": ticker, "payload": payload}
+            self._handle.write(json.dumps(record, default=str) + "\n")
+        return True
+
+    async def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("w")
+
+    async def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+__all__ = ["AlertSink", "FileAlertSink", "NullAlertSink"]
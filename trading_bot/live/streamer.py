@@ -3,25 +3,86 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
-from collections.abc import AsyncIterator
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from typing import Protocol
 
-import pandas as pd
 import structlog
 from polygon import WebSocketClient
-from polygon.websocket.models import WebSocketMessage
+from polygon.websocket.models import Feed, WebSocketMessage
+
+from trading_bot.data.bars import (
+    BarQueue,
+    BarRecord,
+    OverflowPolicy,
+    bar_from_event,
+    frame_to_bars,
+)
+from trading_bot.data.polygon_source import PolygonDataSource
+
+from .metrics import Histogram, LiveMetrics
 
 log = structlog.get_logger(__name__)
 
 
+class BarStream(Protocol):
+    """Source of bars for the live runtime."""
+
+    def stream(self) -> AsyncIterator[BarRecord]: ...
+
+
 class AggregateStreamer:
-    """Wrapper around the Polygon WebSocket aggregate feed."""
+    """Wrapper around the Polygon WebSocket aggregate feed.
 
-    def __init__(self, ticker: str, api_key: str | None = None) -> None:
-        self.ticker = ticker
+    All tickers share one connection; bars pass through a bounded :class:`BarQueue`
+    whose ``overflow`` policy applies when the consumer falls behind. ``feed`` and
+    ``secure`` select the endpoint, e.g. ``feed="127.0.0.1:8765", secure=False`` for a
+    local :class:`~trading_bot.live.local_server.LocalPolygonServer`.
+
+    The last bar time of each ticker is tracked. Polygon sends no aggregate for a minute
+    (or second) without trades, so a skipped bar alone is not a gap: only the first bar of
+    a ticker after a reconnect, or one at least ``min_gap`` missing bars after the
+    previous one, has the bars in between fetched over REST in the background. That
+    ticker's newer bars are held back until the backfill lands and then released after
+    it, so every ticker stays in time order while the other tickers, and the socket
+    reader, carry on unblocked.
+    """
+
+    def __init__(
+        self,
+        tickers: str | Sequence[str],
+        api_key: str | None = None,
+        max_queue: int = 10_000,
+        overflow: OverflowPolicy = "block",
+        feed: Feed | str = Feed.Delayed,
+        secure: bool = True,
+        cadence_ms: int = 60_000,
+        backfill: bool = True,
+        source: PolygonDataSource | None = None,
+        min_gap: int | None = None,
+    ) -> None:
+        self.tickers = [tickers] if isinstance(tickers, str) else list(dict.fromkeys(tickers))
         self.api_key = api_key or os.environ.get("POLYGON_API_KEY")
+        self.feed = feed
+        self.secure = secure
         self._client: WebSocketClient | None = None
-        self._queue: asyncio.Queue[pd.Series] = asyncio.Queue()
+        self.queue = BarQueue(max_queue, overflow)
+        self.cadence_ms = cadence_ms
+        self.backfill = backfill
+        self.source = source
+        self.min_gap = min_gap
+        self.last_ms: dict[str, int] = {}
+        self.gaps = 0
+        self.backfilled = 0
+        self._held: dict[str, deque[BarRecord]] = {}
+        self._connection: object | None = None
+        self._reconnected: set[str] = set()
+        self._resumed_ms: dict[str, int] = {}
+        self._backfills: set[asyncio.Task[None]] = set()
+        self._receive: Histogram | None = None
 
     # ------------------------------------------------------------------
     def _ensure_client(self) -> WebSocketClient:
@@ -32,44 +93,146 @@ class AggregateStreamer:
                     "Export the key before running `tb live`."
                 )
             self._client = WebSocketClient(
-                api_key=self.api_key, subscriptions=[f"A.{self.ticker}"], feed="delayed"
+                api_key=self.api_key,
+                subscriptions=[f"A.{ticker}" for ticker in self.tickers],
+                feed=self.feed,
+                secure=self.secure,
             )
-            self._client.on_message = self._on_message
         return self._client
 
-    def _on_message(self, message: WebSocketMessage) -> None:
-        for event in message.events:
-            if event.event_type not in {"A", "AM"}:
-                continue
-            timestamp = pd.Timestamp(event.start_timestamp, unit="ms", tz="UTC").tz_convert(
-                "US/Eastern"
-            )
-            bar = pd.Series(
-                {
-                    "open": event.open,
-                    "high": event.high,
-                    "low": event.low,
-                    "close": event.close,
-                    "volume": event.volume,
-                    "vwap": event.vwap,
-                    "trade_count": event.transactions,
-                },
-                name=timestamp,
+    def register_metrics(self, metrics: LiveMetrics) -> None:
+        self._receive = metrics.stage("receive")
+        queue = self.queue
+        metrics.register(
+            "live_queue_depth", "gauge", "Bars waiting in the queue", lambda: queue.depth
+        )
+        metrics.register(
+            "live_queue_max_depth", "gauge", "Deepest the queue has been", lambda: queue.max_depth
+        )
+        metrics.register(
+            "live_queue_dropped_total", "counter", "Bars dropped on overflow", lambda: queue.dropped
+        )
+        metrics.register("live_feed_gaps_total", "counter", "Feed gaps detected", lambda: self.gaps)
+        metrics.register(
+            "live_backfilled_bars_total",
+            "counter",
+            "Bars fetched over REST",
+            lambda: self.backfilled,
+        )
+
+    async def _on_message(self, messages: list[WebSocketMessage]) -> None:
+        received = time.perf_counter()
+        connection = self._client.websocket if self._client is not None else None
+        if connection is not self._connection:
+            if self._connection is not None:
+                log.info("streamer.reconnected", tickers=len(self.tickers))
+                self._reconnected = set(self.last_ms)
+            self._connection = connection
+        for event in messages:
+            bar = bar_from_event(event)
+            if bar is not None:
+                bar.received = received
+                await self._route(bar)
+        if self._receive is not None:
+            # Conversion plus enqueueing, including any wait on a full ``block`` queue.
+            self._receive.observe(time.perf_counter() - received)
+
+    async def _route(self, bar: BarRecord) -> None:
+        ticker = bar.ticker
+        if ticker in self._reconnected:
+            self._reconnected.discard(ticker)
+            self._resumed_ms[ticker] = bar.start_ms
+        held = self._held.get(ticker)
+        if held is not None:
+            held.append(bar)
+            return
+        last = self.last_ms.get(ticker)
+        if last is not None and self._is_gap(ticker, last, bar.start_ms):
+            self._held[ticker] = deque([bar])
+            self._start_backfill(ticker, last, bar.start_ms)
+            return
+        await self._emit(bar)
+
+    def _is_gap(self, ticker: str, last_ms: int, start_ms: int) -> bool:
+        """Whether the bars missing between ``last_ms`` and ``start_ms`` are backfilled."""
+
+        if not self.backfill or start_ms - last_ms <= self.cadence_ms:
+            return False
+        if self._resumed_ms.get(ticker) == start_ms:
+            return True
+        missing = (start_ms - last_ms) // self.cadence_ms - 1
+        return self.min_gap is not None and missing >= self.min_gap
+
+    def _start_backfill(self, ticker: str, after_ms: int, before_ms: int) -> None:
+        task = asyncio.create_task(self._backfill(ticker, after_ms, before_ms))
+        self._backfills.add(task)
+        task.add_done_callback(self._backfills.discard)
+
+    async def _emit(self, bar: BarRecord) -> None:
+        if bar.start_ms > self.last_ms.get(bar.ticker, -1):
+            self.last_ms[bar.ticker] = bar.start_ms
+        await self.queue.put_async(bar)
+
+    async def _backfill(self, ticker: str, after_ms: int, before_ms: int) -> None:
+        """Fetch the bars strictly between ``after_ms`` and ``before_ms``, then release the
+        bars held back for ``ticker`` behind them."""
+
+        self.gaps += 1
+        log.info(
+            "streamer.gap",
+            ticker=ticker,
+            missing=(before_ms - after_ms) // self.cadence_ms - 1,
+        )
+        bars: list[BarRecord] = []
+        try:
+            if self.source is None:
+                self.source = PolygonDataSource(self.api_key)
+            timespan = "second" if self.cadence_ms == 1_000 else "minute"
+            frame = await asyncio.to_thread(
+                self.source.fetch_aggregates, ticker, str(after_ms), str(before_ms), timespan
             )
-            self._queue.put_nowait(bar)
+            bars = [
+                bar for bar in frame_to_bars(ticker, frame) if after_ms < bar.start_ms < before_ms
+            ]
+        except Exception as exc:
+            log.warning("streamer.backfill_failed", ticker=ticker, error=str(exc))
+        self.backfilled += len(bars)
+        for bar in bars:
+            await self._emit(bar)
+        # ``held`` starts with the bar at ``before_ms``. Bars arriving while these are
+        # released still append to it; a further gap among them (another reconnect during
+        # the fetch) starts the next backfill.
+        held = self._held[ticker]
+        await self._emit(held.popleft())
+        while held:
+            last = self.last_ms[ticker]
+            if self._is_gap(ticker, last, held[0].start_ms):
+                self._start_backfill(ticker, last, held[0].start_ms)
+                return
+            await self._emit(held.popleft())
+        del self._held[ticker]
 
-    async def stream(self) -> AsyncIterator[pd.Series]:
+    async def stream(self) -> AsyncIterator[BarRecord]:
         client = self._ensure_client()
-        log.info("streamer.start", ticker=self.ticker)
-        connect_task = asyncio.create_task(client.connect_async())
+        log.info("streamer.start", tickers=len(self.tickers))
+        connect_task = asyncio.create_task(client.connect(self._on_message))
         try:
             while True:
-                bar = await self._queue.get()
-                yield bar
+                yield await self.queue.get()
         finally:
-            client.close()
-            await connect_task
-            log.info("streamer.stop", ticker=self.ticker)
+            await client.close()
+            for task in [connect_task, *self._backfills]:
+                task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await connect_task
+            log.info(
+                "streamer.stop",
+                tickers=len(self.tickers),
+                dropped=self.queue.dropped,
+                max_depth=self.queue.max_depth,
+                gaps=self.gaps,
+                backfilled=self.backfilled,
+            )
 
 
-__all__ = ["AggregateStreamer"]
+__all__ = ["AggregateStreamer", "BarStream"]
@@ -0,0 +1,95 @@
+"""Structured logging setup: level gating, event sampling and a non-blocking writer."""
+
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import queue
+import sys
+from collections import Counter
+from typing import Any
+
+import structlog
+
+from trading_bot.config import LoggingConfig
+
+
+class SampleEvents:
+    """structlog processor keeping the first and then every ``n``-th of the listed events.
+
+    Kept events carry ``sample_every=n`` so counts can be scaled back up.
+    """
+
+    def __init__(self, every: dict[str, int]) -> None:
+        self.every = {event: n for event, n in every.items() if n > 1}
+        self.seen: Counter[str] = Counter()
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        event = event_dict.get("event")
+        if not isinstance(event, str):
+            return event_dict
+        every = self.every.get(event)
+        if every is None:
+            return event_dict
+        seen = self.seen[event]
+        self.seen[event] = seen + 1
+        if seen % every:
+            raise structlog.DropEvent
+        event_dict["sample_every"] = every
+        return event_dict
+
+
+def is_enabled(logger: Any, level: int) -> bool:
+    """Whether ``logger`` emits events at ``level``, to skip formatting their fields."""
+
+    check = getattr(logger, "is_enabled_for", None)
+    return True if check is None else bool(check(level))
+
+
+def configure_logging(
+    config: LoggingConfig | None = None, queued: bool = False
+) -> logging.handlers.QueueListener | None:
+    """Configure structlog for this process; call before the first event is logged.
+
+    Calls below ``config.level`` hit no-op methods and skip the processors entirely. With
+    ``queued`` the rendered lines go through a queue to a listener thread that writes
+    them, so e.g. the live event loop never blocks on the terminal; stop the returned
+    listener on exit to flush it.
+    """
+
+    config = config or LoggingConfig()
+    processors: list[Any] = []
+    if config.sample:
+        processors.append(SampleEvents(config.sample))
+    processors += [
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(default=str)
+        if config.json_format
+        else structlog.dev.ConsoleRenderer(),
+    ]
+    listener = None
+    factory: Any = structlog.PrintLoggerFactory()
+    if queued:
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = logging.handlers.QueueListener(records, handler)
+        listener.start()
+        # A dedicated stdlib logger: levels are already filtered by the bound logger.
+        writer = logging.getLogger("trading_bot.structlog")
+        writer.handlers = [logging.handlers.QueueHandler(records)]
+        writer.setLevel(logging.DEBUG)
+        writer.propagate = False
+        factory = lambda *_: writer  # noqa: E731
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, config.level)),
+        logger_factory=factory,
+        cache_logger_on_first_use=True,
+    )
+    return listener
+
+
+__all__ = ["SampleEvents", "configure_logging", "is_enabled"]
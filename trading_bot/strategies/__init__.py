@@ -1,21 +1,56 @@
-"""Strategy registry."""
+"""Strategy registry.
+
+Strategy classes are imported on first use, through :data:`REGISTRY` or attribute
+access on this package.
+"""
 
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .base import Signal, Strategy, StrategyState
-from .breakout_vwap import BreakoutVwapStrategy
-from .macd_trend import MacdTrendStrategy
-from .rsi_reversion import RsiReversionStrategy
-from .sma_cross import SmaCrossStrategy
-
-REGISTRY: dict[str, type[Strategy]] = {
-    SmaCrossStrategy.name: SmaCrossStrategy,
-    RsiReversionStrategy.name: RsiReversionStrategy,
-    MacdTrendStrategy.name: MacdTrendStrategy,
-    BreakoutVwapStrategy.name: BreakoutVwapStrategy,
+from .registry import ENTRY_POINT_GROUP, StrategyRegistry
+
+if TYPE_CHECKING:
+    from .breakout_vwap import BreakoutVwapStrategy
+    from .ensemble import EnsembleStrategy
+    from .expression import ExpressionStrategy, compile_rules, evaluate_rules
+    from .macd_trend import MacdTrendStrategy
+    from .rsi_reversion import RsiReversionStrategy
+    from .sma_cross import SmaCrossStrategy
+
+REGISTRY = StrategyRegistry(
+    {
+        "sma_cross": f"{__name__}.sma_cross:SmaCrossStrategy",
+        "rsi_reversion": f"{__name__}.rsi_reversion:RsiReversionStrategy",
+        "macd_trend": f"{__name__}.macd_trend:MacdTrendStrategy",
+        "breakout_vwap": f"{__name__}.breakout_vwap:BreakoutVwapStrategy",
+        "expression": f"{__name__}.expression:ExpressionStrategy",
+        "ensemble": f"{__name__}.ensemble:EnsembleStrategy",
+    }
+)
+
+_EXPORTS = {
+    "BreakoutVwapStrategy": "breakout_vwap",
+    "EnsembleStrategy": "ensemble",
+    "ExpressionStrategy": "expression",
+    "MacdTrendStrategy": "macd_trend",
+    "RsiReversionStrategy": "rsi_reversion",
+    "SmaCrossStrategy": "sma_cross",
+    "compile_rules": "expression",
+    "evaluate_rules": "expression",
 }
 
 
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
 def create_strategy(name: str, **params) -> Strategy:
     try:
         strategy_cls = REGISTRY[name]
@@ -25,13 +60,19 @@ def create_strategy(name: str, **params) -> Strategy:
 
 
 __all__ = [
+    "ENTRY_POINT_GROUP",
     "REGISTRY",
     "BreakoutVwapStrategy",
+    "EnsembleStrategy",
+    "ExpressionStrategy",
     "MacdTrendStrategy",
     "RsiReversionStrategy",
     "Signal",
     "SmaCrossStrategy",
     "Strategy",
+    "StrategyRegistry",
     "StrategyState",
+    "compile_rules",
     "create_strategy",
+    "evaluate_rules",
 ]
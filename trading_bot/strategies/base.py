@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from trading_bot.config import RiskConfig
 
+from .timeframes import higher_timeframe_features
+
 
 class Signal(Enum):
     """Buy/Sell/Hold signals."""
@@ -21,6 +24,10 @@ class Signal(Enum):
     HOLD = "hold"
 
 
+SIGNAL_CODES = {Signal.BUY: 1, Signal.SELL: -1, Signal.HOLD: 0}
+CODE_SIGNALS = {code: signal for signal, code in SIGNAL_CODES.items()}
+
+
 @dataclass
 class StrategyState:
     """Container returned by :meth:`Strategy.prepare`."""
@@ -49,10 +56,89 @@ class Strategy(ABC):
     def prepare(self, data: pd.DataFrame) -> StrategyState:
         """Return indicator data needed for processing."""
 
+    def warmup(self, data: pd.DataFrame) -> pd.DataFrame:
+        """The trailing bars of ``data`` that :meth:`prepare` needs for the bars after it.
+
+        Preparing them followed by later bars must give those later bars the signals
+        that all of ``data`` followed by them would. Resumed and chunked backtests carry
+        only these bars between segments; the default keeps all of ``data``.
+        """
+
+        return data
+
+    def higher_timeframe(
+        self,
+        data: pd.DataFrame,
+        rule: str,
+        compute: Callable[[pd.DataFrame], pd.DataFrame | pd.Series],
+        prefix: str | None = None,
+    ) -> pd.DataFrame:
+        """Features computed on ``rule`` bars resampled from ``data``, for use in :meth:`prepare`.
+
+        Only completed higher-timeframe bars are visible to each base bar.
+        """
+
+        return higher_timeframe_features(data, rule, compute, prefix)
+
     @abstractmethod
     def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
         """Return a signal and optional confidence."""
 
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Signals for every bar of ``data`` at once, as :data:`SIGNAL_CODES` and confidences.
+
+        Must agree with :meth:`on_bar` bar for bar. The default calls :meth:`on_bar` in a
+        loop; the built-in strategies override it with array operations.
+        """
+
+        codes = np.zeros(len(data), dtype=np.int8)
+        confidences = np.zeros(len(data), dtype=np.float64)
+        for row, (_, bar) in enumerate(data.iterrows()):
+            signal, confidence = self.on_bar(bar, state)
+            codes[row] = SIGNAL_CODES[signal]
+            confidences[row] = confidence
+        return codes, confidences
+
+    # region Streaming ----------------------------------------------------------------------
+    def supports_streaming(self) -> bool:
+        """Whether :meth:`update` can evaluate bars incrementally.
+
+        Strategies that return ``False`` are evaluated by re-running :meth:`prepare` on
+        the recent history for every bar.
+        """
+
+        return False
+
+    def reset_stream(self) -> None:
+        """Reset incremental indicator state before streaming bars through :meth:`update`."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    def update(self, timestamp: pd.Timestamp, bar: Mapping[str, Any]) -> tuple[Signal, float]:
+        """Consume one bar in constant time and return the same signal as :meth:`on_bar`."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    def prime_stream(self, data: pd.DataFrame) -> None:
+        """Reset the stream to where :meth:`update` over every bar of ``data`` leaves it.
+
+        The default replays the bars; the built-in strategies set their indicators from
+        arrays instead.
+        """
+
+        self.reset_stream()
+        for timestamp, bar in zip(data.index, data.to_dict("records"), strict=True):
+            self.update(timestamp, bar)
+
+    def snapshot(self) -> dict[str, float]:
+        """Latest incremental indicator values, for alerts."""
+
+        return {}
+
+    # endregion ------------------------------------------------------------------------------
+
     def position_sizing(
         self,
         signal: Signal,
@@ -69,4 +155,32 @@ class Strategy(ABC):
         return max(qty, 0.0)
 
 
-__all__ = ["Signal", "Strategy", "StrategyState"]
+def codes_from_masks(
+    buy: np.ndarray,
+    sell: np.ndarray,
+    confidence: tuple[float | np.ndarray, float | np.ndarray, float | np.ndarray],
+    valid: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build :meth:`Strategy.signal_codes` output from boolean BUY/SELL masks.
+
+    ``confidence`` holds the (buy, sell, hold) confidences; bars outside ``valid``
+    (missing indicators) are HOLD with confidence 0.
+    """
+
+    codes = np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    buy_conf, sell_conf, hold_conf = confidence
+    confidences = np.where(buy, buy_conf, np.where(sell, sell_conf, hold_conf)).astype(np.float64)
+    if valid is not None:
+        codes[~valid] = 0
+        confidences[~valid] = 0.0
+    return codes, confidences
+
+
+__all__ = [
+    "CODE_SIGNALS",
+    "SIGNAL_CODES",
+    "Signal",
+    "Strategy",
+    "StrategyState",
+    "codes_from_masks",
+]
@@ -5,11 +5,12 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from trading_bot.indicators import ta
+from trading_bot.indicators import streaming, ta
 
-from .base import Signal, Strategy, StrategyState
+from .base import Signal, Strategy, StrategyState, codes_from_masks
 
 
 class BreakoutVwapStrategy(Strategy):
@@ -17,7 +18,7 @@ class BreakoutVwapStrategy(Strategy):
 
     @classmethod
     def default_params(cls) -> dict[str, Any]:
-        return {"lookback": 20, "std_multiplier": 2.0}
+        return {"lookback": 20, "std_multiplier": 2.0, "session_vwap": True}
 
     @classmethod
     def param_space(cls) -> Mapping[str, Any]:
@@ -25,7 +26,7 @@ class BreakoutVwapStrategy(Strategy):
 
     def prepare(self, data: pd.DataFrame) -> StrategyState:
         df = data.copy()
-        df["vwap"] = ta.vwap(df)
+        df["vwap"] = ta.session_vwap(df) if self.params["session_vwap"] else ta.vwap(df)
         bands = ta.bollinger_bands(
             df["close"],
             window=int(self.params["lookback"]),
@@ -34,13 +35,80 @@ class BreakoutVwapStrategy(Strategy):
         indicators = pd.concat([df[["close", "vwap"]], bands], axis=1)
         return StrategyState(data=indicators, metadata={})
 
+    def warmup(self, data: pd.DataFrame) -> pd.DataFrame:
+        if not self.params["session_vwap"] or data.empty:
+            return data
+        start = min(
+            len(data) - int(self.params["lookback"]),
+            int(data.index.searchsorted(data.index[-1].normalize())),
+        )
+        return data.iloc[max(0, start) :]
+
     def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
         row = state.data.loc[bar.name]
         if row.isna().any():
             return Signal.HOLD, 0.0
-        if row["close"] > row["upper"] and row["close"] > row["vwap"]:
+        return self._decide(row["close"], row["vwap"], row["upper"], row["lower"])
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        values = state.data.to_numpy(dtype=np.float64)
+        close, vwap = state.data["close"].to_numpy(), state.data["vwap"].to_numpy()
+        upper, lower = state.data["upper"].to_numpy(), state.data["lower"].to_numpy()
+        buy = (close > upper) & (close > vwap)
+        sell = (close < lower) & (close < vwap)
+        return codes_from_masks(buy, sell, (0.8, 0.8, 0.2), ~np.isnan(values).any(axis=1))
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def reset_stream(self) -> None:
+        self._vwap = streaming.VWAP()
+        self._bands = streaming.BollingerBands(
+            int(self.params["lookback"]), float(self.params["std_multiplier"])
+        )
+
+    def prime_stream(self, data: pd.DataFrame) -> None:
+        self.reset_stream()
+        if data.empty:
+            return
+        session = None
+        start = 0
+        if self.params["session_vwap"]:
+            session = data.index[-1].date()
+            start = int(data.index.searchsorted(data.index[-1].normalize()))
+        bars = data.iloc[start:]
+        self._vwap.prime(
+            *(
+                bars[column].to_numpy(dtype=np.float64)
+                for column in ("high", "low", "close", "volume")
+            ),
+            session,
+        )
+        self._bands.prime(data["close"].to_numpy(dtype=np.float64))
+
+    def update(self, timestamp: pd.Timestamp, bar: Mapping[str, Any]) -> tuple[Signal, float]:
+        close = float(bar["close"])
+        # Calendar day in the bar's own timezone, matching ta.session_starts.
+        session = timestamp.date() if self.params["session_vwap"] else None
+        vwap = self._vwap.update(
+            float(bar["high"]), float(bar["low"]), close, float(bar["volume"]), session
+        )
+        _, upper, lower = self._bands.update(close)
+        if any(value != value for value in (close, vwap, upper, lower)):
+            return Signal.HOLD, 0.0
+        return self._decide(close, vwap, upper, lower)
+
+    def snapshot(self) -> dict[str, float]:
+        return {"vwap": self._vwap.value, "upper": self._bands.upper, "lower": self._bands.lower}
+
+    def _decide(
+        self, close: float, vwap: float, upper: float, lower: float
+    ) -> tuple[Signal, float]:
+        if close > upper and close > vwap:
             return Signal.BUY, 0.8
-        if row["close"] < row["lower"] and row["close"] < row["vwap"]:
+        if close < lower and close < vwap:
             return Signal.SELL, 0.8
         return Signal.HOLD, 0.2
 
@@ -0,0 +1,185 @@
+"""Ensemble strategy combining the signals of several member strategies."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.config import RiskConfig
+
+from .base import CODE_SIGNALS, SIGNAL_CODES, Signal, Strategy, StrategyState
+
+COMBINED = "ensemble"
+
+
+@dataclass
+class EnsembleMember:
+    label: str
+    strategy: Strategy
+    weight: float
+
+
+def _build_members(specs: list[Any]) -> list[EnsembleMember]:
+    # Imported lazily: the registry imports this module.
+    from . import create_strategy
+
+    members: list[EnsembleMember] = []
+    seen: dict[str, int] = {}
+    for spec in specs:
+        if isinstance(spec, str):
+            spec = {"name": spec}
+        name = spec["name"]
+        if name == EnsembleStrategy.name:
+            raise ValueError("Ensembles cannot contain other ensembles")
+        label = spec.get("label") or name
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}_{seen[label]}"
+        else:
+            seen[label] = 1
+        strategy = create_strategy(name, **spec.get("params", {}))
+        members.append(EnsembleMember(label, strategy, float(spec.get("weight", 1.0))))
+    if not members:
+        raise ValueError("An ensemble needs at least one member strategy")
+    if COMBINED in seen:
+        raise ValueError(f"'{COMBINED}' is reserved and cannot be used as a member label")
+    return members
+
+
+class EnsembleStrategy(Strategy):
+    """Evaluate member strategies in one pass and trade their vote or weighted score.
+
+    ``mode="vote"`` counts member BUY/SELL signals by weight; ``mode="weighted"`` also
+    scales them by each member's confidence. The combined score lies in ``[-1, 1]``
+    and must exceed ``threshold`` in absolute value to produce a trade signal.
+    """
+
+    name = "ensemble"
+
+    def __init__(self, **params: Any) -> None:
+        super().__init__(**params)
+        if self.params["mode"] not in {"vote", "weighted"}:
+            raise ValueError(f"Unknown ensemble mode: {self.params['mode']}")
+        self.members = _build_members(list(self.params["members"]))
+
+    @classmethod
+    def default_params(cls) -> dict[str, Any]:
+        return {
+            "members": ["sma_cross", "rsi_reversion", "macd_trend", "breakout_vwap"],
+            "mode": "vote",
+            "threshold": 0.5,
+        }
+
+    @classmethod
+    def param_space(cls) -> Mapping[str, Any]:
+        return {"mode": ["vote", "weighted"], "threshold": [0.25, 0.5, 0.75]}
+
+    @property
+    def labels(self) -> list[str]:
+        return [member.label for member in self.members]
+
+    def prepare(self, data: pd.DataFrame) -> StrategyState:
+        # Members with identical configuration share one set of indicators.
+        states: dict[tuple[str, str], StrategyState] = {}
+        member_states: list[StrategyState] = []
+        for member in self.members:
+            key = (member.strategy.name, repr(sorted(member.strategy.params.items())))
+            if key not in states:
+                states[key] = member.strategy.prepare(data)
+            member_states.append(states[key])
+
+        codes = np.zeros((len(data), len(self.members)), dtype=np.int8)
+        confidences = np.zeros((len(data), len(self.members)), dtype=np.float64)
+        for col, (member, state) in enumerate(zip(self.members, member_states, strict=True)):
+            codes[:, col], confidences[:, col] = member.strategy.signal_codes(data, state)
+
+        weights = np.array([member.weight for member in self.members])
+        votes = codes.astype(np.float64)
+        if self.params["mode"] == "weighted":
+            votes *= confidences
+        total = weights.sum()
+        score = votes @ weights / total if total else np.zeros(len(data))
+        threshold = float(self.params["threshold"])
+        combined = np.where(score > threshold, 1, np.where(score < -threshold, -1, 0))
+
+        frame = pd.DataFrame(index=data.index)
+        for col, label in enumerate(self.labels):
+            frame[label] = codes[:, col]
+            frame[f"{label}_confidence"] = confidences[:, col]
+        frame[COMBINED] = combined.astype(np.int8)
+        frame[f"{COMBINED}_confidence"] = np.minimum(np.abs(score), 1.0)
+        return StrategyState(data=frame, metadata={"members": self.labels})
+
+    def warmup(self, data: pd.DataFrame) -> pd.DataFrame:
+        needed = max(len(member.strategy.warmup(data)) for member in self.members)
+        return data.iloc[len(data) - needed :]
+
+    def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
+        return _lookup(state, COMBINED, bar.name)
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return _columns(state, COMBINED)
+
+    def replay(self, label: str, state: StrategyState) -> Strategy:
+        """Return a strategy that trades one member's (or the combined) prepared signals."""
+
+        if label == COMBINED:
+            return _ReplayStrategy(self, label, state)
+        for member in self.members:
+            if member.label == label:
+                return _ReplayStrategy(member.strategy, label, state)
+        raise ValueError(f"Unknown ensemble member: {label}")
+
+
+def _lookup(state: StrategyState, label: str, timestamp: Any) -> tuple[Signal, float]:
+    code = state.data.at[timestamp, label]
+    confidence = state.data.at[timestamp, f"{label}_confidence"]
+    return CODE_SIGNALS[int(code)], float(confidence)
+
+
+def _columns(state: StrategyState, label: str) -> tuple[np.ndarray, np.ndarray]:
+    codes = state.data[label].to_numpy(dtype=np.int8)
+    return codes, state.data[f"{label}_confidence"].to_numpy(dtype=np.float64)
+
+
+class _ReplayStrategy(Strategy):
+    """Replays signals prepared by :class:`EnsembleStrategy` for a single column."""
+
+    def __init__(self, source: Strategy, label: str, state: StrategyState) -> None:
+        super().__init__(**source.params)
+        self.name = label
+        self._source = source
+        self._state = state
+
+    def prepare(self, data: pd.DataFrame) -> StrategyState:
+        return self._state
+
+    def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
+        return _lookup(state, self.name, bar.name)
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return _columns(state, self.name)
+
+    def position_sizing(
+        self,
+        signal: Signal,
+        equity: float,
+        price: float,
+        risk_cfg: RiskConfig,
+    ) -> float:
+        return self._source.position_sizing(signal, equity, price, risk_cfg)
+
+
+def create(params: dict[str, Any] | None = None) -> EnsembleStrategy:
+    return EnsembleStrategy(**(params or {}))
+
+
+__all__ = ["COMBINED", "SIGNAL_CODES", "EnsembleMember", "EnsembleStrategy", "create"]
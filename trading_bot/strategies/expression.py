@@ -0,0 +1,400 @@
+"""Rule-based strategies defined by entry/exit expressions.
+
+Expressions use a small, Python-like syntax over bar columns and indicator terms::
+
+    sma(close, 10) > sma(close, 30) and rsi(close, 14) < 70
+
+They are parsed once into a plan of vectorized NumPy steps. Identical sub-expressions
+(across every rule compiled together) are evaluated a single time, so hundreds of
+rule variants can share their indicator work.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.indicators import kernels, ta
+
+from .base import Signal, Strategy, StrategyState, codes_from_masks
+
+Value = np.ndarray | float
+
+
+class _Context:
+    """Per-evaluation access to input columns and derived session boundaries."""
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        self.data = data
+        self._columns: dict[str, np.ndarray] = {}
+        self._starts: np.ndarray | None = None
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            if name not in self.data.columns:
+                raise ValueError(f"Unknown column in expression: {name}")
+            self._columns[name] = self.data[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        return self._columns[name]
+
+    def session_starts(self) -> np.ndarray:
+        if self._starts is None:
+            self._starts = ta.session_starts(self.data.index)
+        return self._starts
+
+
+def _shift(values: Value, periods: float = 1) -> Value:
+    if not isinstance(values, np.ndarray) or values.ndim == 0:
+        return values
+    n = int(periods)
+    result = np.full(len(values), np.nan)
+    if n == 0:
+        result[:] = values
+    elif n > 0:
+        result[n:] = values[:-n]
+    else:
+        result[:n] = values[-n:]
+    return result
+
+
+def _crosses_above(a: Value, b: Value) -> np.ndarray:
+    return np.logical_and(np.greater(a, b), np.less_equal(_shift(a), _shift(b)))
+
+
+def _crosses_below(a: Value, b: Value) -> np.ndarray:
+    return np.logical_and(np.less(a, b), np.greater_equal(_shift(a), _shift(b)))
+
+
+@dataclass(frozen=True)
+class _Function:
+    """Signature of an expression function: array arguments then numeric parameters."""
+
+    arity: int
+    defaults: tuple[float | None, ...]
+    kernel: Callable[..., Any]
+    # Functions returning several arrays share one plan step and pick an output.
+    output: int | None = None
+    group: str | None = None
+    uses_context: bool = False
+
+
+_FUNCTIONS: dict[str, _Function] = {
+    "sma": _Function(1, (None,), lambda x, n: kernels.sma(x, int(n))),
+    "ema": _Function(1, (None,), lambda x, n: kernels.ema(x, int(n))),
+    "rsi": _Function(1, (14,), lambda x, n: kernels.rsi(x, int(n))),
+    "macd": _Function(
+        1, (12, 26, 9), lambda x, f, s, g: kernels.macd(x, int(f), int(s), int(g)), 0, "macd"
+    ),
+    "macd_signal": _Function(
+        1, (12, 26, 9), lambda x, f, s, g: kernels.macd(x, int(f), int(s), int(g)), 1, "macd"
+    ),
+    "macd_hist": _Function(
+        1, (12, 26, 9), lambda x, f, s, g: kernels.macd(x, int(f), int(s), int(g)), 2, "macd"
+    ),
+    "bb_mid": _Function(
+        1, (20, 2.0), lambda x, n, k: kernels.bollinger_bands(x, int(n), k), 0, "bollinger"
+    ),
+    "bb_upper": _Function(
+        1, (20, 2.0), lambda x, n, k: kernels.bollinger_bands(x, int(n), k), 1, "bollinger"
+    ),
+    "bb_lower": _Function(
+        1, (20, 2.0), lambda x, n, k: kernels.bollinger_bands(x, int(n), k), 2, "bollinger"
+    ),
+    "vwap": _Function(
+        0,
+        (),
+        lambda ctx: kernels.vwap(
+            ctx.column("high"), ctx.column("low"), ctx.column("close"), ctx.column("volume")
+        ),
+        uses_context=True,
+    ),
+    "session_vwap": _Function(
+        0,
+        (),
+        lambda ctx: kernels.session_vwap(
+            ctx.column("high"),
+            ctx.column("low"),
+            ctx.column("close"),
+            ctx.column("volume"),
+            ctx.session_starts(),
+        ),
+        uses_context=True,
+    ),
+    "shift": _Function(1, (1,), _shift),
+    "abs": _Function(1, (), np.abs),
+    "min": _Function(2, (), np.fmin),
+    "max": _Function(2, (), np.fmax),
+    "crosses_above": _Function(2, (), _crosses_above),
+    "crosses_below": _Function(2, (), _crosses_below),
+}
+
+_BINARY_OPS: dict[type[ast.AST], tuple[str, Callable[[Any, Any], Any], bool]] = {
+    # name, implementation, commutative
+    ast.Add: ("add", np.add, True),
+    ast.Sub: ("sub", np.subtract, False),
+    ast.Mult: ("mul", np.multiply, True),
+    ast.Div: ("div", np.divide, False),
+}
+
+_COMPARE_OPS: dict[type[ast.AST], tuple[str, Callable[[Any, Any], Any], bool]] = {
+    # ``a > b`` is normalised to ``b < a`` so both spellings share a step.
+    ast.Lt: ("lt", np.less, False),
+    ast.LtE: ("le", np.less_equal, False),
+    ast.Gt: ("lt", np.less, False),
+    ast.GtE: ("le", np.less_equal, False),
+    ast.Eq: ("eq", np.equal, True),
+    ast.NotEq: ("ne", np.not_equal, True),
+}
+
+_CONSTANT_NAMES = {"true": True, "false": False}
+
+
+@dataclass(frozen=True)
+class _Step:
+    kernel: Callable[..., Any]
+    inputs: tuple[int, ...]
+    params: tuple[float, ...] = ()
+    output: int | None = None
+    uses_context: bool = False
+
+
+@dataclass
+class _PlanBuilder:
+    """Hash-conses expression nodes into an ordered list of steps."""
+
+    steps: list[_Step] = field(default_factory=list)
+    constants: dict[int, float] = field(default_factory=dict)
+    _slots: dict[tuple[Any, ...], int] = field(default_factory=dict)
+
+    def add(self, key: tuple[Any, ...], step: _Step | None, constant: float | None = None) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self.steps)
+            self._slots[key] = slot
+            self.steps.append(step or _Step(kernel=_identity, inputs=()))
+            if constant is not None:
+                self.constants[slot] = constant
+        return slot
+
+    # ------------------------------------------------------------------
+    def build(self, node: ast.AST, source: str) -> int:
+        if isinstance(node, ast.Expression):
+            return self.build(node.body, source)
+        if isinstance(node, ast.Constant) and isinstance(node.value, int | float):
+            value = float(node.value)
+            return self.add(("const", value), None, constant=value)
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name.lower() in _CONSTANT_NAMES:
+                value = float(_CONSTANT_NAMES[name.lower()])
+                return self.add(("const", value), None, constant=value)
+            return self.add(
+                ("column", name), _Step(kernel=_column(name), inputs=(), uses_context=True)
+            )
+        if isinstance(node, ast.UnaryOp):
+            operand = self.build(node.operand, source)
+            if isinstance(node.op, ast.Not):
+                return self.add(("not", operand), _Step(np.logical_not, (operand,)))
+            if isinstance(node.op, ast.USub):
+                return self.add(("neg", operand), _Step(np.negative, (operand,)))
+            if isinstance(node.op, ast.UAdd):
+                return operand
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            name, func, commutative = _BINARY_OPS[type(node.op)]
+            return self._binary(name, func, commutative, node.left, node.right, source)
+        if isinstance(node, ast.BoolOp):
+            name, func = (
+                ("and", np.logical_and) if isinstance(node.op, ast.And) else ("or", np.logical_or)
+            )
+            slots = sorted(self.build(value, source) for value in node.values)
+            result = slots[0]
+            for slot in slots[1:]:
+                result = self.add((name, result, slot), _Step(func, (result, slot)))
+            return result
+        if isinstance(node, ast.Compare):
+            return self._compare(node, source)
+        if isinstance(node, ast.Call):
+            return self._call(node, source)
+        raise ValueError(f"Unsupported syntax in expression {source!r}: {ast.dump(node)}")
+
+    def _binary(
+        self,
+        name: str,
+        func: Callable[[Any, Any], Any],
+        commutative: bool,
+        left_node: ast.AST,
+        right_node: ast.AST,
+        source: str,
+    ) -> int:
+        left = self.build(left_node, source)
+        right = self.build(right_node, source)
+        if commutative and right < left:
+            left, right = right, left
+        return self.add((name, left, right), _Step(func, (left, right)))
+
+    def _compare(self, node: ast.Compare, source: str) -> int:
+        # Chained comparisons (``a < b < c``) become a conjunction of pairs.
+        operands = [node.left, *node.comparators]
+        slots: list[int] = []
+        for op, left_node, right_node in zip(node.ops, operands[:-1], operands[1:], strict=True):
+            if type(op) not in _COMPARE_OPS:
+                raise ValueError(f"Unsupported comparison in expression {source!r}")
+            name, func, commutative = _COMPARE_OPS[type(op)]
+            if isinstance(op, ast.Gt | ast.GtE):
+                left_node, right_node = right_node, left_node
+            slots.append(self._binary(name, func, commutative, left_node, right_node, source))
+        result = slots[0]
+        for slot in slots[1:]:
+            pair = tuple(sorted((result, slot)))
+            result = self.add(("and", *pair), _Step(np.logical_and, pair))
+        return result
+
+    def _call(self, node: ast.Call, source: str) -> int:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+            name = getattr(node.func, "id", ast.unparse(node.func))
+            raise ValueError(f"Unknown function {name!r} in expression {source!r}")
+        if node.keywords:
+            raise ValueError(f"Keyword arguments are not supported in expression {source!r}")
+        name = node.func.id
+        spec = _FUNCTIONS[name]
+        args = node.args
+        if len(args) < spec.arity or len(args) > spec.arity + len(spec.defaults):
+            raise ValueError(f"Wrong number of arguments to {name}() in expression {source!r}")
+        inputs = tuple(self.build(arg, source) for arg in args[: spec.arity])
+        params: list[float] = []
+        for position, default in enumerate(spec.defaults):
+            index = spec.arity + position
+            if index < len(args):
+                arg = args[index]
+                if not isinstance(arg, ast.Constant) or not isinstance(arg.value, int | float):
+                    raise ValueError(
+                        f"Parameter {position + 1} of {name}() must be a number in {source!r}"
+                    )
+                params.append(float(arg.value))
+            elif default is None:
+                raise ValueError(f"Missing parameter for {name}() in expression {source!r}")
+            else:
+                params.append(float(default))
+        group = spec.group or name
+        base_key = (group, inputs, tuple(params))
+        base = self.add(
+            base_key,
+            _Step(spec.kernel, inputs, tuple(params), uses_context=spec.uses_context),
+        )
+        if spec.output is None:
+            return base
+        return self.add(("item", base, spec.output), _Step(_identity, (base,), output=spec.output))
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _column(name: str) -> Callable[[_Context], np.ndarray]:
+    def load(ctx: _Context) -> np.ndarray:
+        return ctx.column(name)
+
+    return load
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """Vectorized evaluation plan for a set of named boolean expressions."""
+
+    steps: tuple[_Step, ...]
+    constants: Mapping[int, float]
+    outputs: Mapping[str, int]
+
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Evaluate every rule over ``data`` and return one boolean column per rule."""
+
+        ctx = _Context(data)
+        slots: list[Any] = [None] * len(self.steps)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for slot, step in enumerate(self.steps):
+                if slot in self.constants:
+                    slots[slot] = self.constants[slot]
+                    continue
+                args = [slots[i] for i in step.inputs]
+                if step.uses_context:
+                    args.insert(0, ctx)
+                value = step.kernel(*args, *step.params)
+                if step.output is not None:
+                    value = value[step.output]
+                slots[slot] = value
+        n = len(data)
+        columns = {
+            name: np.broadcast_to(np.asarray(slots[slot], dtype=bool), (n,)).copy()
+            for name, slot in self.outputs.items()
+        }
+        return pd.DataFrame(columns, index=data.index)
+
+
+@lru_cache(maxsize=512)
+def _compile(rules: tuple[tuple[str, str], ...]) -> CompiledRules:
+    builder = _PlanBuilder()
+    outputs: dict[str, int] = {}
+    for name, source in rules:
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid expression {source!r}: {exc.msg}") from exc
+        outputs[name] = builder.build(tree, source)
+    return CompiledRules(
+        steps=tuple(builder.steps), constants=dict(builder.constants), outputs=outputs
+    )
+
+
+def compile_rules(rules: Mapping[str, str]) -> CompiledRules:
+    """Parse and compile named expressions into one shared evaluation plan."""
+
+    return _compile(tuple((name, str(source)) for name, source in rules.items()))
+
+
+def evaluate_rules(data: pd.DataFrame, rules: Mapping[str, str]) -> pd.DataFrame:
+    """Evaluate many rule variants over ``data`` sharing common sub-expressions."""
+
+    return compile_rules(rules).evaluate(data)
+
+
+class ExpressionStrategy(Strategy):
+    """Strategy whose entry and exit conditions are boolean expressions."""
+
+    name = "expression"
+
+    @classmethod
+    def default_params(cls) -> dict[str, Any]:
+        return {
+            "entry": "sma(close, 10) > sma(close, 30)",
+            "exit": "sma(close, 10) < sma(close, 30)",
+        }
+
+    def prepare(self, data: pd.DataFrame) -> StrategyState:
+        rules = compile_rules({"entry": self.params["entry"], "exit": self.params["exit"]})
+        return StrategyState(data=rules.evaluate(data), metadata={"rules": rules})
+
+    def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
+        row = state.data.loc[bar.name]
+        if row["exit"]:
+            return Signal.SELL, 1.0
+        if row["entry"]:
+            return Signal.BUY, 1.0
+        return Signal.HOLD, 0.0
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        exit_ = state.data["exit"].to_numpy()
+        return codes_from_masks(state.data["entry"].to_numpy() & ~exit_, exit_, (1.0, 1.0, 0.0))
+
+
+def create(params: dict[str, Any] | None = None) -> ExpressionStrategy:
+    return ExpressionStrategy(**(params or {}))
+
+
+__all__ = ["CompiledRules", "ExpressionStrategy", "compile_rules", "create", "evaluate_rules"]
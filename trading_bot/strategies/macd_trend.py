@@ -5,11 +5,12 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from trading_bot.indicators import ta
+from trading_bot.indicators import streaming, ta
 
-from .base import Signal, Strategy, StrategyState
+from .base import Signal, Strategy, StrategyState, codes_from_masks
 
 
 class MacdTrendStrategy(Strategy):
@@ -37,6 +38,40 @@ class MacdTrendStrategy(Strategy):
         signal_value = state.data.loc[bar.name, "signal"]
         if pd.isna(macd_value) or pd.isna(signal_value):
             return Signal.HOLD, 0.0
+        return self._decide(macd_value, signal_value)
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        macd_value = state.data["macd"].to_numpy(dtype=np.float64)
+        signal_value = state.data["signal"].to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(macd_value) | np.isnan(signal_value))
+        return codes_from_masks(
+            macd_value > signal_value, macd_value < signal_value, (0.6, 0.6, 0.0), valid
+        )
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def reset_stream(self) -> None:
+        self._macd = streaming.MACD(
+            int(self.params["fast"]), int(self.params["slow"]), int(self.params["signal"])
+        )
+
+    def prime_stream(self, data: pd.DataFrame) -> None:
+        self.reset_stream()
+        self._macd.prime(data["close"].to_numpy(dtype=np.float64))
+
+    def update(self, timestamp: pd.Timestamp, bar: Mapping[str, Any]) -> tuple[Signal, float]:
+        macd_value, signal_value, _ = self._macd.update(float(bar["close"]))
+        if macd_value != macd_value or signal_value != signal_value:
+            return Signal.HOLD, 0.0
+        return self._decide(macd_value, signal_value)
+
+    def snapshot(self) -> dict[str, float]:
+        return {"macd": self._macd.macd, "signal": self._macd.signal}
+
+    def _decide(self, macd_value: float, signal_value: float) -> tuple[Signal, float]:
         if macd_value > signal_value:
             return Signal.BUY, 0.6
         if macd_value < signal_value:
@@ -0,0 +1,80 @@
+"""Lazily imported strategy classes, including third-party entry points."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, MutableMapping
+from importlib.metadata import EntryPoint, entry_points
+
+import structlog
+
+from .base import Strategy
+
+log = structlog.get_logger(__name__)
+
+# Packages register strategies as ``name = "package.module:Class"`` under this group.
+ENTRY_POINT_GROUP = "trading_bot.strategies"
+
+
+class StrategyRegistry(MutableMapping[str, type[Strategy]]):
+    """Strategy classes by name, each imported on its first lookup.
+
+    ``paths`` maps names to ``module:Class`` references. Strategies from other packages
+    are read from the ``trading_bot.strategies`` entry point group on the first lookup of
+    an unknown name (or iteration); names in ``paths`` take precedence. Assigning a class
+    registers it directly.
+    """
+
+    def __init__(self, paths: dict[str, str], group: str = ENTRY_POINT_GROUP) -> None:
+        self._group = group
+        self._entries = {name: EntryPoint(name, path, group) for name, path in paths.items()}
+        self._classes: dict[str, type[Strategy]] = {}
+        self._discovered = False
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry in entry_points(group=self._group):
+            if entry.name in self._entries or entry.name in self._classes:
+                log.warning("strategies.entry_point_shadowed", name=entry.name, value=entry.value)
+                continue
+            self._entries[entry.name] = entry
+
+    def __getitem__(self, name: str) -> type[Strategy]:
+        if name in self._classes:
+            return self._classes[name]
+        if name not in self._entries:
+            self._discover()
+        entry = self._entries[name]
+        strategy_cls = entry.load()
+        if not (isinstance(strategy_cls, type) and issubclass(strategy_cls, Strategy)):
+            raise TypeError(f"{entry.value} (strategy {name!r}) is not a Strategy subclass")
+        self._classes[name] = strategy_cls
+        return strategy_cls
+
+    def __setitem__(self, name: str, strategy_cls: type[Strategy]) -> None:
+        self._entries.pop(name, None)
+        self._classes[name] = strategy_cls
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._entries and name not in self._classes:
+            raise KeyError(name)
+        self._entries.pop(name, None)
+        self._classes.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._classes or name in self._entries:
+            return True
+        self._discover()
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter([*self._entries, *(n for n in self._classes if n not in self._entries)])
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._entries.keys() | self._classes.keys())
+
+
+__all__ = ["ENTRY_POINT_GROUP", "StrategyRegistry"]
@@ -5,11 +5,12 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from trading_bot.indicators import ta
+from trading_bot.indicators import streaming, ta
 
-from .base import Signal, Strategy, StrategyState
+from .base import Signal, Strategy, StrategyState, codes_from_masks
 
 
 class RsiReversionStrategy(Strategy):
@@ -27,10 +28,44 @@ class RsiReversionStrategy(Strategy):
         rsi_values = ta.rsi(data["close"], int(self.params["window"]))
         return StrategyState(data=pd.DataFrame({"rsi": rsi_values}), metadata={})
 
+    def warmup(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.iloc[max(0, len(data) - int(self.params["window"]) - 1) :]
+
     def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
         rsi_value = state.data.loc[bar.name, "rsi"]
         if pd.isna(rsi_value):
             return Signal.HOLD, 0.0
+        return self._decide(float(rsi_value))
+
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        rsi_value = state.data["rsi"].to_numpy(dtype=np.float64)
+        lower = float(self.params["lower"])
+        upper = float(self.params["upper"])
+        buy_conf = np.minimum(1.0, (lower - rsi_value) / lower)
+        sell_conf = np.minimum(1.0, (rsi_value - upper) / (100 - upper))
+        return codes_from_masks(
+            rsi_value < lower, rsi_value > upper, (buy_conf, sell_conf, 0.1), ~np.isnan(rsi_value)
+        )
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def reset_stream(self) -> None:
+        self._rsi = streaming.RSI(int(self.params["window"]))
+
+    def prime_stream(self, data: pd.DataFrame) -> None:
+        self.reset_stream()
+        self._rsi.prime(data["close"].to_numpy(dtype=np.float64))
+
+    def update(self, timestamp: pd.Timestamp, bar: Mapping[str, Any]) -> tuple[Signal, float]:
+        return self._decide(self._rsi.update(float(bar["close"])))
+
+    def snapshot(self) -> dict[str, float]:
+        return {"rsi": self._rsi.value}
+
+    def _decide(self, rsi_value: float) -> tuple[Signal, float]:
         lower = float(self.params["lower"])
         upper = float(self.params["upper"])
         if rsi_value < lower:
@@ -5,11 +5,15 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 
-from trading_bot.indicators import ta
+from trading_bot.indicators import streaming, ta
 
-from .base import Signal, Strategy, StrategyState
+from .base import Signal, Strategy, StrategyState, codes_from_masks
+from .timeframes import resample_bars
 
 
 class SmaCrossStrategy(Strategy):
@@ -17,7 +21,8 @@ class SmaCrossStrategy(Strategy):
 
     @classmethod
     def default_params(cls) -> dict[str, Any]:
-        return {"fast": 10, "slow": 20}
+        # ``trend_timeframe`` (e.g. "1h") only allows entries above that timeframe's SMA.
+        return {"fast": 10, "slow": 20, "trend_timeframe": None, "trend_window": 20}
 
     @classmethod
     def param_space(cls) -> Mapping[str, Any]:
@@ -27,19 +32,85 @@ class SmaCrossStrategy(Strategy):
         fast = ta.sma(data["close"], int(self.params["fast"]))
         slow = ta.sma(data["close"], int(self.params["slow"]))
         indicators = pd.DataFrame({"fast": fast, "slow": slow})
+        rule = self.params["trend_timeframe"]
+        if rule:
+            window = int(self.params["trend_window"])
+            trend = self.higher_timeframe(data, rule, lambda bars: ta.sma(bars["close"], window))
+            indicators["trend"] = trend.iloc[:, 0]
+            indicators["close"] = data["close"]
         return StrategyState(data=indicators, metadata={})
 
+    def warmup(self, data: pd.DataFrame) -> pd.DataFrame:
+        start = max(0, len(data) - max(int(self.params["fast"]), int(self.params["slow"])))
+        rule = self.params["trend_timeframe"]
+        if rule:
+            # Resampled bins line up with a shorter history only for intraday rules that
+            # divide a day; the next bar may still fall in the last, partial period.
+            offset = to_offset(rule)
+            if not isinstance(offset, Tick) or pd.Timedelta(days=1) % pd.Timedelta(offset):
+                return data
+            periods = resample_bars(data[["close"]], rule).index
+            window = int(self.params["trend_window"])
+            if len(periods) <= window:
+                return data
+            start = min(start, int(data.index.searchsorted(periods[-window - 1])))
+        return data.iloc[start:]
+
     def on_bar(self, bar: pd.Series, state: StrategyState) -> tuple[Signal, float]:
         fast = state.data.loc[bar.name, "fast"]
         slow = state.data.loc[bar.name, "slow"]
         if pd.isna(fast) or pd.isna(slow):
             return Signal.HOLD, 0.0
         if fast > slow:
+            if "trend" in state.data.columns:
+                trend = state.data.loc[bar.name, "trend"]
+                if pd.isna(trend) or state.data.loc[bar.name, "close"] <= trend:
+                    return Signal.HOLD, 0.0
             return Signal.BUY, 0.7
         if fast < slow:
             return Signal.SELL, 0.7
         return Signal.HOLD, 0.0
 
+    def signal_codes(
+        self, data: pd.DataFrame, state: StrategyState
+    ) -> tuple[np.ndarray, np.ndarray]:
+        fast = state.data["fast"].to_numpy(dtype=np.float64)
+        slow = state.data["slow"].to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(fast) | np.isnan(slow))
+        buy = fast > slow
+        if "trend" in state.data.columns:
+            trend = state.data["trend"].to_numpy(dtype=np.float64)
+            buy &= ~np.isnan(trend) & (state.data["close"].to_numpy(dtype=np.float64) > trend)
+        return codes_from_masks(buy, fast < slow, (0.7, 0.7, 0.0), valid)
+
+    def supports_streaming(self) -> bool:
+        return not self.params["trend_timeframe"]
+
+    def reset_stream(self) -> None:
+        self._fast = streaming.SMA(int(self.params["fast"]))
+        self._slow = streaming.SMA(int(self.params["slow"]))
+
+    def prime_stream(self, data: pd.DataFrame) -> None:
+        self.reset_stream()
+        close = data["close"].to_numpy(dtype=np.float64)
+        self._fast.prime(close)
+        self._slow.prime(close)
+
+    def update(self, timestamp: pd.Timestamp, bar: Mapping[str, Any]) -> tuple[Signal, float]:
+        close = float(bar["close"])
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if fast != fast or slow != slow:
+            return Signal.HOLD, 0.0
+        if fast > slow:
+            return Signal.BUY, 0.7
+        if fast < slow:
+            return Signal.SELL, 0.7
+        return Signal.HOLD, 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        return {"fast": self._fast.value, "slow": self._slow.value}
+
 
 def create(params: dict[str, Any] | None = None) -> SmaCrossStrategy:
     return SmaCrossStrategy(**(params or {}))
@@ -0,0 +1,78 @@
+"""Higher-timeframe features resampled from base bars and aligned without lookahead."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "trade_count": "sum",
+}
+
+FeatureFn = Callable[[pd.DataFrame], pd.DataFrame | pd.Series]
+
+
+def resample_bars(data: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars into ``rule`` sized bars labelled by their start time.
+
+    Periods without any base bar are dropped.
+    """
+
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise TypeError("Resampling requires a DatetimeIndex")
+    agg = {column: how for column, how in _AGGREGATIONS.items() if column in data.columns}
+    if "close" not in agg:
+        raise ValueError("Resampling requires a 'close' column")
+    counts = data["close"].resample(rule, label="left", closed="left").count()
+    bars = data.resample(rule, label="left", closed="left").agg(agg)
+    return bars[counts.to_numpy() > 0]
+
+
+def align_completed(features: pd.DataFrame, rule: str, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """As-of join higher-timeframe ``features`` onto the base ``index``.
+
+    A higher-timeframe bar labelled ``t`` covers ``[t, t + rule)`` and is only visible
+    to base bars stamped at or after ``t + rule``, i.e. once it has completed. Base bars
+    before the first completed period receive ``NaN``.
+    """
+
+    values = features.to_numpy(dtype=np.float64, na_value=np.nan)
+    aligned = np.full((len(index), values.shape[1]), np.nan)
+    if len(values):
+        period_end = (features.index + to_offset(rule)).as_unit("ns").asi8
+        positions = np.searchsorted(period_end, index.as_unit("ns").asi8, side="right") - 1
+        visible = positions >= 0
+        aligned[visible] = values[positions[visible]]
+    return pd.DataFrame(aligned, index=index, columns=features.columns)
+
+
+def higher_timeframe_features(
+    data: pd.DataFrame,
+    rule: str,
+    compute: FeatureFn,
+    prefix: str | None = None,
+) -> pd.DataFrame:
+    """Resample ``data`` to ``rule``, compute features there and align them back.
+
+    ``compute`` receives the resampled OHLCV bars and returns a Series or DataFrame of
+    features indexed like them. Columns are prefixed with ``prefix`` (default
+    ``"<rule>_"``).
+    """
+
+    bars = resample_bars(data, rule)
+    features = compute(bars)
+    if isinstance(features, pd.Series):
+        features = features.to_frame(features.name or "value")
+    aligned = align_completed(features, rule, data.index)
+    return aligned.add_prefix(f"{rule}_" if prefix is None else prefix)
+
+
+__all__ = ["align_completed", "higher_timeframe_features", "resample_bars"]